@@ -0,0 +1,128 @@
+import logging
+import os
+import numpy as np
+from reranker import top_k_indices
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Catalogs smaller than this are scored exactly; the index only pays off at scale
+ANN_MIN_JOBS = int(os.environ.get('ANN_MIN_JOBS', '20000'))
+# Smaller batches are scored exactly, so they rank like single recommendations
+ANN_MIN_USERS = int(os.environ.get('ANN_MIN_USERS', '64'))
+# Indexes kept for distinct job sets, e.g. the catalog slices of popular tags
+ANN_INDEX_CACHE_SIZE = int(os.environ.get('ANN_INDEX_CACHE_SIZE', '4'))
+ANN_DIMENSIONS = int(os.environ.get('ANN_DIMENSIONS', '128'))
+ANN_PROBES = int(os.environ.get('ANN_PROBES', '16'))
+# Jobs retrieved per user before exact cosine and re-ranking
+ANN_CANDIDATES = int(os.environ.get('ANN_CANDIDATES', '300'))
+ANN_KMEANS_ITERATIONS = 10
+# Points per list used to train the coarse centroids
+_TRAIN_POINTS_PER_LIST = 64
+_ASSIGN_CHUNK = 8192
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _assign(vectors, centroids):
+    """Index of the most similar centroid for every row, in bounded chunks"""
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _ASSIGN_CHUNK):
+        chunk = vectors[start:start + _ASSIGN_CHUNK]
+        assignment[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignment
+
+
+def spherical_kmeans(vectors, n_clusters, iterations=ANN_KMEANS_ITERATIONS, seed=0):
+    """Unit-norm centroids of L2-normalized vectors, clustered by cosine"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=n_clusters)
+        empty = counts == 0
+        if empty.any():
+            # Reseed empty clusters from random points rather than lose them
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = _normalize_rows(sums).astype(vectors.dtype)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index over unit vectors: coarse centroids, then exact scoring of the probed lists"""
+
+    def __init__(self, centroids, vectors, ids, offsets):
+        self.centroids = centroids
+        # Rows sorted by list, so every list is one contiguous slice
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+
+    @classmethod
+    def build(cls, vectors, n_lists=None, seed=0):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n_lists = min(len(vectors), n_lists or max(1, int(np.sqrt(len(vectors)))))
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), n_lists * _TRAIN_POINTS_PER_LIST)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = spherical_kmeans(sample, n_lists, seed=seed)
+        assignment = _assign(vectors, centroids)
+        ids = np.argsort(assignment, kind='stable')
+        offsets = np.searchsorted(assignment[ids], np.arange(n_lists + 1))
+        return cls(centroids, vectors[ids], ids, offsets)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query, k, n_probes=ANN_PROBES):
+        """Row ids and scores of the k best matches found in the n_probes nearest lists"""
+        query = np.asarray(query, dtype=np.float32).ravel()
+        n_probes = min(n_probes, len(self.centroids))
+        centroid_scores = self.centroids @ query
+        probes = np.argpartition(-centroid_scores, n_probes - 1)[:n_probes]
+        rows = np.concatenate([np.arange(self.offsets[p], self.offsets[p + 1]) for p in probes])
+        if len(rows) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = self.vectors[rows] @ query
+        best = top_k_indices(scores, k)
+        return self.ids[rows[best]], scores[best]
+
+
+class JobEmbeddingIndex:
+    """LSA projection of TF-IDF job vectors plus an IVF index over the dense embeddings"""
+
+    def __init__(self, svd, index):
+        self.svd = svd
+        self.index = index
+
+    @classmethod
+    def build(cls, job_vectors, dimensions=ANN_DIMENSIONS, n_lists=None, seed=0):
+        from sklearn.decomposition import TruncatedSVD
+        dimensions = max(1, min(dimensions, job_vectors.shape[1] - 1, job_vectors.shape[0] - 1))
+        svd = TruncatedSVD(n_components=dimensions, random_state=seed)
+        embeddings = _normalize_rows(svd.fit_transform(job_vectors))
+        index = IVFIndex.build(embeddings, n_lists, seed)
+        logger.info(
+            f"Built job embedding index: {job_vectors.shape[0]} jobs, {dimensions} dimensions, "
+            f"{len(index.centroids)} lists, explained variance {svd.explained_variance_ratio_.sum():.2f}"
+        )
+        return cls(svd, index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def embed(self, vectors):
+        """Unit-norm dense embeddings of TF-IDF rows"""
+        return _normalize_rows(self.svd.transform(vectors)).astype(np.float32)
+
+    def candidates(self, user_vector, k=ANN_CANDIDATES, n_probes=ANN_PROBES):
+        """Indices of the jobs closest to a TF-IDF user vector in embedding space"""
+        ids, _ = self.index.search(self.embed(user_vector)[0], k, n_probes)
+        return ids
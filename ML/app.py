@@ -1,11 +1,37 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 import logging
 from datetime import datetime
 import os
-import requests
+import http_client
 import json
-from model import JobRecommendationTransformer
+import time
+import metrics
+import service
+from recommendation_store import user_key
+from service import (
+    BATCH_MAX_USERS,
+    batch_skill_tags,
+    clamp_limits,
+    compute_recommendations,
+    current_catalog_version,
+    format_api_info,
+    format_recommendation,
+    format_recommendation_response,
+    format_user_profile,
+    get_resume_url,
+    health_payload,
+    home_payload,
+    load_jobs,
+    precompute_request,
+    precompute_users,
+    precomputed_recommendations,
+    recommendation_cache_key,
+    resolve_user_tags,
+    schedule_precompute,
+    store_recommendations,
+    wants_debug_timings
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -14,135 +40,14 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Initialize the job recommendation transformer
-transformer = JobRecommendationTransformer()
-
-# Configuration for external job API
-EXTERNAL_JOB_API_URL = os.environ.get('EXTERNAL_JOB_API_URL', 'https://job-recommendation-system-backend.onrender.com/api/jobs/getRelatedJobs')
-EXTERNAL_API_TIMEOUT = int(os.environ.get('EXTERNAL_API_TIMEOUT', '30'))
-
-def fetch_jobs_from_external_api(tags, location=None, job_type=None, limit=100):
-    """Fetch jobs from external API based on tags"""
-    try:
-        all_jobs = []
-        for tag in tags:
-            params = {
-                'tags': tag,
-                'limit': limit
-            }
-            if location:
-                params['location'] = location
-            if job_type:
-                params['job_type'] = job_type
-            
-            headers = {
-                'Content-Type': 'application/json',
-            }
-            auth_token = os.environ.get('EXTERNAL_API_TOKEN')
-            if auth_token:
-                headers['Authorization'] = f'Bearer {auth_token}'
-            
-            logger.info(f"Fetching jobs for tag: {tag}")
-            response = requests.get(
-                EXTERNAL_JOB_API_URL,
-                headers=headers,
-                params=params,
-                timeout=EXTERNAL_API_TIMEOUT
-            )
-            response.raise_for_status()
-            api_data = response.json()
-            
-            if isinstance(api_data, dict):
-                jobs = api_data.get('jobs', api_data.get('data', []))
-            elif isinstance(api_data, list):
-                jobs = api_data
-            else:
-                logger.warning(f"Unexpected API response format for tag {tag}: {type(api_data)}")
-                jobs = []
-            
-            all_jobs.extend(jobs)
-        
-        # Remove duplicates based on job ID
-        unique_jobs = {job.get('id', job.get('job_id', job.get('_id', str(i)))): job for i, job in enumerate(all_jobs)}.values()
-        logger.info(f"Fetched {len(unique_jobs)} unique jobs from external API")
-        return list(unique_jobs)
-        
-    except requests.RequestException as e:
-        logger.error(f"Error fetching jobs from external API: {e}")
-        return []
-    except Exception as e:
-        logger.error(f"Unexpected error fetching jobs: {e}")
-        return []
-
-def normalize_job_data(jobs):
-    """Normalize job data from external API to expected format"""
-    normalized_jobs = []
-    for job in jobs:
-        try:
-            if not isinstance(job, dict):
-                logger.warning(f"Skipping non-dict job: {job}")
-                continue
-            normalized_job = {
-                'id': str(job.get('id') or job.get('job_id') or job.get('_id') or hash(str(job))),
-                'title': str(job.get('title') or job.get('job_title') or job.get('position') or 'Unknown Job'),
-                'company_name': str(job.get('company_name') or job.get('company') or job.get('employer') or 'Unknown Company'),
-                'category': str(job.get('category') or job.get('job_category') or job.get('department') or ''),
-                'tags': job.get('tags') or job.get('skills') or job.get('keywords', []),
-                'job_type': str(job.get('job_type') or job.get('employment_type') or job.get('type') or ''),
-                'publication_date': str(job.get('publication_date') or job.get('posted_date') or job.get('updated_at') or ''),
-                'candidate_required_location': str(job.get('candidate_required_location') or job.get('location') or job.get('city') or ''),
-                'description': str(job.get('description') or job.get('job_description') or job.get('details', '') or ''),
-                'salary': str(job.get('salary') or job.get('salary_range') or ''),
-                'experience_required': str(job.get('experience_required') or job.get('experience_level') or ''),
-                'application_url': str(job.get('application_url') or job.get('apply_url') or ''),
-                'remote_allowed': job.get('remote_allowed') or job.get('is_remote', False)
-            }
-            
-            # Handle tags formatting
-            if isinstance(normalized_job['tags'], str):
-                try:
-                    # Attempt to parse JSON-encoded string
-                    parsed_tags = json.loads(normalized_job['tags'])
-                    if isinstance(parsed_tags, list):
-                        # Clean and join tags into a single string
-                        cleaned_tags = [str(tag).strip('[]"') for tag in parsed_tags if tag]
-                        normalized_job['tags'] = [', '.join(cleaned_tags)] if cleaned_tags else []
-                    else:
-                        logger.warning(f"Parsed tags is not a list: {parsed_tags}")
-                        normalized_job['tags'] = [normalized_job['tags'].strip('[]').replace('"', '')]
-                except json.JSONDecodeError:
-                    # Handle non-JSON string (e.g., comma-separated)
-                    cleaned_tags = [tag.strip('[]"') for tag in normalized_job['tags'].split(',') if tag.strip('[]"')]
-                    normalized_job['tags'] = [', '.join(cleaned_tags)] if cleaned_tags else []
-            elif isinstance(normalized_job['tags'], list):
-                # Clean list elements and join into a single string
-                cleaned_tags = [str(tag).strip('[]"') for tag in normalized_job['tags'] if tag]
-                normalized_job['tags'] = [', '.join(cleaned_tags)] if cleaned_tags else []
-            else:
-                logger.warning(f"Unexpected tags format: {normalized_job['tags']}")
-                normalized_job['tags'] = []
-            
-            # Log job details for debugging
-            if not normalized_job['id'] or normalized_job['title'] == 'Unknown Job':
-                logger.warning(f"Job missing id or title: {normalized_job}")
-            normalized_jobs.append(normalized_job)
-                
-        except Exception as e:
-            logger.warning(f"Error normalizing job data: {e}, job: {job}")
-            continue
-    
-    logger.info(f"Normalized {len(normalized_jobs)} jobs out of {len(jobs)} raw jobs")
-    return normalized_jobs
+# Shared job fetching, scoring and caching; starts the catalog sync, store
+# refresh and model preload threads once per worker
+service.start()
 
 @app.route('/', methods=['GET'])
 def home():
     """Health check endpoint"""
-    return jsonify({
-        "message": "Job Recommendation API is running",
-        "status": "healthy",
-        "timestamp": str(datetime.now().isoformat()),
-        "external_api_configured": bool(os.environ.get('EXTERNAL_JOB_API_URL'))
-    })
+    return jsonify(home_payload())
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -150,7 +55,7 @@ def health_check():
     external_api_status = "not_configured"
     if os.environ.get('EXTERNAL_JOB_API_URL'):
         try:
-            response = requests.get(
+            response = http_client.get(
                 os.environ.get('EXTERNAL_JOB_API_URL'),
                 timeout=5,
                 params={'limit': 1}
@@ -159,17 +64,23 @@ def health_check():
         except:
             external_api_status = "unreachable"
     
-    return jsonify({
-        "status": "healthy",
-        "service": "Job Recommendation API",
-        "version": "2.0.0",
-        "timestamp": str(datetime.now().isoformat()),
-        "external_job_api": {
-            "configured": bool(os.environ.get('EXTERNAL_JOB_API_URL')),
-            "status": external_api_status,
-            "url": os.environ.get('EXTERNAL_JOB_API_URL', 'not_configured')
-        }
-    })
+    return jsonify(health_payload(external_api_status))
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None and request.endpoint not in (None, 'metrics_endpoint', 'static'):
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=request.endpoint, status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint with per-stage latency histograms"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/api/recommend', methods=['POST'])
 def recommend_jobs():
@@ -188,122 +99,50 @@ def recommend_jobs():
                 "status": "error"
             }, 400)
 
-        top_n = request.args.get('top_n', 10, type=int)
-        top_n = min(max(top_n, 1), 50)
-        fetch_limit = request.args.get('fetch_limit', 100, type=int)
-        fetch_limit = min(max(fetch_limit, 10), 500)
+        top_n, fetch_limit = clamp_limits(
+            request.args.get('top_n', 10, type=int),
+            request.args.get('fetch_limit', 100, type=int)
+        )
 
-        user_tags = transformer.extract_user_tags(user_data)
-        if not user_tags or user_tags == ['general']:
-            logger.warning("No specific tags extracted, using fallback tags")
-            user_tags = ['java', 'software engineer', 'full-time']
-            logger.info(f"Using fallback tags: {user_tags}")
+        debug_timings = wants_debug_timings(request.args.get('debug_timings'), user_data)
+        resume_url = get_resume_url(user_data)
+        store_key = user_key(user_data) if service.recommendation_store is not None else ''
+        stored_request = precompute_request(user_data, top_n, fetch_limit)
 
-        logger.info(f"Extracted user tags: {user_tags}")
-        preferred_location = user_data.get('preferedLocation')
-        preferred_job_type = user_data.get('preferedJobType')
-        
-        raw_jobs = fetch_jobs_from_external_api(
-            tags=user_tags,
-            location=preferred_location,
-            job_type=preferred_job_type,
-            limit=fetch_limit
-        )
-        
-        if not raw_jobs:
-            logger.warning("No jobs fetched from external API, using fallback jobs")
-            raw_jobs = [
-                {
-                    'id': 'fallback_1',
-                    'title': 'Java Developer',
-                    'company_name': 'Fallback Inc.',
-                    'category': 'Software Development',
-                    'tags': ['java', 'springboot', 'postgresql'],
-                    'job_type': 'Full-Time',
-                    'candidate_required_location': 'Bangalore',
-                    'description': 'Develop Java-based applications using Springboot and PostgreSQL.',
-                    'remote_allowed': False
-                }
-            ]
-        
-        jobs_data = normalize_job_data(raw_jobs)
-        if not jobs_data:
-            logger.error(f"No valid jobs after normalization, raw jobs: {len(raw_jobs)}")
-            jobs_data = normalize_job_data([{
-                'id': 'fallback_1',
-                'title': 'Java Developer',
-                'company_name': 'Fallback Inc.',
-                'category': 'Software Development',
-                'tags': ['java', 'springboot', 'postgresql'],
-                'job_type': 'Full-Time',
-                'candidate_required_location': 'Bangalore',
-                'description': 'Develop Java-based applications using Springboot and PostgreSQL.',
-                'remote_allowed': False
-            }])
-        
-        logger.info(f"Normalized {len(jobs_data)} jobs for recommendation")
-        resume_url = user_data.get('users', {}).get('resumeUrl', '') or user_data.get('resumeUrl', '')
-        recommendations = transformer.recommend_jobs(user_data, jobs_data, top_n, resume_url)
+        def compute():
+            return compute_recommendations(user_data, top_n, fetch_limit)
+
+        started = time.perf_counter()
+        freshness = None
+        with metrics.collect_timings(debug_timings) as timings:
+            stored = precomputed_recommendations(store_key, stored_request) if store_key else None
+            if stored is not None:
+                result, cache_status, freshness = stored
+            elif service.response_cache is not None:
+                result, cache_status = service.response_cache.get_or_compute(
+                    recommendation_cache_key(user_data, resume_url, top_n, fetch_limit),
+                    compute,
+                    cache_if=lambda result: bool(result["recommendations"])
+                )
+            else:
+                result, cache_status = compute(), "disabled"
+            if stored is None and store_key and result["recommendations"]:
+                freshness = store_recommendations(store_key, stored_request, result)
         
-        if not recommendations:
+        if not result["recommendations"]:
             return jsonify({
                 "error": "No recommendations generated",
                 "status": "error",
-                "jobs_processed": len(jobs_data)
+                "jobs_processed": result["api_info"]["jobs_processed"]
             }, 404)
 
-        formatted_recommendations = []
-        for i, rec in enumerate(recommendations):
-            job = rec['job']
-            score = rec['score']
-            criteria = rec['criteria']
-            formatted_rec = {
-                "rank": i + 1,
-                "job_id": job.get('id'),
-                "title": job.get('title'),
-                "company": job.get('company_name'),
-                "category": job.get('category'),
-                "location": job.get('candidate_required_location'),
-                "job_type": job.get('job_type'),
-                "tags": job.get('tags', []),
-                "publication_date": job.get('publication_date'),
-                "description": job.get('description', ''),  # Full-length description
-                "salary": job.get('salary'),
-                "experience_required": job.get('experience_required'),
-                "application_url": job.get('application_url'),
-                "remote_allowed": job.get('remote_allowed'),
-                "match_score": round(score, 3),
-                "match_criteria": {
-                    "similarity_score": round(criteria['similarity_score'], 3),
-                    "location_match": criteria['location_match'],
-                    "job_type_match": criteria['job_type_match'],
-                    "skill_match_percent": round(criteria['skill_match_percent'], 2),
-                    "experience_match": criteria['experience_match']
-                },
-                "explanation": transformer.get_recommendation_explanation(rec)
-            }
-            formatted_recommendations.append(formatted_rec)
+        response = format_recommendation_response(user_data, result, cache_status, freshness)
 
-        response = {
-            "status": "success",
-            "message": f"Found {len(formatted_recommendations)} job recommendations",
-            "total_recommendations": len(formatted_recommendations),
-            "user_profile": {
-                "name": f"{user_data.get('users', {}).get('firstName', '')} {user_data.get('users', {}).get('lastName', '')}".strip(),
-                "email": user_data.get('users', {}).get('email', ''),
-                "preferred_location": user_data.get('preferedLocation', ''),
-                "preferred_job_type": user_data.get('preferedJobType', ''),
-                "key_skills": user_data.get('keySkills', ''),
-                "extracted_tags": user_tags
-            },
-            "api_info": {
-                "jobs_fetched": len(raw_jobs),
-                "jobs_processed": len(jobs_data),
-                "external_api_url": os.environ.get('EXTERNAL_JOB_API_URL', 'not_configured')
-            },
-            "recommendations": formatted_recommendations,
-            "timestamp": str(datetime.now().isoformat())
-        }
+        if timings is not None:
+            response["debug_timings"] = dict(
+                metrics.format_timings(timings),
+                total=round((time.perf_counter() - started) * 1000, 2)
+            )
 
         return jsonify(response)
 
@@ -315,6 +154,102 @@ def recommend_jobs():
             "timestamp": str(datetime.now().isoformat())
         }, 500)
 
+@app.route('/api/recommend/precompute', methods=['POST'])
+def precompute_recommendations():
+    """Recompute stored recommendations in the background, e.g. after a profile edit"""
+    if service.recommendation_store is None:
+        return jsonify({
+            "error": "Precompute mode is disabled, set RECOMMENDATION_STORE_PATH",
+            "status": "error"
+        }), 404
+    payload = request.get_json(silent=True)
+    users = precompute_users(payload)
+    if not isinstance(users, list) or not users:
+        return jsonify({
+            "error": "Request must be a JSON profile or a 'users' list",
+            "status": "error"
+        }), 400
+    top_n, fetch_limit = clamp_limits(
+        request.args.get('top_n', 10, type=int),
+        request.args.get('fetch_limit', 100, type=int)
+    )
+    scheduled = schedule_precompute(users[:BATCH_MAX_USERS], top_n, fetch_limit)
+    return jsonify({
+        "status": "scheduled",
+        "scheduled": len(scheduled),
+        "user_keys": scheduled,
+        "timestamp": str(datetime.now().isoformat())
+    }), 202
+
+@app.route('/api/recommend/batch', methods=['POST'])
+def recommend_jobs_batch():
+    """Recommend jobs for many profiles at once, streamed back as NDJSON, one line per user"""
+    try:
+        payload = request.get_json(silent=True)
+        users = payload.get('users') if isinstance(payload, dict) else payload
+        if not isinstance(users, list) or not users:
+            return jsonify({
+                "error": "Request must be JSON with a non-empty 'users' list",
+                "status": "error"
+            }), 400
+        if len(users) > BATCH_MAX_USERS:
+            return jsonify({
+                "error": f"At most {BATCH_MAX_USERS} users per batch",
+                "status": "error"
+            }), 400
+
+        top_n, fetch_limit = clamp_limits(
+            request.args.get('top_n', 10, type=int),
+            request.args.get('fetch_limit', 100, type=int)
+        )
+
+        users = [user if isinstance(user, dict) else {} for user in users]
+        users_tags = [resolve_user_tags(user) for user in users]
+        # Fetch the union of every user's tags once for the whole batch
+        union_tags = list(dict.fromkeys(tag for tags in users_tags for tag in tags))
+        union_skill_tags = batch_skill_tags(users)
+        logger.info(f"Batch of {len(users)} users with {len(union_tags)} distinct tags")
+        raw_jobs, jobs_data, job_source = load_jobs(union_tags, fetch_limit=fetch_limit, skill_tags=union_skill_tags)
+        resume_urls = [get_resume_url(user) for user in users]
+    except Exception as e:
+        logger.error(f"Error preparing batch recommendations: {str(e)}")
+        return jsonify({
+            "error": "Internal server error occurred while processing recommendations",
+            "status": "error",
+            "timestamp": str(datetime.now().isoformat())
+        }), 500
+
+    def generate():
+        try:
+            results = service.transformer.recommend_jobs_batch(
+                users, jobs_data, top_n, resume_urls, catalog_version=current_catalog_version()
+            )
+            for index, recommendations in results:
+                formatted_recommendations = [format_recommendation(i + 1, rec) for i, rec in enumerate(recommendations)]
+                yield json.dumps({
+                    "index": index,
+                    "status": "success" if formatted_recommendations else "error",
+                    "total_recommendations": len(formatted_recommendations),
+                    "user_profile": format_user_profile(users[index], users_tags[index]),
+                    "recommendations": formatted_recommendations
+                }) + "\n"
+        except Exception as e:
+            logger.error(f"Error streaming batch recommendations: {str(e)}")
+            yield json.dumps({
+                "error": "Internal server error occurred while processing recommendations",
+                "status": "error",
+                "timestamp": str(datetime.now().isoformat())
+            }) + "\n"
+            return
+        yield json.dumps({
+            "status": "complete",
+            "total_users": len(users),
+            "api_info": format_api_info(raw_jobs, jobs_data, job_source),
+            "timestamp": str(datetime.now().isoformat())
+        }) + "\n"
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({
@@ -0,0 +1,471 @@
+"""Async serving mode: the recommendation API as a plain ASGI application.
+
+Routes and response bodies match app.py. Backend job fetches and resume
+downloads run on a shared httpx.AsyncClient, so a request waiting on I/O
+holds no thread; tokenizing, TF-IDF and re-ranking run on a thread pool.
+
+Run from ML/:  uvicorn asgi_app:app --host 0.0.0.0 --port 8000
+"""
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qs
+import httpx
+import http_client
+import metrics
+import pdf_text
+import service
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ASGI_SCORING_WORKERS = int(os.environ.get('ASGI_SCORING_WORKERS', str(os.cpu_count() or 4)))
+ASGI_MAX_CONNECTIONS = int(os.environ.get('ASGI_MAX_CONNECTIONS', '200'))
+ASGI_MAX_KEEPALIVE = int(os.environ.get('ASGI_MAX_KEEPALIVE', '50'))
+ASGI_MAX_BODY_BYTES = int(os.environ.get('ASGI_MAX_BODY_BYTES', str(10 * 1024 * 1024)))
+ASGI_RESUME_CONCURRENCY = int(os.environ.get('ASGI_RESUME_CONCURRENCY', '16'))
+
+_scoring_pool = ThreadPoolExecutor(ASGI_SCORING_WORKERS, thread_name_prefix='scoring')
+_client = None
+
+
+def get_client():
+    """The process-wide async HTTP client, created on first use"""
+    global _client
+    if _client is None:
+        _client = http_client.build_async_client(ASGI_MAX_CONNECTIONS, ASGI_MAX_KEEPALIVE)
+    return _client
+
+
+async def run_scoring(fn, *args, **kwargs):
+    """Run CPU-bound work on the scoring pool, keeping request-local timings"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _scoring_pool, functools.partial(context.run, fn, *args, **kwargs)
+    )
+
+
+async def _fetch_jobs_for_tag(tag, location=None, job_type=None, limit=100):
+    params, headers = service.job_request_args(tag, location, job_type, limit)
+    logger.info(f"Fetching jobs for tag: {tag}")
+    response = await get_client().get(
+        service.EXTERNAL_JOB_API_URL,
+        headers=headers,
+        params=params,
+        timeout=service.EXTERNAL_API_TIMEOUT
+    )
+    response.raise_for_status()
+    return service.jobs_from_payload(response.json(), tag)
+
+
+async def fetch_jobs_from_external_api(tags, location=None, job_type=None, limit=100, deadline=None):
+    """Fetch jobs for every tag concurrently on the event loop"""
+    deadline = deadline or service.EXTERNAL_API_TOTAL_DEADLINE
+    if not tags:
+        return []
+    tasks = [asyncio.create_task(_fetch_jobs_for_tag(tag, location, job_type, limit)) for tag in tags]
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning(f"Job fetch deadline of {deadline}s exceeded, {len(pending)} of {len(tags)} tag requests dropped")
+
+    # Collect in tag order so dedup stays deterministic
+    all_jobs = []
+    for tag, task in zip(tags, tasks):
+        if task not in done:
+            continue
+        try:
+            all_jobs.extend(task.result())
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching jobs for tag {tag} from external API: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error fetching jobs for tag {tag}: {e}")
+
+    unique_jobs = service.dedupe_jobs(all_jobs)
+    logger.info(f"Fetched {len(unique_jobs)} unique jobs from external API")
+    return unique_jobs
+
+
+async def load_jobs(user_tags, location=None, job_type=None, fetch_limit=100, skill_tags=None):
+    """service.load_jobs with the backend fetch on the event loop"""
+    raw_jobs = []
+    job_source = "catalog"
+    jobs_data, uncovered = await run_scoring(service.catalog_jobs, skill_tags or user_tags, fetch_limit, location, job_type)
+
+    fetch = service.jobs_to_fetch(user_tags, jobs_data, uncovered)
+    if fetch is not None:
+        fetch_tags, job_source = fetch
+        with metrics.timed('fetch_jobs'):
+            raw_jobs = await fetch_jobs_from_external_api(fetch_tags, location, job_type, fetch_limit)
+        raw_jobs, jobs_data = await run_scoring(service.merge_fetched_jobs, jobs_data, raw_jobs)
+
+    logger.info(f"Normalized {len(jobs_data)} jobs for recommendation")
+    return raw_jobs, jobs_data, job_source
+
+
+async def extract_resume_data(resume_url):
+    """transformer.extract_resume_data with the download on the event loop"""
+    transformer = service.transformer
+    try:
+        if not resume_url or not isinstance(resume_url, str):
+            return {}
+
+        download = transformer.resume_cache.download(resume_url)
+        if download.fresh_data is not None:
+            return download.fresh_data
+
+        with metrics.timed('resume_download'):
+            async with get_client().stream('GET', resume_url, headers=download.request_headers(), timeout=30) as response:
+                cached_data = download.not_modified(response.status_code)
+                if cached_data is not None:
+                    return cached_data
+                if response.status_code != 200:
+                    logger.warning(f"Failed to download resume: {response.status_code}")
+                    return {}
+                content = await pdf_text.aread_limited(response)
+
+        return download.store(response.headers, await run_scoring(transformer.parse_resume, content))
+
+    except httpx.HTTPError as e:
+        logger.error(f"Network error extracting resume data: {e}")
+        return {}
+    except pdf_text.ResumeTooLargeError as e:
+        logger.warning(f"Skipping resume {resume_url}: {e}")
+        return {}
+    except Exception as e:
+        logger.error(f"Error extracting resume data: {e}")
+        return {}
+
+
+class Request:
+    __slots__ = ('scope', 'method', 'path', 'query', 'body')
+
+    def __init__(self, scope, body):
+        self.scope = scope
+        self.method = scope['method']
+        self.path = scope['path']
+        self.query = {key: values[-1] for key, values in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+        self.body = body
+
+    def query_int(self, name, default):
+        try:
+            return int(self.query[name])
+        except (KeyError, ValueError):
+            return default
+
+    def json(self):
+        try:
+            return json.loads(self.body) if self.body else None
+        except ValueError:
+            return None
+
+
+_CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-headers', b'Content-Type, Authorization'),
+    (b'access-control-allow-methods', b'GET, POST, OPTIONS')
+]
+
+
+async def send_body(send, status, body, content_type):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())] + _CORS_HEADERS
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, payload, status=200):
+    await send_body(send, status, json.dumps(payload).encode('utf-8'), b'application/json')
+
+
+def error_payload(error, **extra):
+    return dict({"error": error, "status": "error"}, **extra)
+
+
+async def home(request, send):
+    await send_json(send, service.home_payload())
+
+
+async def health_check(request, send):
+    external_api_status = "not_configured"
+    if os.environ.get('EXTERNAL_JOB_API_URL'):
+        try:
+            response = await get_client().get(os.environ.get('EXTERNAL_JOB_API_URL'), timeout=5, params={'limit': 1})
+            external_api_status = "healthy" if response.status_code == 200 else "error"
+        except Exception:
+            external_api_status = "unreachable"
+    await send_json(send, service.health_payload(external_api_status))
+
+
+async def metrics_endpoint(request, send):
+    await send_body(send, 200, metrics.render().encode('utf-8'), b'text/plain; version=0.0.4')
+
+
+async def recommend_jobs(request, send):
+    user_data = request.json()
+    if not isinstance(user_data, dict) or not user_data:
+        await send_json(send, error_payload("Request must be JSON with the user profile"), 400)
+        return
+    top_n, fetch_limit = service.clamp_limits(request.query_int('top_n', 10), request.query_int('fetch_limit', 100))
+    debug_timings = service.wants_debug_timings(request.query.get('debug_timings'), user_data)
+    resume_url = service.get_resume_url(user_data)
+
+    async def compute():
+        with metrics.timed('resolve_tags'):
+            user_tags = service.resolve_user_tags(user_data)
+        logger.info(f"Extracted user tags: {user_tags}")
+        (raw_jobs, jobs_data, job_source), resume_data = await asyncio.gather(
+            load_jobs(
+                user_tags,
+                location=user_data.get('preferedLocation'),
+                job_type=user_data.get('preferedJobType'),
+                fetch_limit=fetch_limit,
+                skill_tags=service.transformer.extract_skill_tags(user_data)
+            ),
+            extract_resume_data(resume_url)
+        )
+
+        def score():
+            with metrics.timed('recommend'):
+                recommendations = service.transformer.recommend_jobs(
+                    user_data, jobs_data, top_n, resume_data=resume_data or None,
+                    catalog_version=service.current_catalog_version()
+                )
+            with metrics.timed('format_response'):
+                return [service.format_recommendation(i + 1, rec) for i, rec in enumerate(recommendations)]
+
+        return {
+            "recommendations": await run_scoring(score),
+            "extracted_tags": user_tags,
+            "api_info": service.format_api_info(raw_jobs, jobs_data, job_source)
+        }
+
+    store_key = service.user_key(user_data) if service.recommendation_store is not None else ''
+    stored_request = service.precompute_request(user_data, top_n, fetch_limit)
+
+    started = time.perf_counter()
+    freshness = None
+    with metrics.collect_timings(debug_timings) as timings:
+        stored = await run_scoring(service.precomputed_recommendations, store_key, stored_request) if store_key else None
+        if stored is not None:
+            result, cache_status, freshness = stored
+        elif service.response_cache is not None:
+            result, cache_status = await service.response_cache.aget_or_compute(
+                service.recommendation_cache_key(user_data, resume_url, top_n, fetch_limit),
+                compute,
+                cache_if=lambda result: bool(result["recommendations"])
+            )
+        else:
+            result, cache_status = await compute(), "disabled"
+        if stored is None and store_key and result["recommendations"]:
+            freshness = await run_scoring(service.store_recommendations, store_key, stored_request, result)
+
+    if not result["recommendations"]:
+        await send_json(send, error_payload(
+            "No recommendations generated", jobs_processed=result["api_info"]["jobs_processed"]
+        ), 404)
+        return
+
+    response = service.format_recommendation_response(user_data, result, cache_status, freshness)
+    if timings is not None:
+        response["debug_timings"] = dict(
+            metrics.format_timings(timings),
+            total=round((time.perf_counter() - started) * 1000, 2)
+        )
+    await send_json(send, response)
+
+
+async def precompute_recommendations(request, send):
+    if service.recommendation_store is None:
+        await send_json(send, error_payload("Precompute mode is disabled, set RECOMMENDATION_STORE_PATH"), 404)
+        return
+    payload = request.json()
+    users = service.precompute_users(payload)
+    if not isinstance(users, list) or not users:
+        await send_json(send, error_payload("Request must be a JSON profile or a 'users' list"), 400)
+        return
+    top_n, fetch_limit = service.clamp_limits(request.query_int('top_n', 10), request.query_int('fetch_limit', 100))
+    scheduled = await run_scoring(service.schedule_precompute, users[:service.BATCH_MAX_USERS], top_n, fetch_limit)
+    await send_json(send, {
+        "status": "scheduled",
+        "scheduled": len(scheduled),
+        "user_keys": scheduled,
+        "timestamp": str(datetime.now().isoformat())
+    }, 202)
+
+
+async def recommend_jobs_batch(request, send):
+    payload = request.json()
+    users = payload.get('users') if isinstance(payload, dict) else payload
+    if not isinstance(users, list) or not users:
+        await send_json(send, error_payload("Request must be JSON with a non-empty 'users' list"), 400)
+        return
+    if len(users) > service.BATCH_MAX_USERS:
+        await send_json(send, error_payload(f"At most {service.BATCH_MAX_USERS} users per batch"), 400)
+        return
+    top_n, fetch_limit = service.clamp_limits(request.query_int('top_n', 10), request.query_int('fetch_limit', 100))
+
+    users = [user if isinstance(user, dict) else {} for user in users]
+    users_tags = [service.resolve_user_tags(user) for user in users]
+    union_tags = list(dict.fromkeys(tag for tags in users_tags for tag in tags))
+    logger.info(f"Batch of {len(users)} users with {len(union_tags)} distinct tags")
+    resume_limit = asyncio.Semaphore(ASGI_RESUME_CONCURRENCY)
+
+    async def resume_for(user):
+        async with resume_limit:
+            return await extract_resume_data(service.get_resume_url(user)) or None
+
+    (raw_jobs, jobs_data, job_source), *resumes = await asyncio.gather(
+        load_jobs(union_tags, fetch_limit=fetch_limit, skill_tags=service.batch_skill_tags(users)),
+        *(resume_for(user) for user in users)
+    )
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'application/x-ndjson')] + _CORS_HEADERS
+    })
+
+    async def send_line(line):
+        await send({'type': 'http.response.body', 'body': (json.dumps(line) + "\n").encode('utf-8'), 'more_body': True})
+
+    results = service.transformer.recommend_jobs_batch(
+        users, jobs_data, top_n, resumes=resumes, catalog_version=service.current_catalog_version()
+    )
+    done = object()
+    try:
+        while True:
+            item = await run_scoring(next, results, done)
+            if item is done:
+                break
+            index, recommendations = item
+            formatted_recommendations = [service.format_recommendation(i + 1, rec) for i, rec in enumerate(recommendations)]
+            await send_line({
+                "index": index,
+                "status": "success" if formatted_recommendations else "error",
+                "total_recommendations": len(formatted_recommendations),
+                "user_profile": service.format_user_profile(users[index], users_tags[index]),
+                "recommendations": formatted_recommendations
+            })
+        await send_line({
+            "status": "complete",
+            "total_users": len(users),
+            "api_info": service.format_api_info(raw_jobs, jobs_data, job_source),
+            "timestamp": str(datetime.now().isoformat())
+        })
+    except Exception as e:
+        logger.error(f"Error streaming batch recommendations: {str(e)}")
+        await send_line(error_payload(
+            "Internal server error occurred while processing recommendations",
+            timestamp=str(datetime.now().isoformat())
+        ))
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+ROUTES = {
+    ('GET', '/'): home,
+    ('GET', '/api/health'): health_check,
+    ('GET', '/metrics'): metrics_endpoint,
+    ('POST', '/api/recommend'): recommend_jobs,
+    ('POST', '/api/recommend/precompute'): precompute_recommendations,
+    ('POST', '/api/recommend/batch'): recommend_jobs_batch
+}
+
+
+async def read_body(receive):
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > ASGI_MAX_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            service.start()
+            get_client()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _client is not None:
+                await _client.aclose()
+            _scoring_pool.shutdown(wait=False, cancel_futures=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+    # Servers run without lifespan events still get the shared state
+    service.start()
+
+    started = time.perf_counter()
+    method, path = scope['method'], scope['path']
+    if method == 'OPTIONS':
+        await send_body(send, 200, b'', b'text/plain')
+        return
+    handler = ROUTES.get((method, path))
+    if handler is None:
+        if any(route_path == path for _, route_path in ROUTES):
+            await send_json(send, error_payload("Method not allowed", message="The HTTP method is not allowed for this endpoint"), 405)
+        else:
+            await send_json(send, error_payload("Endpoint not found", message="The requested endpoint does not exist"), 404)
+        return
+
+    body = await read_body(receive)
+    if body is None:
+        await send_json(send, error_payload("Request body too large or client disconnected"), 400)
+        return
+
+    status = None
+
+    async def tracked_send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        await send(message)
+
+    try:
+        await handler(Request(scope, body), tracked_send)
+    except Exception as e:
+        logger.error(f"Error in {handler.__name__}: {str(e)}")
+        if status is not None:
+            # Headers are already out; all we can do is end the stream
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        status = 500
+        await send_json(send, error_payload(
+            "Internal server error occurred while processing recommendations",
+            timestamp=str(datetime.now().isoformat())
+        ), 500)
+    finally:
+        if handler is not metrics_endpoint:
+            metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=handler.__name__, status=status)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=int(os.environ.get('PORT', 8000)))
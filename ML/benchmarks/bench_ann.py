@@ -0,0 +1,106 @@
+"""Recall and latency of embedding-index retrieval against exact TF-IDF cosine.
+
+Jobs and users are synthetic texts drawn from overlapping topic vocabularies.
+Recall@k is the share of the exact top-k jobs found among the candidates the
+index returns; with exact re-scoring of those candidates this is also the
+share of the final top-k that survives retrieval.
+Run from ML/:  python -m benchmarks.bench_ann [--jobs 100000] [--users 200] [--probes 4 8 16 32]
+"""
+import argparse
+import json
+import random
+import time
+import numpy as np
+from ann import ANN_CANDIDATES, ANN_DIMENSIONS, JobEmbeddingIndex
+from model import JobRecommendationTransformer
+from reranker import top_k_indices
+
+TOPICS = [
+    "python django flask api backend postgresql redis celery rest microservices",
+    "java spring boot hibernate maven kafka microservices jvm backend",
+    "react javascript typescript frontend css html redux nextjs webpack",
+    "data science pandas numpy machine learning statistics sklearn jupyter",
+    "devops kubernetes docker terraform aws ci cd monitoring linux",
+    "android kotlin mobile ios swift flutter app store",
+    "sql etl data engineering spark airflow warehouse dbt snowflake",
+    "qa testing selenium automation cypress test plans regression",
+    "product manager roadmap stakeholders agile scrum analytics",
+    "ui ux design figma prototyping user research wireframes",
+    "security penetration testing soc siem compliance iam",
+    "embedded c cpp firmware rtos microcontroller hardware"
+]
+FILLER = "team work remote experience company benefits growth build deliver customers ownership".split()
+
+
+def synthetic_text(rng, topics, words):
+    vocabulary = [word for topic in topics for word in TOPICS[topic].split()]
+    return ' '.join(rng.choice(vocabulary) if rng.random() < 0.7 else rng.choice(FILLER) for _ in range(words))
+
+
+def synthetic_corpus(num_jobs, num_users, seed=0):
+    rng = random.Random(seed)
+    jobs = [synthetic_text(rng, rng.sample(range(len(TOPICS)), rng.choice([1, 2])), 80) for _ in range(num_jobs)]
+    users = [synthetic_text(rng, rng.sample(range(len(TOPICS)), 2), 30) for _ in range(num_users)]
+    return jobs, users
+
+
+def run(num_jobs, num_users, probes, dimensions, candidates, ks):
+    jobs, users = synthetic_corpus(num_jobs, num_users)
+    from sklearn.base import clone
+    vectorizer = clone(JobRecommendationTransformer().vectorizer)
+    job_vectors = vectorizer.fit_transform(jobs)
+    user_vectors = vectorizer.transform(users)
+
+    start = time.perf_counter()
+    index = JobEmbeddingIndex.build(job_vectors, dimensions)
+    build_seconds = time.perf_counter() - start
+
+    # Exact cosine: TF-IDF rows are already L2-normalized
+    start = time.perf_counter()
+    exact = [top_k_indices((job_vectors @ user_vectors[u].T).toarray().ravel(), max(ks)) for u in range(num_users)]
+    exact_ms = (time.perf_counter() - start) / num_users * 1000
+    yield {
+        "benchmark": "ann",
+        "variant": "exact",
+        "jobs": num_jobs,
+        "users": num_users,
+        "ms_per_user": round(exact_ms, 3)
+    }
+
+    for n_probes in probes:
+        start = time.perf_counter()
+        retrieved = [index.candidates(user_vectors[u], candidates, n_probes) for u in range(num_users)]
+        ann_ms = (time.perf_counter() - start) / num_users * 1000
+        row = {
+            "benchmark": "ann",
+            "variant": "ivf",
+            "jobs": num_jobs,
+            "users": num_users,
+            "dimensions": dimensions,
+            "lists": len(index.index.centroids),
+            "probes": n_probes,
+            "candidates": candidates,
+            "build_seconds": round(build_seconds, 2),
+            "ms_per_user": round(ann_ms, 3)
+        }
+        for k in ks:
+            hits = [len(set(exact[u][:k]) & set(retrieved[u])) / k for u in range(num_users)]
+            row[f"recall@{k}"] = round(float(np.mean(hits)), 4)
+        yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--probes', type=int, nargs='+', default=[4, 8, 16, 32])
+    parser.add_argument('--dimensions', type=int, default=ANN_DIMENSIONS)
+    parser.add_argument('--candidates', type=int, default=ANN_CANDIDATES)
+    parser.add_argument('--k', type=int, nargs='+', default=[10, 50])
+    args = parser.parse_args()
+    for row in run(args.jobs, args.users, args.probes, args.dimensions, args.candidates, args.k):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Delta catalog sync against a paged stub change log, compared with a full re-pull.
+
+The stub backend serves raw jobs changed after a watermark. After the initial
+load a small share of jobs is updated or deleted upstream; the delta sync must
+apply exactly those changes and hand only them to the transformer.
+Correctness is covered by tests/test_delta_sync.py; this only reports timings.
+Run from ML/:  python -m benchmarks.bench_delta_sync [--jobs 20000] [--changed 200] [--page-size 500]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+import http_client
+from benchmarks.stubs import start_changes_backend, stub_jobs
+from catalog import JobCatalog
+from model import JobRecommendationTransformer
+from normalize import normalize_job_data
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def stamp(sequence):
+    return (EPOCH + timedelta(seconds=sequence)).isoformat()
+
+
+def fetcher(url):
+    def fetch_changes(since, cursor=None, limit=500):
+        params = {'since': since, 'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        response = http_client.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        return response.json()
+    return fetch_changes
+
+
+def run(num_jobs, num_changed, page_size):
+    changes = []
+    for sequence, job in enumerate(stub_jobs('python', num_jobs)):
+        changes.append(dict(job, updated_at=stamp(sequence)))
+    server, url = start_changes_backend(changes)
+    fetch_changes = fetcher(url)
+
+    transformer = JobRecommendationTransformer()
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = JobCatalog(os.path.join(directory, 'catalog.db'))
+        catalog.add_listener(transformer.update_jobs)
+
+        start = time.perf_counter()
+        catalog.delta_sync(fetch_changes, normalize_job_data, page_size)
+        initial_seconds = time.perf_counter() - start
+
+        # Upstream edits: every other changed job is updated, the rest deleted
+        sequence = num_jobs
+        updated = deleted = 0
+        for i in range(0, num_jobs, max(1, num_jobs // num_changed))[:num_changed]:
+            job = dict(changes[i], updated_at=stamp(sequence))
+            sequence += 1
+            if updated <= deleted:
+                job['title'] = f"{job['title']} (updated)"
+                updated += 1
+            else:
+                job['deleted'] = True
+                deleted += 1
+            changes.append(job)
+
+        start = time.perf_counter()
+        catalog.delta_sync(fetch_changes, normalize_job_data, page_size)
+        delta_seconds = time.perf_counter() - start
+
+        # What every sync cost before: pull everything again from the start
+        catalog.watermark = ''
+        start = time.perf_counter()
+        catalog.delta_sync(fetch_changes, normalize_job_data, page_size)
+        full_seconds = time.perf_counter() - start
+    server.shutdown()
+
+    for variant, seconds, jobs in (
+            ('initial_load', initial_seconds, num_jobs),
+            ('full_repull', full_seconds, len(changes)),
+            ('delta', delta_seconds, num_changed)):
+        yield {
+            "benchmark": "delta_sync",
+            "variant": variant,
+            "catalog_jobs": num_jobs,
+            "jobs_pulled": jobs,
+            "page_size": page_size,
+            "seconds": round(seconds, 3)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--changed', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=500)
+    args = parser.parse_args()
+    for row in run(args.jobs, args.changed, args.page_size):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
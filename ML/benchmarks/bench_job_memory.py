@@ -0,0 +1,97 @@
+"""Memory held by a normalized job catalog as dicts and as compact JobRecords.
+
+Descriptions are drawn word by word from a fixed vocabulary so they
+compress roughly like real postings rather than like repeated text.
+Run from ML/:  python -m benchmarks.bench_job_memory [--jobs 100000] [--description-words 250]
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from job_record import compact_jobs
+from normalize import normalize_job_data
+
+WORDS = (
+    "we are looking for an experienced engineer to design build and operate scalable services "
+    "you will work with product and data teams on apis pipelines and dashboards "
+    "requirements python java go sql docker kubernetes aws gcp terraform react node "
+    "strong communication ownership mentoring testing code review on call benefits include "
+    "health insurance remote stipend learning budget equity flexible hours"
+).split()
+CATEGORIES = ['Software Development', 'Data', 'DevOps', 'Design', 'Product', 'QA']
+LOCATIONS = ['Worldwide', 'Pune', 'Bangalore', 'USA Only', 'Europe', 'Remote']
+JOB_TYPES = ['full_time', 'contract', 'part_time', 'internship']
+
+
+def synthetic_raw_jobs(count, description_words, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'id': i,
+            'title': f"{rng.choice(WORDS).title()} {rng.choice(['Engineer', 'Developer', 'Analyst'])}",
+            'company_name': f"Company {rng.randrange(2000)}",
+            'category': rng.choice(CATEGORIES),
+            'tags': rng.sample(WORDS, 4),
+            'job_type': rng.choice(JOB_TYPES),
+            'publication_date': f"2026-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}T00:00:00",
+            'candidate_required_location': rng.choice(LOCATIONS),
+            'description': ' '.join(rng.choice(WORDS) for _ in range(description_words)),
+            'salary': f"${rng.randrange(40, 200)}k",
+            'application_url': f"https://jobs.example.com/{i}"
+        }
+
+
+def traced(build):
+    """Build a catalog and return (catalog, bytes it holds, seconds to build)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    catalog = build()
+    seconds = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return catalog, held, seconds
+
+
+def run(num_jobs, description_words):
+    # Inputs are rebuilt per variant so neither shares strings with the other
+    variants = [
+        ('dict', lambda: normalize_job_data(synthetic_raw_jobs(num_jobs, description_words))),
+        ('job_record', lambda: compact_jobs(normalize_job_data(synthetic_raw_jobs(num_jobs, description_words))))
+    ]
+    for name, build in variants:
+        catalog, held, seconds = traced(build)
+        start = time.perf_counter()
+        for job in catalog:
+            job.get('title'), job.get('candidate_required_location'), job.get('tags')
+        field_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for job in catalog[:1000]:
+            job.get('description')
+        description_seconds = time.perf_counter() - start
+        yield {
+            "benchmark": "job_memory",
+            "variant": name,
+            "jobs": num_jobs,
+            "held_mb": round(held / 2 ** 20, 1),
+            "bytes_per_job": round(held / num_jobs),
+            "build_seconds": round(seconds, 3),
+            "field_reads_us_per_job": round(field_seconds / num_jobs * 1e6, 3),
+            "description_read_us": round(description_seconds / min(1000, num_jobs) * 1e6, 2)
+        }
+        del catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--description-words', type=int, default=250)
+    args = parser.parse_args()
+    for row in run(args.jobs, args.description_words):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Throughput of the schema-driven normalize_job_data against the previous one.
+
+Run from ML/:  python -m benchmarks.bench_normalize [--jobs 100000] [--repeat 3]
+"""
+import argparse
+import json
+import logging
+import random
+import time
+from normalize import normalize_job_data
+
+logger = logging.getLogger('benchmarks.normalize')
+
+SKILLS = ['python', 'django', 'java', 'spring boot', 'react', 'sql', 'docker', 'aws', 'kubernetes', 'go']
+
+
+def synthetic_jobs(count, seed=0):
+    """Raw jobs in the three payload shapes seen from job sources"""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(SKILLS, 3)
+        description = f"Build and run services with {', '.join(skills)}. " * 8
+        shape = i % 3
+        if shape == 0:
+            # Our backend: Mongo ids, JSON-encoded tag strings
+            jobs.append({
+                '_id': f"{i:024x}", 'title': f"{skills[0].title()} Developer", 'company': f"Company {i % 500}",
+                'tags': json.dumps(skills), 'job_type': 'Full-Time', 'location': 'Pune',
+                'description': description, 'salary': '', 'updated_at': '2026-01-01'
+            })
+        elif shape == 1:
+            # Remotive-style listing
+            jobs.append({
+                'id': i, 'title': f"Senior {skills[1].title()} Engineer", 'company_name': f"Remote Co {i % 300}",
+                'category': 'Software Development', 'tags': skills, 'job_type': 'contract',
+                'publication_date': '2026-01-01T00:00:00', 'candidate_required_location': 'Worldwide',
+                'description': description, 'salary': '$100k'
+            })
+        else:
+            # Scraped listing without ids
+            jobs.append({
+                'job_title': f"{skills[2].title()} Engineer", 'employer': f"Startup {i % 200}",
+                'skills': ', '.join(skills), 'employment_type': 'Full-Time', 'city': 'Bangalore',
+                'job_description': description, 'is_remote': bool(i % 2), 'posted_at': i
+            })
+    return jobs
+
+
+def legacy_normalize_job_data(jobs):
+    """normalize_job_data before the schema-driven rewrite"""
+    normalized_jobs = []
+    for job in jobs:
+        try:
+            if not isinstance(job, dict):
+                logger.warning(f"Skipping non-dict job: {job}")
+                continue
+            normalized_job = {
+                'id': str(job.get('id') or job.get('job_id') or job.get('_id') or hash(str(job))),
+                'title': str(job.get('title') or job.get('job_title') or job.get('position') or 'Unknown Job'),
+                'company_name': str(job.get('company_name') or job.get('company') or job.get('employer') or 'Unknown Company'),
+                'category': str(job.get('category') or job.get('job_category') or job.get('department') or ''),
+                'tags': job.get('tags') or job.get('skills') or job.get('keywords', []),
+                'job_type': str(job.get('job_type') or job.get('employment_type') or job.get('type') or ''),
+                'publication_date': str(job.get('publication_date') or job.get('posted_date') or job.get('updated_at') or ''),
+                'candidate_required_location': str(job.get('candidate_required_location') or job.get('location') or job.get('city') or ''),
+                'description': str(job.get('description') or job.get('job_description') or job.get('details', '') or ''),
+                'salary': str(job.get('salary') or job.get('salary_range') or ''),
+                'experience_required': str(job.get('experience_required') or job.get('experience_level') or ''),
+                'application_url': str(job.get('application_url') or job.get('apply_url') or ''),
+                'remote_allowed': job.get('remote_allowed') or job.get('is_remote', False)
+            }
+            
+            # Handle tags formatting
+            if isinstance(normalized_job['tags'], str):
+                try:
+                    # Attempt to parse JSON-encoded string
+                    parsed_tags = json.loads(normalized_job['tags'])
+                    if isinstance(parsed_tags, list):
+                        # Clean and join tags into a single string
+                        cleaned_tags = [str(tag).strip('[]"') for tag in parsed_tags if tag]
+                        normalized_job['tags'] = [', '.join(cleaned_tags)] if cleaned_tags else []
+                    else:
+                        logger.warning(f"Parsed tags is not a list: {parsed_tags}")
+                        normalized_job['tags'] = [normalized_job['tags'].strip('[]').replace('"', '')]
+                except json.JSONDecodeError:
+                    # Handle non-JSON string (e.g., comma-separated)
+                    cleaned_tags = [tag.strip('[]"') for tag in normalized_job['tags'].split(',') if tag.strip('[]"')]
+                    normalized_job['tags'] = [', '.join(cleaned_tags)] if cleaned_tags else []
+            elif isinstance(normalized_job['tags'], list):
+                # Clean list elements and join into a single string
+                cleaned_tags = [str(tag).strip('[]"') for tag in normalized_job['tags'] if tag]
+                normalized_job['tags'] = [', '.join(cleaned_tags)] if cleaned_tags else []
+            else:
+                logger.warning(f"Unexpected tags format: {normalized_job['tags']}")
+                normalized_job['tags'] = []
+            
+            # Log job details for debugging
+            if not normalized_job['id'] or normalized_job['title'] == 'Unknown Job':
+                logger.warning(f"Job missing id or title: {normalized_job}")
+            normalized_jobs.append(normalized_job)
+                
+        except Exception as e:
+            logger.warning(f"Error normalizing job data: {e}, job: {job}")
+            continue
+    
+    logger.info(f"Normalized {len(normalized_jobs)} jobs out of {len(jobs)} raw jobs")
+    return normalized_jobs
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(num_jobs, repeat):
+    jobs = synthetic_jobs(num_jobs)
+    legacy_seconds, legacy = _best_of(lambda: legacy_normalize_job_data(jobs), repeat)
+    schema_seconds, schema = _best_of(lambda: normalize_job_data(jobs), repeat)
+    # Ids of jobs without one differ by design: content hash instead of hash(str(job))
+    assert [dict(job, id=None) for job in legacy] == [dict(job, id=None) for job in schema]
+    assert all(a['id'] == b['id'] for raw, a, b in zip(jobs, legacy, schema) if 'job_title' not in raw)
+    for name, seconds in (('legacy', legacy_seconds), ('schema', schema_seconds)):
+        yield {
+            "benchmark": "normalize",
+            "variant": name,
+            "jobs": num_jobs,
+            "seconds": round(seconds, 4),
+            "jobs_per_second": round(num_jobs / seconds)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for row in run(args.jobs, args.repeat):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Compare PDF text extraction backends and page limits on sample resumes.
+
+Besides each sample, a long document is built by repeating the sample's
+pages, standing in for multi-page portfolios.
+Run from ML/:  python -m benchmarks.bench_pdf [--pdfs ../public/22CE116_Resume.pdf] [--long-pages 40]
+"""
+import argparse
+import io
+import json
+import os
+import time
+import tracemalloc
+import pdf_text
+
+DEFAULT_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'public', '22CE116_Resume.pdf')
+
+
+def repeat_pages(data, total_pages):
+    """A PDF with the sample's pages repeated up to total_pages"""
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    writer = PyPDF2.PdfWriter()
+    for index in range(total_pages):
+        writer.add_page(reader.pages[index % len(reader.pages)])
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def baseline_extract(data):
+    """extract_resume_data before page limits: every page, string +="""
+    import PyPDF2
+    text = ""
+    for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+        text += page.extract_text() + "\n"
+    return text
+
+
+def measure(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = fn()
+        best = min(best, time.perf_counter() - start)
+    # Python allocations only; native parsers (pdfium) are not traced
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, len(text)
+
+
+def run(paths, long_pages, max_pages, repeat):
+    documents = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        documents.append((os.path.basename(path), data))
+        if long_pages:
+            documents.append((f"{os.path.basename(path)} x{long_pages} pages", repeat_pages(data, long_pages)))
+
+    for name, data in documents:
+        variants = [('baseline_pypdf2_all_pages', lambda: baseline_extract(data))]
+        for backend in pdf_text.BACKENDS:
+            if backend in pdf_text.available_backends():
+                variants.append((f"{backend}_first_{max_pages}", lambda b=backend: pdf_text.extract_text(data, max_pages, b)))
+        for variant, fn in variants:
+            seconds, peak, chars = measure(fn, repeat)
+            yield {
+                "benchmark": "pdf",
+                "document": name,
+                "bytes": len(data),
+                "variant": variant,
+                "ms": round(seconds * 1000, 2),
+                "peak_python_kb": round(peak / 1024, 1),
+                "chars": chars
+            }
+        skipped = [backend for backend in pdf_text.BACKENDS if backend not in pdf_text.available_backends()]
+        if skipped:
+            yield {"benchmark": "pdf", "document": name, "not_installed": skipped}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pdfs', nargs='+', default=[DEFAULT_PDF])
+    parser.add_argument('--long-pages', type=int, default=40, help="Pages in the synthetic long document (0 to skip)")
+    parser.add_argument('--max-pages', type=int, default=pdf_text.RESUME_MAX_PAGES)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for row in run(args.pdfs, args.long_pages, args.max_pages, args.repeat):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""End-to-end recommendation pipeline benchmark over synthetic catalogs and profiles.
+
+Sweeps catalog size, tags per job/skills per profile, resume presence, top_n
+and scoring mode. Each configuration gets a fresh transformer, one untimed
+warm-up user (skip with --cold), then every user is timed. The output is one
+JSON line per configuration, with per-stage milliseconds per user (from the
+same stage timers /metrics exports), throughput and peak traced memory.
+Pass --out to save the results and --baseline to compare with a saved run.
+
+Run from ML/:
+    python -m benchmarks.bench_pipeline [--sizes 100 1000 10000] [--tags 3] [--resume off on]
+        [--top-n 10] [--modes single batch] [--users 20] [--out run.jsonl] [--baseline old.jsonl]
+1M-job catalogs are supported (--sizes 1000000) but are only practical in batch mode.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+import metrics
+from benchmarks import synthetic
+from model import JobRecommendationTransformer
+
+SAMPLE_RESUME = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'public', '22CE116_Resume.pdf')
+CONFIG_FIELDS = ('mode', 'catalog_size', 'tags', 'resume', 'top_n', 'users')
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_resume():
+    with open(SAMPLE_RESUME, 'rb') as f:
+        return f.read()
+
+
+def score_users(transformer, mode, jobs, users, top_n, resume_pdf):
+    """Score every user; returns per-user latencies in seconds"""
+    latencies = []
+    if mode == 'single':
+        for user in users:
+            start = time.perf_counter()
+            resume_data = transformer.parse_resume(resume_pdf) if resume_pdf else None
+            transformer.recommend_jobs(user, jobs, top_n, resume_data=resume_data)
+            latencies.append(time.perf_counter() - start)
+    else:
+        start = time.perf_counter()
+        resumes = [transformer.parse_resume(resume_pdf) for _ in users] if resume_pdf else None
+        for _ in transformer.recommend_jobs_batch(users, jobs, top_n, resumes=resumes):
+            pass
+        latencies = [(time.perf_counter() - start) / len(users)] * len(users)
+    return latencies
+
+
+def run_config(mode, jobs, users, warmup_user, top_n, resume_pdf, trace_memory):
+    transformer = JobRecommendationTransformer()
+    transformer.warmup()
+    if warmup_user is not None:
+        score_users(transformer, mode, jobs, [warmup_user], top_n, resume_pdf)
+
+    with metrics.collect_timings() as timings:
+        started = time.perf_counter()
+        latencies = score_users(transformer, mode, jobs, users, top_n, resume_pdf)
+        seconds = time.perf_counter() - started
+
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        score_users(transformer, mode, jobs, users[:1] if mode == 'single' else users, top_n, resume_pdf)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    return {
+        "seconds": round(seconds, 4),
+        "users_per_second": round(len(users) / seconds, 2),
+        "ms_per_user": round(seconds / len(users) * 1000, 3),
+        "p50_ms": round(statistics.median(latencies_ms), 3),
+        "p95_ms": round(latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.95))], 3),
+        "stages_ms_per_user": {
+            stage: round(total * 1000 / len(users), 3) for stage, total in sorted(timings.items())
+        },
+        "peak_traced_mb": round(peak / 2 ** 20, 2) if peak is not None else None,
+        "job_cache_hit_rate": transformer.job_cache.stats().get('hit_rate')
+    }
+
+
+def config_key(row):
+    return tuple(row.get(field) for field in CONFIG_FIELDS)
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return {config_key(row): row for row in rows if row.get('benchmark') == 'pipeline'}
+
+
+def run(args):
+    resume_pdf = load_resume() if 'on' in args.resume else None
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+    environment = {"commit": current_commit(), "python": platform.python_version()}
+    catalogs = {}
+    for size, tags, resume, top_n, mode in itertools.product(args.sizes, args.tags, args.resume, args.top_n, args.modes):
+        if (size, tags) not in catalogs:
+            catalogs.clear()
+            catalogs[(size, tags)] = synthetic.jobs(size, num_tags=tags, seed=args.seed)
+        jobs = catalogs[(size, tags)]
+        users = synthetic.profiles(args.users + 1, num_skills=tags, seed=args.seed + 1)
+        row = {
+            "benchmark": "pipeline",
+            **environment,
+            "mode": mode,
+            "catalog_size": size,
+            "tags": tags,
+            "resume": resume,
+            "top_n": top_n,
+            "users": args.users
+        }
+        row.update(run_config(
+            mode, jobs, users[1:], None if args.cold else users[0], top_n,
+            resume_pdf if resume == 'on' else None, not args.no_memory
+        ))
+        previous = baseline.get(config_key(row))
+        if previous:
+            row["baseline_commit"] = previous.get("commit")
+            row["baseline_ms_per_user"] = previous["ms_per_user"]
+            row["change_pct"] = round((row["ms_per_user"] / previous["ms_per_user"] - 1) * 100, 1)
+        yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--tags', type=int, nargs='+', default=[3])
+    parser.add_argument('--resume', choices=['off', 'on'], nargs='+', default=['off', 'on'])
+    parser.add_argument('--top-n', type=int, nargs='+', default=[10])
+    parser.add_argument('--modes', choices=['single', 'batch'], nargs='+', default=['single', 'batch'])
+    parser.add_argument('--users', type=int, default=20, help="Timed users per configuration")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cold', action='store_true', help="Skip the warm-up user, timing cold caches")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--out', help="Also write the result lines to this file")
+    parser.add_argument('--baseline', help="Result file of an earlier run to compare against")
+    args = parser.parse_args()
+    out = open(args.out, 'w', encoding='utf-8') if args.out else None
+    try:
+        for row in run(args):
+            line = json.dumps(row)
+            print(line, flush=True)
+            if out:
+                out.write(line + '\n')
+                out.flush()
+    finally:
+        if out:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
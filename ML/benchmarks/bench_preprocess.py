@@ -0,0 +1,93 @@
+"""Compare per-token WordNet lemmatization against the memoized lemma table.
+
+Run from ML/:  python -m benchmarks.bench_preprocess [--jobs 5000] [--repeat 3]
+"""
+import argparse
+import json
+import random
+import re
+import time
+from lemmas import LemmaTable
+from nlp_resources import load_nlp_resources
+from skills import SkillMatcher
+
+FILLER = (
+    "we are looking for an experienced engineer to join our growing team you will design build "
+    "and maintain scalable services collaborate with product managers and mentor junior developers "
+    "requirements include strong communication skills ownership of deliverables and experience "
+    "working in agile environments benefits include remote work health insurance and learning budgets "
+    "responsibilities writing tests reviewing code deploying applications monitoring systems"
+).split()
+
+
+def job_corpus(count, seed=0):
+    """Job-like texts drawn from the skills dictionary and common posting phrasing"""
+    rng = random.Random(seed)
+    skills = SkillMatcher.from_file().skills
+    titles = ['Backend Developer', 'Data Engineer', 'Frontend Engineer', 'DevOps Engineer', 'ML Engineer']
+    texts = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=120) + rng.sample(skills, 8)
+        rng.shuffle(words)
+        texts.append(f"{rng.choice(titles)}. {' '.join(words)}. {rng.randint(1, 8)}+ years of experience, Full-Time.")
+    return texts
+
+
+def baseline_preprocess(text, lemmatizer, stop_words):
+    """preprocess_text before the lemma table"""
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    if lemmatizer and stop_words:
+        tokens = [
+            lemmatizer.lemmatize(word)
+            for word in text.split()
+            if word not in stop_words and len(word) > 2
+        ]
+    else:
+        tokens = [word for word in text.split() if len(word) > 2]
+    return " ".join(tokens)
+
+
+def _timed(fn, texts):
+    start = time.perf_counter()
+    outputs = [fn(text) for text in texts]
+    return time.perf_counter() - start, outputs
+
+
+def run(num_jobs, repeat):
+    # Without WordNet both sides skip lemmatization and only the tokenizer is compared
+    lemmatizer, stop_words = load_nlp_resources()
+    texts = job_corpus(num_jobs)
+    tokens = sum(len(text.split()) for text in texts)
+
+    baseline = min(_timed(lambda t: baseline_preprocess(t, lemmatizer, stop_words), texts)[0] for _ in range(repeat))
+    table = LemmaTable(lemmatizer, stop_words, path=None)
+    cold, cold_outputs = _timed(table.process, texts)
+    warm = min(_timed(table.process, texts)[0] for _ in range(repeat))
+    expected = [baseline_preprocess(text, lemmatizer, stop_words) for text in texts]
+    assert cold_outputs == expected, "lemma table output differs from baseline"
+
+    for name, seconds in (('baseline', baseline), ('lemma_table_cold', cold), ('lemma_table_warm', warm)):
+        yield {
+            "benchmark": "preprocess",
+            "variant": name,
+            "jobs": num_jobs,
+            "tokens": tokens,
+            "seconds": round(seconds, 4),
+            "jobs_per_second": round(num_jobs / seconds, 1),
+            "tokens_per_second": round(tokens / seconds),
+            "memo_size": len(table) if name != 'baseline' else None,
+            "lemmatizer": lemmatizer is not None
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for row in run(args.jobs, args.repeat):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
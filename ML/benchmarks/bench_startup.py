@@ -0,0 +1,88 @@
+"""Measure cold-start cost: module import time and first-request latency.
+
+Each mode runs in a fresh interpreter against a local stub job backend.
+Run from ML/:  python -m benchmarks.bench_startup [--modes default preload preload_download] [--runs 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from benchmarks.stubs import SAMPLE_USER, start_job_backend
+
+MODES = {
+    'default': {},
+    'preload': {'ML_PRELOAD': 'true'},
+    'preload_download': {'ML_PRELOAD': 'true', 'NLTK_AUTO_DOWNLOAD': 'true'}
+}
+
+# Executed in the child interpreter; prints one JSON object
+_CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+import model
+model_loaded = time.perf_counter()
+import app
+app_loaded = time.perf_counter()
+heavy = sorted(m for m in ('nltk', 'sklearn', 'scipy', 'PyPDF2', 'requests') if m in sys.modules)
+import threading
+for thread in threading.enumerate():
+    if thread.name == 'model-warmup':
+        thread.join()
+warmed = time.perf_counter()
+client = app.app.test_client()
+user = json.loads(sys.argv[1])
+first_start = time.perf_counter()
+first = client.post('/api/recommend', json=user)
+first_done = time.perf_counter()
+second = client.post('/api/recommend', json=user)
+second_done = time.perf_counter()
+print(json.dumps({
+    "import_model_ms": (model_loaded - start) * 1000,
+    "import_app_ms": (app_loaded - model_loaded) * 1000,
+    "preload_ms": (warmed - app_loaded) * 1000,
+    "first_request_ms": (first_done - first_start) * 1000,
+    "second_request_ms": (second_done - first_done) * 1000,
+    "heavy_modules_after_import": heavy,
+    "status": [first.status_code, second.status_code]
+}))
+'''
+
+
+def run_once(env, user):
+    result = subprocess.run(
+        [sys.executable, '-c', _CHILD, json.dumps(user)],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(modes, runs, latency):
+    server, url = start_job_backend(latency=latency)
+    try:
+        for mode in modes:
+            env = dict(os.environ, EXTERNAL_JOB_API_URL=url, **MODES[mode])
+            samples = [run_once(env, SAMPLE_USER) for _ in range(runs)]
+            row = {"benchmark": "startup", "mode": mode, "runs": runs}
+            for key in ('import_model_ms', 'import_app_ms', 'preload_ms', 'first_request_ms', 'second_request_ms'):
+                row[key] = round(statistics.median(sample[key] for sample in samples), 1)
+            row["heavy_modules_after_import"] = samples[-1]["heavy_modules_after_import"]
+            row["status"] = samples[-1]["status"]
+            yield row
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help="Stub backend latency per request, in seconds")
+    args = parser.parse_args()
+    for row in run(args.modes, args.runs, args.latency):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Compare full sorting against argpartition top-k selection of similarity scores.
+
+Run from ML/:  python -m benchmarks.bench_topk [--sizes 1000 10000 ...] [--k 20]
+"""
+import argparse
+import json
+import time
+import numpy as np
+from reranker import top_k_indices
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, k, repeat, seed=0):
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        scores = rng.random(n)
+        jobs = [{'id': str(i)} for i in range(n)]
+
+        def tuple_sort():
+            # What calculate_match_scores did before it moved to top-k selection
+            job_scores = [(jobs[i], scores[i]) for i in range(n)]
+            job_scores.sort(key=lambda x: x[1], reverse=True)
+            return job_scores[:k]
+
+        expected = np.argsort(-scores, kind='stable')[:k]
+        assert np.array_equal(top_k_indices(scores, k), expected)
+        yield {
+            "benchmark": "topk",
+            "candidates": n,
+            "k": k,
+            "tuple_sort_ms": round(_best_of(tuple_sort, repeat) * 1000, 3),
+            "argsort_ms": round(_best_of(lambda: np.argsort(-scores, kind='stable')[:k], repeat) * 1000, 3),
+            "top_k_ms": round(_best_of(lambda: top_k_indices(scores, k), repeat) * 1000, 3)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    for row in run(args.sizes, args.k, args.repeat):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""Load test /api/recommend against local stubs of the job backend and resume hosting.
+
+Starts a stub getRelatedJobs backend and a static resume server (both with
+configurable latency and payload size), launches the API in a child process
+per serving mode, drives POST /api/recommend at a fixed concurrency for a
+fixed duration, and prints one JSON line per mode with throughput,
+p50/p95/p99 latency and error rate.
+
+Modes: flask (the threaded server app.py runs), gunicorn (one sync worker,
+if gunicorn is installed) and asgi (one uvicorn worker).
+The response cache is disabled and every request gets a distinct profile
+and resume URL unless --repeat-profiles / --repeat-resumes are given, so
+each request pays for the job fetch, resume download and scoring.
+
+Run from ML/:
+    python -m benchmarks.load_test [--modes flask asgi] [--concurrency 1 8 32] [--duration 20]
+        [--backend-latency 0.05] [--jobs-per-tag 50] [--description-words 200]
+        [--resume-latency 0.05] [--resume-pages 2]
+"""
+import argparse
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from benchmarks import synthetic
+from benchmarks.stubs import start_job_backend, start_resume_server
+
+ML_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SAMPLE_RESUME = os.path.join(ML_DIR, '..', 'public', '22CE116_Resume.pdf')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(mode, port):
+    if mode == 'flask':
+        return [sys.executable, '-c', (
+            "import app; app.app.run(host='127.0.0.1', port=%d, threaded=True)" % port
+        )]
+    if mode == 'gunicorn':
+        return [sys.executable, '-m', 'gunicorn', '--workers', '1', '--bind', f'127.0.0.1:{port}', 'app:app']
+    return [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--host', '127.0.0.1', '--port', str(port),
+            '--workers', '1', '--log-level', 'warning']
+
+
+def mode_available(mode):
+    module = {'gunicorn': 'gunicorn', 'asgi': 'uvicorn'}.get(mode)
+    if module is None:
+        return True
+    import importlib.util
+    return importlib.util.find_spec(module) is not None
+
+
+def start_server(mode, env, startup_timeout=120):
+    """Launch the API in a child process and wait until it answers; returns (process, base_url)"""
+    import requests
+    port = free_port()
+    process = subprocess.Popen(
+        server_command(mode, port), cwd=ML_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{mode} server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{mode} server did not start within {startup_timeout}s")
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def drive(base_url, profiles, concurrency, duration, top_n, timeout, counter=None):
+    """Send requests from concurrency threads for duration seconds; returns (latencies, statuses, seconds)"""
+    import requests
+    counter = counter or itertools.count()
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    url = f"{base_url}/api/recommend?top_n={top_n}"
+    stop_at = time.perf_counter() + duration
+
+    def worker():
+        session = requests.Session()
+        while time.perf_counter() < stop_at:
+            profile = profiles[next(counter) % len(profiles)]
+            start = time.perf_counter()
+            try:
+                status = session.post(url, json=profile, timeout=timeout).status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, time.perf_counter() - started
+
+
+def build_profiles(count, resume_base_url, repeat_resumes):
+    profiles = synthetic.profiles(count)
+    for index, profile in enumerate(profiles):
+        # A distinct URL per profile defeats the resume cache, so each request downloads
+        profile['users']['resumeUrl'] = (
+            f"{resume_base_url}/resume.pdf" if repeat_resumes else f"{resume_base_url}/resume-{index}.pdf"
+        ) if resume_base_url else ''
+    return profiles
+
+
+def load_resume(pages):
+    with open(SAMPLE_RESUME, 'rb') as f:
+        data = f.read()
+    if pages:
+        from benchmarks.bench_pdf import repeat_pages
+        data = repeat_pages(data, pages)
+    return data
+
+
+def run(args):
+    _, backend_url = start_job_backend(
+        latency=args.backend_latency, jobs_per_tag=args.jobs_per_tag, description_words=args.description_words
+    )
+    resume_base_url = None
+    resume_bytes = 0
+    if not args.no_resume:
+        resume = load_resume(args.resume_pages)
+        resume_bytes = len(resume)
+        _, resume_base_url = start_resume_server(resume, latency=args.resume_latency)
+
+    env = dict(os.environ, EXTERNAL_JOB_API_URL=backend_url, ML_PRELOAD='true')
+    if not args.response_cache:
+        env['RESPONSE_CACHE_SIZE'] = '0'
+    profiles = build_profiles(args.repeat_profiles or 10000, resume_base_url, args.repeat_resumes)
+
+    for mode in args.modes:
+        if not mode_available(mode):
+            yield {"benchmark": "load_test", "mode": mode, "skipped": "not installed"}
+            continue
+        process, base_url = start_server(mode, env)
+        try:
+            # Untimed warm-up: NLTK, sklearn and connection pools
+            drive(base_url, profiles[-2:], 2, args.warmup, args.top_n, args.timeout)
+            # Shared across levels so a later level does not replay cached resume URLs
+            counter = itertools.count()
+            for concurrency in args.concurrency:
+                latencies, statuses, seconds = drive(
+                    base_url, profiles, concurrency, args.duration, args.top_n, args.timeout, counter
+                )
+                latencies_ms = sorted(latency * 1000 for latency in latencies)
+                ok = statuses.get(200, 0)
+                yield {
+                    "benchmark": "load_test",
+                    "mode": mode,
+                    "concurrency": concurrency,
+                    "duration_seconds": round(seconds, 2),
+                    "requests": len(latencies),
+                    "throughput_rps": round(ok / seconds, 2),
+                    "error_rate": round(1 - ok / len(latencies), 4) if latencies else None,
+                    "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+                    "p50_ms": round(percentile(latencies_ms, 0.50), 1) if latencies_ms else None,
+                    "p95_ms": round(percentile(latencies_ms, 0.95), 1) if latencies_ms else None,
+                    "p99_ms": round(percentile(latencies_ms, 0.99), 1) if latencies_ms else None,
+                    "backend_latency": args.backend_latency,
+                    "jobs_per_tag": args.jobs_per_tag,
+                    "resume_latency": None if args.no_resume else args.resume_latency,
+                    "resume_bytes": resume_bytes
+                }
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', choices=['flask', 'gunicorn', 'asgi'], nargs='+', default=['flask', 'gunicorn', 'asgi'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=20.0, help="Seconds per concurrency level")
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--backend-latency', type=float, default=0.05)
+    parser.add_argument('--jobs-per-tag', type=int, default=50)
+    parser.add_argument('--description-words', type=int, default=200)
+    parser.add_argument('--resume-latency', type=float, default=0.05)
+    parser.add_argument('--resume-pages', type=int, default=0, help="Repeat the sample resume to this many pages")
+    parser.add_argument('--no-resume', action='store_true', help="Profiles without a resume URL")
+    parser.add_argument('--repeat-profiles', type=int, default=0, help="Cycle through this many distinct profiles")
+    parser.add_argument('--repeat-resumes', action='store_true', help="One resume URL for every profile")
+    parser.add_argument('--response-cache', action='store_true', help="Keep the /api/recommend response cache on")
+    args = parser.parse_args()
+    for row in run(args):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Local stand-ins for the external job API, used by the benchmarks.
+
+Run standalone from ML/:  python -m benchmarks.stubs [--port 8765] [--latency 0.05]
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SAMPLE_USER = {
+    "users": {"firstName": "Bench", "lastName": "User", "email": "bench@example.com"},
+    "profileSummary": "Backend developer building APIs and data pipelines with Python and Django",
+    "keySkills": "python, django, sql, docker",
+    "preferedJobType": "Full-Time",
+    "preferedLocation": "Pune, Remote",
+    "education": {"degrees": [{"degreeName": "B.Tech", "courseName": "Computer Engineering"}]}
+}
+
+
+def stub_jobs(tag, count, description_words=0):
+    """Deterministic raw jobs for one tag, shaped like the backend payload
+
+    description_words pads each description to roughly that many words.
+    """
+    words = [tag, 'services', 'sql', 'docker', 'teams']
+    padding = ' '.join(words[i % len(words)] for i in range(description_words))
+    return [
+        {
+            "_id": f"{tag}-{i}",
+            "title": f"{tag.title()} Developer {i}",
+            "company_name": f"Company {i % 17}",
+            "tags": [tag, "remote"],
+            "job_type": "Full-Time" if i % 3 else "Contract",
+            "candidate_required_location": "Remote" if i % 2 else "Pune",
+            "description": f"Build services with {tag}, sql and docker. {i % 6 + 1}+ years of experience. {padding}".strip(),
+            "salary": "",
+            "category": "Software Development"
+        }
+        for i in range(count)
+    ]
+
+
+class JobBackendHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    jobs_per_tag = 20
+    description_words = 0
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        tag = query.get('tags', ['python'])[0]
+        limit = int(query.get('limit', [self.jobs_per_tag])[0])
+        if self.latency:
+            time.sleep(self.latency)
+        jobs = stub_jobs(tag, min(limit, self.jobs_per_tag), self.description_words)
+        body = json.dumps({"jobs": jobs}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_job_backend(port=0, latency=0.0, jobs_per_tag=20, description_words=0):
+    """Serve stub jobs from a daemon thread; returns (server, url)"""
+    handler = type('Handler', (JobBackendHandler,), {
+        'latency': latency, 'jobs_per_tag': jobs_per_tag, 'description_words': description_words
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='stub-job-backend', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/jobs/getRelatedJobs"
+
+
+class JobChangesHandler(BaseHTTPRequestHandler):
+    """Paged delta endpoint over a shared, append-only change log"""
+    changes = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        since = query.get('since', [''])[0]
+        offset = int(query.get('cursor', ['0'])[0])
+        limit = int(query.get('limit', ['500'])[0])
+        matching = [job for job in self.changes if job['updated_at'] > since]
+        page = matching[offset:offset + limit]
+        next_offset = offset + len(page)
+        body = json.dumps({
+            "jobs": page,
+            "next_cursor": str(next_offset) if next_offset < len(matching) else None
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_changes_backend(changes, port=0):
+    """Serve a change log of raw jobs (with updated_at, optionally deleted) in pages; returns (server, url)
+
+    The caller may append to changes while the server runs.
+    """
+    handler = type('Handler', (JobChangesHandler,), {'changes': changes})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='stub-job-changes', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/jobs/changes"
+
+
+class ResumeHandler(BaseHTTPRequestHandler):
+    """Serves the same PDF bytes under any path, e.g. /resume-<n>.pdf
+
+    With an etag, requests carrying it in If-None-Match get 304 Not Modified.
+    Every request's status is appended to statuses.
+    """
+    data = b''
+    latency = 0.0
+    etag = None
+    statuses = []
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.etag and self.headers.get('If-None-Match') == self.etag:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.end_headers()
+            return
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(self.data)))
+        if self.etag:
+            self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(self.data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_resume_server(data, port=0, latency=0.0, etag=None):
+    """Serve resume PDF bytes from a daemon thread; returns (server, base_url)"""
+    handler = type('Handler', (ResumeHandler,), {'data': data, 'latency': latency, 'etag': etag, 'statuses': []})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='stub-resume-server', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jobs-per-tag', type=int, default=20)
+    parser.add_argument('--description-words', type=int, default=0)
+    args = parser.parse_args()
+    server, url = start_job_backend(args.port, args.latency, args.jobs_per_tag, args.description_words)
+    print(f"Stub job backend on {url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
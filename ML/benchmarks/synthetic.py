@@ -0,0 +1,109 @@
+"""Seeded generators of normalized jobs and user profiles for the benchmarks.
+
+Jobs have every field normalize_job_data produces; profiles have every field
+prepare_user_profile reads. The same seed always yields the same data.
+"""
+import random
+
+SKILLS = [
+    'python', 'django', 'flask', 'java', 'spring boot', 'react', 'angular', 'node.js', 'sql', 'postgresql',
+    'mongodb', 'docker', 'kubernetes', 'aws', 'azure', 'machine learning', 'pandas', 'tensorflow', 'go',
+    'c++', 'kotlin', 'swift', 'html', 'css', 'javascript', 'typescript', 'redis', 'kafka', 'spark', 'git'
+]
+ROLES = ['Developer', 'Engineer', 'Analyst', 'Intern', 'Architect', 'Consultant']
+LEVELS = ['Junior', 'Senior', 'Lead', 'Principal', 'Entry Level', 'Mid Level', '']
+CATEGORIES = ['Software Development', 'Data', 'DevOps / Sysadmin', 'QA', 'Design', 'Product']
+JOB_TYPES = ['Full-Time', 'Contract', 'Part-Time', 'Internship', 'Freelance']
+LOCATIONS = ['Pune', 'Bangalore', 'Hyderabad', 'Mumbai', 'Remote', 'Worldwide', 'USA Only', 'Europe']
+FILLER = (
+    "we are hiring to build and operate reliable services for our customers you will collaborate with product "
+    "design and data teams own features end to end write tests review code and mentor others experience with "
+    "agile delivery cloud platforms and modern tooling is a plus we offer flexible hours learning budget and "
+    "health insurance 2+ years 3+ years 5+ years fresher graduate trainee expert"
+).split()
+DEGREES = ['Bachelor of Technology', 'Bachelor of Engineering', 'Master of Science', 'Master of Technology', 'PhD']
+COURSES = ['Computer Engineering', 'Information Technology', 'Electronics', 'Data Science']
+
+
+def description(rng, skills, words):
+    """Posting text mixing the job's skills into generic filler"""
+    return ' '.join(rng.choice(skills) if rng.random() < 0.15 else rng.choice(FILLER) for _ in range(words))
+
+
+def job(rng, index, num_tags=3, description_words=120):
+    skills = rng.sample(SKILLS, min(num_tags, len(SKILLS)))
+    level = rng.choice(LEVELS)
+    return {
+        'id': f"job-{index}",
+        'title': f"{level} {skills[0].title()} {rng.choice(ROLES)}".strip(),
+        'company_name': f"Company {rng.randrange(5000)}",
+        'category': rng.choice(CATEGORIES),
+        'tags': [', '.join(skills)],
+        'job_type': rng.choice(JOB_TYPES),
+        'publication_date': f"2026-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}T00:00:00",
+        'candidate_required_location': rng.choice(LOCATIONS),
+        'description': description(rng, skills, description_words),
+        'salary': rng.choice(['', f"${rng.randrange(30, 200)}k"]),
+        'experience_required': rng.choice(['', '0-1 years', '2-4 years', '5+ years']),
+        'application_url': f"https://jobs.example.com/{index}",
+        'remote_allowed': rng.random() < 0.4
+    }
+
+
+def jobs(count, num_tags=3, description_words=120, seed=0):
+    """count normalized jobs"""
+    rng = random.Random(seed)
+    return [job(rng, i, num_tags, description_words) for i in range(count)]
+
+
+def profile(rng, index, num_skills=4, resume_url=''):
+    skills = rng.sample(SKILLS, min(num_skills, len(SKILLS)))
+    return {
+        'users': {
+            'firstName': f"User{index}",
+            'lastName': 'Bench',
+            'email': f"user{index}@example.com",
+            'phone': '9999999999',
+            'resumeUrl': resume_url
+        },
+        'profileSummary': f"Engineer working with {', '.join(skills)} on production systems",
+        'keySkills': ', '.join(skills),
+        'preferedJobType': rng.choice(JOB_TYPES),
+        'preferedLocation': ', '.join(rng.sample(LOCATIONS, 2)),
+        'availabilityToWork': 'Immediate',
+        'language': 'English',
+        'education': {
+            'degrees': [{
+                'degreeName': rng.choice(DEGREES),
+                'courseName': rng.choice(COURSES),
+                'universityName': f"University {rng.randrange(100)}",
+                'courseDurationFrom': '2019',
+                'courseDurationTo': '2023',
+                'cgpa': f"{rng.uniform(6, 10):.2f}"
+            }]
+        },
+        'internships': [
+            {
+                'companyName': f"Company {rng.randrange(5000)}",
+                'durationFrom': '2022-05',
+                'durationTo': '2022-08',
+                'description': description(rng, skills, 30)
+            }
+            for _ in range(rng.randrange(3))
+        ],
+        'projects': [
+            {
+                'projectName': f"{rng.choice(skills).title()} project",
+                'projectDurationFrom': '2023-01',
+                'projectDurationTo': '2023-04',
+                'projectDescription': description(rng, skills, 25)
+            }
+            for _ in range(rng.randrange(1, 4))
+        ]
+    }
+
+
+def profiles(count, num_skills=4, resume_url='', seed=1):
+    """count user profiles in the backend payload shape"""
+    rng = random.Random(seed)
+    return [profile(rng, i, num_skills, resume_url) for i in range(count)]
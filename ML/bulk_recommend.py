@@ -0,0 +1,283 @@
+"""Offline bulk recommendations over a user dump.
+
+Example, from ML/:
+    python bulk_recommend.py --users users.jsonl --jobs jobs.jsonl --out results/ --workers 8
+
+Users are read in shards and scored on a process pool. Each finished shard is
+written atomically to its own part file in the output directory, and those
+part files double as the checkpoint: rerunning the same command skips every
+shard that already has one.
+"""
+import argparse
+import collections
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import time
+from job_record import compact_jobs
+from model import JobRecommendationTransformer
+from normalize import normalize_job_data
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Scoring state built once in the parent. Forked workers inherit it
+# copy-on-write; spawned workers receive it through the pool initializer.
+_STATE = {}
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def count_lines(path):
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.strip())
+
+
+def iter_shards(users, shard_size):
+    """Yield (shard_id, users) pairs of at most shard_size users"""
+    iterator = iter(users)
+    for shard_id in itertools.count():
+        shard = list(itertools.islice(iterator, shard_size))
+        if not shard:
+            return
+        yield shard_id, shard
+
+
+def user_id_of(user_data, fallback):
+    users_info = user_data.get('users', {}) if isinstance(user_data.get('users'), dict) else {}
+    return str(user_data.get('id') or users_info.get('id') or users_info.get('email') or fallback)
+
+
+def build_state(jobs, top_n, corpus_path=None, fetch_resumes=False, rerank_all=False, user_count=0):
+    """Normalize and vectorize the job catalog once for all workers"""
+    transformer = JobRecommendationTransformer()
+    if corpus_path:
+        transformer.enable_corpus(corpus_path)
+    # Compact records keep the shared catalog small in the parent and every worker
+    jobs = compact_jobs(normalize_job_data(jobs))
+    context = transformer.new_scoring_context()
+    job_vectors, job_texts = transformer.create_job_vectors(jobs, context)
+    return {
+        'transformer': transformer,
+        'context': context,
+        'jobs': jobs,
+        'job_vectors': job_vectors,
+        'job_texts': job_texts,
+        # Catalog-wide retrieval goes through the embedding index when it is large enough
+        'job_index': None if rerank_all else transformer.build_job_index(job_vectors, jobs, job_texts, context, user_count),
+        'top_n': top_n,
+        'fetch_resumes': fetch_resumes,
+        'pool_size': len(jobs) if rerank_all else top_n * 2
+    }
+
+
+def _init_worker(state):
+    _STATE.update(state)
+
+
+def recommend_for_user(user_data):
+    """Ranked recommendations for one user against the shared catalog"""
+    transformer = _STATE['transformer']
+    jobs = _STATE['jobs']
+    job_vectors = _STATE['job_vectors']
+    resume_data = None
+    if _STATE['fetch_resumes']:
+        resume_url = user_data.get('users', {}).get('resumeUrl', '') or user_data.get('resumeUrl', '')
+        if resume_url:
+            resume_data = transformer.extract_resume_data(resume_url)
+    profile = transformer.prepare_user_profile(user_data, resume_data)
+    user_vector = transformer.create_user_vector(profile, _STATE['job_texts'], _STATE['context'])
+    if _STATE['job_index'] is not None:
+        return transformer.rerank_from_index(
+            profile, user_vector, jobs, job_vectors, _STATE['job_index'], _STATE['pool_size']
+        )[:_STATE['top_n']]
+    candidates, scores = transformer.calculate_match_scores(user_vector, job_vectors, len(jobs), _STATE['pool_size'])
+    return transformer.rerank_candidates(profile, jobs, scores, candidates)[:_STATE['top_n']]
+
+
+def score_shard(shard):
+    """Worker entry point: score every user of a shard"""
+    shard_id, start, users = shard
+    rows = []
+    for offset, user_data in enumerate(users):
+        user_id = user_id_of(user_data, start + offset) if isinstance(user_data, dict) else str(start + offset)
+        try:
+            recommendations = recommend_for_user(user_data) if isinstance(user_data, dict) else []
+        except Exception as e:
+            logger.error(f"Error recommending jobs for user {user_id}: {e}")
+            recommendations = []
+        rows.append({
+            'user_id': user_id,
+            'recommendations': [
+                {
+                    'rank': rank,
+                    'job_id': rec['job'].get('id'),
+                    'title': rec['job'].get('title'),
+                    'company': rec['job'].get('company_name'),
+                    'match_score': round(rec['score'], 4),
+                    **rec['criteria']
+                }
+                for rank, rec in enumerate(recommendations, start=1)
+            ]
+        })
+    return shard_id, rows
+
+
+def part_path(out_dir, shard_id, fmt):
+    return os.path.join(out_dir, f"part-{shard_id:06d}.{fmt}")
+
+
+def write_part(out_dir, shard_id, rows, fmt):
+    """Write one shard's results atomically so a part file is always complete"""
+    path = part_path(out_dir, shard_id, fmt)
+    tmp_path = f"{path}.tmp"
+    if fmt == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow (pip install pyarrow)")
+        flat = [
+            dict(user_id=row['user_id'], **rec)
+            for row in rows for rec in row['recommendations']
+        ]
+        pq.write_table(pa.Table.from_pylist(flat), tmp_path)
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row) + '\n')
+    os.replace(tmp_path, path)
+
+
+def file_fingerprint(path):
+    """Path, size and modification time, so a rewritten input is noticed on resume"""
+    if not path:
+        return None
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def check_manifest(args):
+    """Refuse to resume into an output directory written from different inputs or scoring options"""
+    path = os.path.join(args.out, '_manifest.json')
+    manifest = {
+        "users": file_fingerprint(args.users),
+        "jobs": file_fingerprint(args.jobs),
+        "corpus": file_fingerprint(args.corpus) if args.corpus and os.path.exists(args.corpus) else args.corpus,
+        "shard_size": args.shard_size,
+        "format": args.format,
+        "top_n": args.top_n,
+        "fetch_resumes": args.fetch_resumes,
+        "rerank_all": args.rerank_all
+    }
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            existing = json.load(f)
+        if existing != manifest:
+            raise SystemExit(f"{args.out} was written with {existing}, refusing to resume with {manifest}")
+        logger.info(f"Resuming into {args.out}")
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+def run(args):
+    os.makedirs(args.out, exist_ok=True)
+    check_manifest(args)
+    user_count = count_lines(args.users)
+    pending = {
+        shard_id for shard_id in range(-(-user_count // args.shard_size))
+        if not os.path.exists(part_path(args.out, shard_id, args.format))
+    }
+    if not pending:
+        # Nothing to score, so skip vectorizing the catalog altogether
+        logger.info(f"Every shard of {user_count} users is already in {args.out}")
+        report = {"users": 0, "shards": 0, "jobs": None, "workers": args.workers, "seconds": 0.0, "users_per_second": 0.0}
+        print(json.dumps(report))
+        return report
+    started = time.perf_counter()
+    state = build_state(
+        list(read_jsonl(args.jobs)),
+        args.top_n,
+        corpus_path=args.corpus,
+        fetch_resumes=args.fetch_resumes,
+        rerank_all=args.rerank_all,
+        user_count=user_count
+    )
+    logger.info(f"Prepared {len(state['jobs'])} jobs in {time.perf_counter() - started:.1f}s")
+
+    def pending_shards():
+        for shard_id, users in iter_shards(read_jsonl(args.users), args.shard_size):
+            if shard_id in pending:
+                yield shard_id, shard_id * args.shard_size, users
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        _STATE.update(state)
+        pool = multiprocessing.get_context('fork').Pool(args.workers)
+    else:
+        pool = multiprocessing.get_context().Pool(args.workers, initializer=_init_worker, initargs=(state,))
+
+    done_users = 0
+    done_shards = 0
+    scoring_started = time.perf_counter()
+
+    def finish(result):
+        nonlocal done_users, done_shards
+        shard_id, rows = result.get()
+        write_part(args.out, shard_id, rows, args.format)
+        done_users += len(rows)
+        done_shards += 1
+        elapsed = time.perf_counter() - scoring_started
+        logger.info(
+            f"Shard {shard_id} done: {done_shards} shards, {done_users} users in {elapsed:.1f}s "
+            f"({done_users / elapsed if elapsed else 0:.1f} users/s)"
+        )
+
+    with pool:
+        # Keep only a few shards in flight so the user dump is never fully in memory
+        in_flight = collections.deque()
+        for task in pending_shards():
+            in_flight.append(pool.apply_async(score_shard, (task,)))
+            while len(in_flight) >= args.workers * 2:
+                finish(in_flight.popleft())
+        while in_flight:
+            finish(in_flight.popleft())
+
+    elapsed = time.perf_counter() - scoring_started
+    report = {
+        "users": done_users,
+        "shards": done_shards,
+        "jobs": len(state['jobs']),
+        "workers": args.workers,
+        "seconds": round(elapsed, 3),
+        "users_per_second": round(done_users / elapsed, 2) if elapsed else 0.0
+    }
+    print(json.dumps(report))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute job recommendations for a dump of users")
+    parser.add_argument('--users', required=True, help="JSONL file with one user profile per line")
+    parser.add_argument('--jobs', required=True, help="JSONL file with one job per line (raw or normalized)")
+    parser.add_argument('--out', required=True, help="Output directory for part files")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default='jsonl')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--shard-size', type=int, default=1000)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--corpus', help="Pre-fitted TF-IDF corpus to score against")
+    parser.add_argument('--fetch-resumes', action='store_true', help="Download and parse each user's resume")
+    parser.add_argument('--rerank-all', action='store_true', help="Re-rank every job instead of the top 2*top_n")
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
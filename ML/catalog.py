@@ -0,0 +1,450 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CATALOG_MAX_TRACKED_TAGS = int(os.environ.get('CATALOG_MAX_TRACKED_TAGS', '500'))
+CATALOG_DELTA_PAGE_SIZE = int(os.environ.get('CATALOG_DELTA_PAGE_SIZE', '500'))
+CATALOG_DELTA_MAX_PAGES = int(os.environ.get('CATALOG_DELTA_MAX_PAGES', '1000'))
+
+_SQLITE_MAX_VARIABLES = 900
+
+
+def _split_terms(value):
+    """Lowercased comma-separated terms of a field"""
+    if not value:
+        return []
+    return [part.strip().lower() for part in str(value).split(',') if part.strip()]
+
+
+def normalize_timestamp(value):
+    """ISO 8601 UTC form of a backend timestamp, so watermarks compare in time order
+
+    Accepts ISO strings with or without an offset (naive ones are taken as UTC),
+    epoch seconds or milliseconds, and RFC 2822 dates. Unparseable values give ''.
+    """
+    if value is None or value == '' or isinstance(value, bool):
+        return ''
+    try:
+        if isinstance(value, (int, float)) or str(value).strip().replace('.', '', 1).isdigit():
+            seconds = float(value)
+            # Millisecond epochs are 13 digits long for any recent date
+            if seconds > 1e11:
+                seconds /= 1000
+            moment = datetime.fromtimestamp(seconds, timezone.utc)
+        else:
+            text = str(value).strip()
+            try:
+                moment = datetime.fromisoformat(text)
+            except ValueError:
+                moment = parsedate_to_datetime(text)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(timezone.utc).isoformat(timespec='microseconds')
+    except (TypeError, ValueError, OverflowError, OSError):
+        logger.warning(f"Ignoring unparseable change timestamp: {value!r}")
+        return ''
+
+
+def change_timestamp(raw_job):
+    """When a raw backend job last changed, normalized to ISO 8601 UTC"""
+    for field in ('updated_at', 'publication_date', 'posted_date'):
+        value = raw_job.get(field)
+        if value:
+            return normalize_timestamp(value)
+    return ''
+
+
+def is_tombstone(raw_job):
+    return bool(raw_job.get('deleted') or raw_job.get('is_deleted'))
+
+
+def job_index_terms(job):
+    """Terms a normalized job is found under, grouped by index"""
+    tag_terms = set()
+    tags = job.get('tags', [])
+    for tag in tags if isinstance(tags, list) else [tags]:
+        tag_terms.update(_split_terms(tag))
+    title = str(job.get('title', '') or '').strip().lower()
+    if title:
+        tag_terms.add(title)
+        tag_terms.update(word for word in title.split() if len(word) > 1)
+    category = str(job.get('category', '') or '').strip().lower()
+    if category:
+        tag_terms.add(category)
+    location = str(job.get('candidate_required_location', '') or '')
+    job_type = str(job.get('job_type', '') or '').strip().lower()
+    return {
+        'tag': tag_terms,
+        'location': set(_split_terms(location)) | ({location.strip().lower()} if location.strip() else set()),
+        'job_type': {job_type} if job_type else set()
+    }
+
+
+class JobCatalog:
+    """Local SQLite store of normalized jobs with in-memory inverted indexes"""
+
+    def __init__(self, path):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        # Ids deleted upstream, so an older copy from a tag sync is not resurrected
+        self._conn.execute('CREATE TABLE IF NOT EXISTS tombstones (id TEXT PRIMARY KEY, deleted_at REAL NOT NULL)')
+        self._conn.commit()
+        self._lock = threading.RLock()
+        self._indexes = {name: defaultdict(set) for name in ('tag', 'location', 'job_type')}
+        self._job_terms = {}
+        self._tracked_tags = {}
+        self._listeners = []
+        self._stop_event = threading.Event()
+        self._sync_thread = None
+        self.version = int(self._get_meta('version', '0'))
+        self.last_synced_at = self._get_meta('last_synced_at')
+        self.watermark = normalize_timestamp(self._get_meta('watermark', ''))
+        self._load_indexes()
+
+    def _get_meta(self, key, default=None):
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    def _load_indexes(self):
+        """Rebuild the in-memory indexes from the stored jobs"""
+        count = 0
+        with self._lock:
+            for job_id, data in self._conn.execute('SELECT id, data FROM jobs'):
+                self._index_job(job_id, json.loads(data))
+                count += 1
+        if count:
+            logger.info(f"Loaded {count} jobs into catalog index from {self.path}")
+
+    def _index_job(self, job_id, job):
+        terms = job_index_terms(job)
+        self._job_terms[job_id] = terms
+        for name, values in terms.items():
+            index = self._indexes[name]
+            for value in values:
+                index[value].add(job_id)
+
+    def _unindex_job(self, job_id):
+        terms = self._job_terms.pop(job_id, None)
+        if not terms:
+            return
+        for name, values in terms.items():
+            index = self._indexes[name]
+            for value in values:
+                ids = index.get(value)
+                if ids is not None:
+                    ids.discard(job_id)
+                    if not ids:
+                        del index[value]
+
+    def add_listener(self, listener):
+        """Call listener(changed_jobs, deleted_ids) after every write that changed jobs"""
+        self._listeners.append(listener)
+
+    def _notify(self, changed_jobs, deleted_ids):
+        for listener in self._listeners:
+            try:
+                listener(changed_jobs, deleted_ids)
+            except Exception as e:
+                logger.error(f"Error in job catalog listener: {e}")
+
+    def upsert(self, jobs, revive=False, warm=False):
+        """Insert or update normalized jobs, returning how many changed
+
+        Tombstoned ids are skipped unless revive is set, as it is for delta
+        syncs where the backend is authoritative about newer changes.
+        warm marks request-path writes of jobs a response was just computed
+        from: inserting those leaves the version alone, so cached and
+        precomputed results stay valid, and only changed content bumps it.
+        """
+        changed_jobs = []
+        content_changed = False
+        now = time.time()
+        with self._lock:
+            for job in jobs:
+                if not isinstance(job, dict) or not job.get('id'):
+                    continue
+                job_id = str(job['id'])
+                if self._conn.execute('SELECT 1 FROM tombstones WHERE id = ?', (job_id,)).fetchone():
+                    if not revive:
+                        continue
+                    self._conn.execute('DELETE FROM tombstones WHERE id = ?', (job_id,))
+                data = json.dumps(job, sort_keys=True, default=str)
+                content_hash = hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+                row = self._conn.execute('SELECT content_hash FROM jobs WHERE id = ?', (job_id,)).fetchone()
+                if row and row[0] == content_hash:
+                    continue
+                content_changed = content_changed or row is not None or not warm
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO jobs (id, data, content_hash, synced_at) VALUES (?, ?, ?, ?)',
+                    (job_id, data, content_hash, now)
+                )
+                self._unindex_job(job_id)
+                self._index_job(job_id, job)
+                changed_jobs.append(job)
+            if content_changed:
+                self.version += 1
+                self._set_meta('version', self.version)
+            self._conn.commit()
+        if changed_jobs:
+            self._notify(changed_jobs, [])
+        return len(changed_jobs)
+
+    def delete(self, job_ids):
+        """Remove jobs and record tombstones for them, returning how many were present"""
+        deleted = []
+        now = time.time()
+        with self._lock:
+            for job_id in job_ids:
+                job_id = str(job_id)
+                cursor = self._conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO tombstones (id, deleted_at) VALUES (?, ?)', (job_id, now)
+                )
+                if cursor.rowcount:
+                    self._unindex_job(job_id)
+                    deleted.append(job_id)
+            if deleted:
+                self.version += 1
+                self._set_meta('version', self.version)
+            self._conn.commit()
+        if deleted:
+            self._notify([], deleted)
+        return len(deleted)
+
+    def find_job_ids(self, tags, limit_per_tag=None, location=None, job_type=None):
+        """Resolve skill tags to candidate job ids from the tag index
+
+        Location and job type terms are not candidates on their own. Within
+        each tag, jobs in the preferred location and of the preferred job type
+        come first, so they are the ones kept under limit_per_tag.
+        """
+        preferred = job_index_terms({'candidate_required_location': location or '', 'job_type': job_type or ''})
+        seen = set()
+        job_ids = []
+        index = self._indexes['tag']
+        with self._lock:
+            preferred_ids = [
+                set().union(*(self._indexes[name].get(term, ()) for term in preferred[name]))
+                for name in ('location', 'job_type') if preferred[name]
+            ]
+
+            def preference(job_id):
+                return (-sum(job_id in ids for ids in preferred_ids), job_id)
+
+            for tag in tags:
+                term = str(tag).strip().lower()
+                if not term:
+                    continue
+                matches = sorted(index.get(term, set()) - seen, key=preference)
+                if limit_per_tag:
+                    matches = matches[:limit_per_tag]
+                seen.update(matches)
+                job_ids.extend(matches)
+        return job_ids
+
+    def get_jobs(self, job_ids):
+        """Load normalized jobs by id, preserving the order of job_ids"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(job_ids), _SQLITE_MAX_VARIABLES):
+                chunk = job_ids[start:start + _SQLITE_MAX_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                for job_id, data in self._conn.execute(
+                        f'SELECT id, data FROM jobs WHERE id IN ({placeholders})', chunk):
+                    found[job_id] = json.loads(data)
+        return [found[job_id] for job_id in job_ids if job_id in found]
+
+    def find_jobs(self, tags, limit_per_tag=None, location=None, job_type=None):
+        """Candidate jobs for a set of skill tags, resolved locally"""
+        return self.get_jobs(self.find_job_ids(tags, limit_per_tag, location, job_type))
+
+    def uncovered_tags(self, tags):
+        """Skill tags the catalog has no jobs for"""
+        index = self._indexes['tag']
+        with self._lock:
+            return [tag for tag in tags if str(tag).strip() and str(tag).strip().lower() not in index]
+
+    def track_tags(self, tags):
+        """Remember tags seen in requests so the sync worker keeps them fresh"""
+        with self._lock:
+            for tag in tags:
+                self._tracked_tags[str(tag).strip().lower()] = time.time()
+            if len(self._tracked_tags) > CATALOG_MAX_TRACKED_TAGS:
+                # Drop the least recently requested tags
+                for tag, _ in sorted(self._tracked_tags.items(), key=lambda item: item[1])[:len(self._tracked_tags) - CATALOG_MAX_TRACKED_TAGS]:
+                    del self._tracked_tags[tag]
+
+    def sync(self, fetch_jobs, normalize, tags=None):
+        """Pull jobs for the tracked tags from the backend and upsert them"""
+        with self._lock:
+            tags = list(tags if tags is not None else self._tracked_tags)
+        if not tags:
+            return 0
+        started = time.perf_counter()
+        jobs = normalize(fetch_jobs(tags))
+        changed = self.upsert(jobs)
+        with self._lock:
+            self.last_synced_at = datetime.now().isoformat()
+            self._set_meta('last_synced_at', self.last_synced_at)
+            self._conn.commit()
+        logger.info(f"Catalog sync of {len(tags)} tags: {len(jobs)} jobs, {changed} changed in {time.perf_counter() - started:.2f}s")
+        return changed
+
+    def delta_sync(self, fetch_changes, normalize, page_size=CATALOG_DELTA_PAGE_SIZE):
+        """Pull jobs changed since the stored watermark, one page at a time
+
+        fetch_changes(since, cursor, limit) returns a backend page:
+        {"jobs": [...], "deleted": [ids], "next_cursor": ..., "watermark": ...}.
+        Jobs flagged deleted/is_deleted are tombstoned like listed ids. Each
+        page is applied before the next is fetched, so memory stays bounded
+        by the page size. The cursor is saved after every applied page, so a
+        pass cut short by CATALOG_DELTA_MAX_PAGES or an error resumes where it
+        stopped; the watermark advances once the last page is applied.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            cursor = self._get_meta('delta_cursor')
+            if cursor:
+                # Resume the unfinished pass from its saved position
+                since = self._get_meta('delta_since', '')
+                watermark = normalize_timestamp(self._get_meta('delta_watermark', ''))
+            else:
+                since = watermark = self.watermark
+        upserted = deleted = pages = 0
+        while pages < CATALOG_DELTA_MAX_PAGES:
+            payload = fetch_changes(since, cursor, page_size) or {}
+            pages += 1
+            raw_jobs = [job for job in payload.get('jobs', []) if isinstance(job, dict)]
+            # Listed ids carry no timestamp and are applied before the page's jobs
+            deleted_ids = [str(job_id) for job_id in payload.get('deleted', [])]
+            has_changes = bool(raw_jobs or deleted_ids)
+            live_jobs = []
+            # Consecutive runs of upserts and deletes are applied in log order,
+            # so a delete followed by a recreate of the same id keeps the job
+            for job in raw_jobs:
+                watermark = max(watermark, change_timestamp(job))
+                if is_tombstone(job):
+                    if live_jobs:
+                        upserted += self.upsert(normalize(live_jobs), revive=True)
+                        live_jobs = []
+                    job_id = job.get('id') or job.get('job_id') or job.get('_id')
+                    if not job_id:
+                        # Id-less jobs are stored under their content id
+                        normalized = normalize([job])
+                        job_id = normalized[0]['id'] if normalized else None
+                    if job_id:
+                        deleted_ids.append(str(job_id))
+                    else:
+                        logger.warning("Skipping tombstone without an id or content")
+                else:
+                    if deleted_ids:
+                        deleted += self.delete(deleted_ids)
+                        deleted_ids = []
+                    live_jobs.append(job)
+            if live_jobs:
+                upserted += self.upsert(normalize(live_jobs), revive=True)
+            if deleted_ids:
+                deleted += self.delete(deleted_ids)
+            watermark = max(watermark, normalize_timestamp(payload.get('watermark')))
+            cursor = payload.get('next_cursor')
+            if not cursor or not has_changes:
+                break
+            with self._lock:
+                self._set_meta('delta_cursor', cursor)
+                self._set_meta('delta_since', since)
+                self._set_meta('delta_watermark', watermark)
+                self._conn.commit()
+        else:
+            logger.warning(f"Delta sync stopped after {pages} pages, resuming from cursor {cursor} next time")
+            return upserted, deleted
+        with self._lock:
+            self.watermark = watermark
+            self.last_synced_at = datetime.now().isoformat()
+            self._set_meta('watermark', watermark)
+            self._set_meta('last_synced_at', self.last_synced_at)
+            self._conn.execute("DELETE FROM meta WHERE key IN ('delta_cursor', 'delta_since', 'delta_watermark')")
+            self._conn.commit()
+        logger.info(
+            f"Catalog delta sync since {since or 'the beginning'}: {pages} pages, {upserted} upserted, "
+            f"{deleted} deleted in {time.perf_counter() - started:.2f}s"
+        )
+        return upserted, deleted
+
+    def start_delta_sync(self, fetch_changes, normalize, interval):
+        """Run delta_sync immediately and then periodically from a daemon thread"""
+        if interval <= 0 or self._sync_thread is not None:
+            return
+
+        def run():
+            while True:
+                try:
+                    self.delta_sync(fetch_changes, normalize)
+                except Exception as e:
+                    logger.error(f"Error in job catalog delta sync: {e}")
+                if self._stop_event.wait(interval):
+                    return
+
+        self._sync_thread = threading.Thread(target=run, name='job-catalog-delta-sync', daemon=True)
+        self._sync_thread.start()
+        logger.info(f"Started background job catalog delta sync every {interval}s")
+
+    def start_sync(self, fetch_jobs, normalize, interval, seed_tags=None):
+        """Run sync periodically from a daemon thread"""
+        if seed_tags:
+            self.track_tags(seed_tags)
+        if interval <= 0 or self._sync_thread is not None:
+            return
+
+        def run():
+            while not self._stop_event.wait(interval):
+                try:
+                    self.sync(fetch_jobs, normalize)
+                except Exception as e:
+                    logger.error(f"Error syncing job catalog: {e}")
+
+        self._sync_thread = threading.Thread(target=run, name='job-catalog-sync', daemon=True)
+        self._sync_thread.start()
+        logger.info(f"Started background job catalog sync every {interval}s")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def __len__(self):
+        return len(self._job_terms)
+
+    def stats(self):
+        return {
+            "enabled": True,
+            "jobs": len(self._job_terms),
+            "version": self.version,
+            "last_synced_at": self.last_synced_at,
+            "watermark": self.watermark,
+            "tracked_tags": len(self._tracked_tags),
+            "index_terms": {name: len(index) for name, index in self._indexes.items()}
+        }
@@ -0,0 +1,209 @@
+from collections import OrderedDict
+from datetime import datetime
+import argparse
+import json
+import logging
+import os
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CORPUS_MAX_DOCUMENTS = int(os.environ.get('TFIDF_CORPUS_MAX_DOCUMENTS', '50000'))
+CORPUS_MIN_DOCUMENTS = int(os.environ.get('TFIDF_CORPUS_MIN_DOCUMENTS', '50'))
+CORPUS_REFIT_MIN_CHANGES = int(os.environ.get('TFIDF_CORPUS_REFIT_MIN_CHANGES', '100'))
+
+
+class TfidfCorpus:
+    """TF-IDF vectorizer fitted once over the job catalog and reused across requests"""
+
+    def __init__(self, template, path=None, max_documents=CORPUS_MAX_DOCUMENTS):
+        self.template = template
+        self.path = path
+        self.max_documents = max_documents
+        self.vectorizer = None
+        self.version = 0
+        self.fitted_at = None
+        self._documents = OrderedDict()
+        self._changes = 0
+        self._lock = threading.Lock()
+        self._refit_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refit_thread = None
+
+    @property
+    def is_fitted(self):
+        return self.vectorizer is not None
+
+    def fit(self, texts):
+        """Fit a fresh vectorizer over the given texts and swap it in"""
+        texts = [t for t in texts if t and t.strip()]
+        if not texts:
+            logger.warning("Cannot fit TF-IDF corpus on empty texts")
+            return False
+        from sklearn.base import clone
+        vectorizer = clone(self.template)
+        vectorizer.fit(texts)
+        # The fitted vectorizer is never mutated after this point, so readers
+        # holding the old reference keep a consistent vocabulary
+        with self._lock:
+            self.vectorizer = vectorizer
+            self.version += 1
+            self.fitted_at = datetime.now().isoformat()
+        logger.info(f"Fitted TF-IDF corpus v{self.version} on {len(texts)} documents, vocabulary size {len(vectorizer.vocabulary_)}")
+        return True
+
+    def snapshot(self):
+        """Return the current fitted vectorizer together with its version"""
+        with self._lock:
+            return self.vectorizer, self.version
+
+    def transform(self, texts):
+        """Vectorize texts against the fitted corpus vocabulary"""
+        vectorizer = self.vectorizer
+        if vectorizer is None:
+            raise RuntimeError("TF-IDF corpus is not fitted")
+        return vectorizer.transform(texts)
+
+    def add_documents(self, doc_ids, texts):
+        """Record catalog documents so a later refit covers them"""
+        with self._lock:
+            for doc_id, text in zip(doc_ids, texts):
+                if not text:
+                    continue
+                if self._documents.get(doc_id) != text:
+                    self._changes += 1
+                self._documents[doc_id] = text
+                self._documents.move_to_end(doc_id)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def remove_documents(self, doc_ids):
+        """Forget catalog documents deleted upstream"""
+        with self._lock:
+            for doc_id in doc_ids:
+                if self._documents.pop(doc_id, None) is not None:
+                    self._changes += 1
+
+    def refit_if_changed(self, min_changes=CORPUS_REFIT_MIN_CHANGES):
+        """Refit over the recorded catalog when enough documents changed"""
+        with self._refit_lock:
+            with self._lock:
+                changes = self._changes
+                texts = list(self._documents.values())
+            if len(texts) < CORPUS_MIN_DOCUMENTS:
+                return False
+            if self.is_fitted and changes < min_changes:
+                return False
+            if not self.fit(texts):
+                return False
+            with self._lock:
+                self._changes = max(self._changes - changes, 0)
+            if self.path:
+                self.save()
+            return True
+
+    def save(self, path=None):
+        """Persist the fitted vectorizer and recorded documents to disk"""
+        path = path or self.path
+        if not path or not self.is_fitted:
+            return False
+        try:
+            with self._lock:
+                state = {
+                    'vectorizer': self.vectorizer,
+                    'version': self.version,
+                    'fitted_at': self.fitted_at,
+                    'documents': dict(self._documents)
+                }
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            import joblib
+            joblib.dump(state, tmp_path)
+            os.replace(tmp_path, path)
+            logger.info(f"Saved TF-IDF corpus v{self.version} to {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving TF-IDF corpus: {e}")
+            return False
+
+    def load(self, path=None):
+        """Load a previously saved corpus from disk"""
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            import joblib
+            state = joblib.load(path)
+            with self._lock:
+                self.vectorizer = state['vectorizer']
+                self.version = state.get('version', 1)
+                self.fitted_at = state.get('fitted_at')
+                self._documents = OrderedDict(state.get('documents', {}))
+                self._changes = 0
+            logger.info(f"Loaded TF-IDF corpus v{self.version} from {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error loading TF-IDF corpus from {path}: {e}")
+            return False
+
+    def start_background_refit(self, interval):
+        """Periodically refit the corpus from a daemon thread"""
+        if interval <= 0 or self._refit_thread is not None:
+            return
+
+        def run():
+            while not self._stop_event.wait(interval):
+                try:
+                    self.refit_if_changed()
+                except Exception as e:
+                    logger.error(f"Error refitting TF-IDF corpus: {e}")
+
+        self._refit_thread = threading.Thread(target=run, name='tfidf-corpus-refit', daemon=True)
+        self._refit_thread.start()
+        logger.info(f"Started background TF-IDF corpus refit every {interval}s")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def stats(self):
+        return {
+            "enabled": True,
+            "fitted": self.is_fitted,
+            "version": self.version,
+            "fitted_at": self.fitted_at,
+            "vocabulary_size": len(self.vectorizer.vocabulary_) if self.is_fitted else 0,
+            "documents": len(self._documents),
+            "pending_changes": self._changes
+        }
+
+
+def main():
+    """Fit a corpus offline from a JSONL file of normalized jobs"""
+    parser = argparse.ArgumentParser(description="Fit the TF-IDF job corpus offline")
+    parser.add_argument('--jobs', required=True, help="JSONL file with one normalized job per line")
+    parser.add_argument('--out', required=True, help="Where to write the fitted corpus")
+    args = parser.parse_args()
+
+    from model import JobRecommendationTransformer
+    transformer = JobRecommendationTransformer()
+    corpus = TfidfCorpus(transformer.vectorizer, path=args.out)
+
+    doc_ids, texts = [], []
+    with open(args.jobs, encoding='utf-8') as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            doc_ids.append(str(job.get('id', i)))
+            texts.append(transformer.preprocess_text(transformer.build_job_text(job)))
+
+    corpus.add_documents(doc_ids, texts)
+    if not corpus.fit(texts) or not corpus.save():
+        raise SystemExit("Failed to build TF-IDF corpus")
+
+
+if __name__ == '__main__':
+    main()
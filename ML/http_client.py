@@ -0,0 +1,179 @@
+import logging
+import os
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool configuration, shared by every outbound call in the process
+HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', '10'))
+HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '16'))
+# Off by default, as in urllib3: past pool_maxsize a burst opens extra
+# connections that are closed after use. Blocking caps connections per host
+# instead, but requests gives no pool timeout, so callers then wait for a free
+# connection with no upper bound.
+HTTP_POOL_BLOCK = os.environ.get('HTTP_POOL_BLOCK', 'False').lower() == 'true'
+HTTP_MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', '2'))
+HTTP_RETRY_BACKOFF = float(os.environ.get('HTTP_RETRY_BACKOFF', '0.3'))
+# Retried responses and methods, for the requests session and the async client alike
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+RETRY_METHODS = frozenset(['GET', 'HEAD'])
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # requests is imported on first use; expose its base exception lazily
+    if name == 'RequestException':
+        import requests
+        return requests.RequestException
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _build_session():
+    """Create a requests session with pooled, keep-alive connections"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False
+    )
+    # pool_maxsize bounds the connections kept per host; with pool_block the
+    # pool waits, without a timeout, for a free connection instead of opening extra ones
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=HTTP_POOL_BLOCK,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide HTTP session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+                logger.info(f"Created shared HTTP session (pool_maxsize={HTTP_POOL_MAXSIZE}, retries={HTTP_MAX_RETRIES})")
+    return _session
+
+
+def get(url, **kwargs):
+    """Issue a GET request through the shared session"""
+    return get_session().get(url, **kwargs)
+
+
+def retry_delay(attempt, retry_after=None):
+    """Seconds to wait before the given retry (1-based), backing off as urllib3's Retry does"""
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+    return 0.0 if attempt <= 1 else HTTP_RETRY_BACKOFF * 2 ** (attempt - 1)
+
+
+_async_transport_class = None
+
+
+def _async_retry_transport():
+    """httpx transport class applying the session's retry policy; httpx is imported on first use"""
+    global _async_transport_class
+    if _async_transport_class is not None:
+        return _async_transport_class
+    import asyncio
+    import httpx
+
+    class AsyncRetryTransport(httpx.AsyncHTTPTransport):
+        async def handle_async_request(self, request):
+            retryable_method = request.method in RETRY_METHODS
+            attempt = 0
+            while True:
+                try:
+                    response = await super().handle_async_request(request)
+                except (httpx.ConnectError, httpx.ConnectTimeout):
+                    # Nothing was sent, so any method may retry
+                    if attempt >= HTTP_MAX_RETRIES:
+                        raise
+                    retry_after = None
+                except (httpx.ReadError, httpx.ReadTimeout, httpx.RemoteProtocolError):
+                    if not retryable_method or attempt >= HTTP_MAX_RETRIES:
+                        raise
+                    retry_after = None
+                else:
+                    # Like raise_on_status=False, the last retried response is returned as is
+                    if not retryable_method or response.status_code not in RETRY_STATUSES or attempt >= HTTP_MAX_RETRIES:
+                        return response
+                    retry_after = response.headers.get('Retry-After') if response.status_code in (413, 429, 503) else None
+                    await response.aclose()
+                attempt += 1
+                await asyncio.sleep(retry_delay(attempt, retry_after))
+
+    _async_transport_class = AsyncRetryTransport
+    return _async_transport_class
+
+
+def build_async_client(max_connections, max_keepalive_connections):
+    """Create an httpx.AsyncClient that retries like the shared requests session"""
+    import httpx
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    return httpx.AsyncClient(transport=_async_retry_transport()(limits=limits), follow_redirects=True)
+
+
+def get_pool_stats():
+    """Report per-host connection reuse for the shared session"""
+    stats = {
+        "pool_maxsize": HTTP_POOL_MAXSIZE,
+        "pool_block": HTTP_POOL_BLOCK,
+        "max_retries": HTTP_MAX_RETRIES,
+        "hosts": {},
+        "requests": 0,
+        "connections_opened": 0,
+        "pool_hits": 0,
+        "pool_misses": 0
+    }
+    if _session is None:
+        return stats
+
+    try:
+        seen = set()
+        for adapter in _session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                # Every request on a pool either reused a kept-alive
+                # connection (hit) or had to open a new one (miss)
+                num_requests = getattr(pool, 'num_requests', 0)
+                num_connections = getattr(pool, 'num_connections', 0)
+                host = f"{key.key_scheme}://{key.key_host}:{key.key_port}"
+                stats["hosts"][host] = {
+                    "requests": num_requests,
+                    "connections_opened": num_connections,
+                    "pool_hits": max(num_requests - num_connections, 0),
+                    "pool_misses": num_connections
+                }
+                stats["requests"] += num_requests
+                stats["connections_opened"] += num_connections
+        stats["pool_hits"] = max(stats["requests"] - stats["connections_opened"], 0)
+        stats["pool_misses"] = stats["connections_opened"]
+    except Exception as e:
+        logger.warning(f"Could not collect HTTP pool stats: {e}")
+    return stats
@@ -0,0 +1,89 @@
+from collections.abc import Mapping
+import os
+import sys
+import zlib
+
+# Descriptions at least this long are kept zlib-compressed in memory
+JOB_DESCRIPTION_COMPRESS_MIN = int(os.environ.get('JOB_DESCRIPTION_COMPRESS_MIN', '256'))
+
+JOB_FIELDS = (
+    'id', 'title', 'company_name', 'category', 'tags', 'job_type', 'publication_date',
+    'candidate_required_location', 'description', 'salary', 'experience_required',
+    'application_url', 'remote_allowed'
+)
+
+# Low-cardinality fields shared by many jobs of a catalog
+_INTERNED_FIELDS = ('company_name', 'category', 'job_type', 'candidate_required_location')
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class JobRecord(Mapping):
+    """Normalized job with slots, interned strings and a compressed description
+
+    Behaves like the normalized job dict for readers (job.get, job[...],
+    dict(job)), so scoring and response formatting work on either. Used for
+    catalogs held in memory across many users, i.e. the shared catalog of
+    bulk_recommend; the servers load jobs per request as plain dicts.
+
+    The description is decompressed whenever it is read: to vectorize a job
+    missing from the job cache, and for each re-ranked candidate.
+    """
+    __slots__ = tuple(field for field in JOB_FIELDS if field not in ('tags', 'description')) + (
+        '_tags', '_description', 'cache_key'
+    )
+
+    def __init__(self, job):
+        for field in JOB_FIELDS:
+            if field == 'tags':
+                tags = job.get('tags', [])
+                self._tags = tuple(tags) if isinstance(tags, (list, tuple)) else tags
+            elif field == 'description':
+                description = job.get('description', '')
+                if type(description) is str and len(description) >= JOB_DESCRIPTION_COMPRESS_MIN:
+                    description = zlib.compress(description.encode('utf-8'))
+                self._description = description
+            elif field in _INTERNED_FIELDS:
+                setattr(self, field, _intern(job.get(field)))
+            else:
+                setattr(self, field, job.get(field))
+        # Job cache key, filled in by the transformer on first vectorization
+        self.cache_key = None
+
+    @property
+    def tags(self):
+        return list(self._tags) if isinstance(self._tags, tuple) else self._tags
+
+    @property
+    def description(self):
+        """Full description, decompressed on every access"""
+        if type(self._description) is bytes:
+            return zlib.decompress(self._description).decode('utf-8')
+        return self._description
+
+    def __getitem__(self, key):
+        if key not in JOB_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(JOB_FIELDS)
+
+    def __len__(self):
+        return len(JOB_FIELDS)
+
+    def __contains__(self, key):
+        return key in JOB_FIELDS
+
+    def __repr__(self):
+        return f"JobRecord(id={self.id!r}, title={self.title!r})"
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in JOB_FIELDS}
+
+
+def compact_jobs(jobs):
+    """Normalized job dicts as JobRecords, for catalogs held in memory such as bulk_recommend's"""
+    return [job if isinstance(job, JobRecord) else JobRecord(job) for job in jobs if isinstance(job, Mapping)]
@@ -0,0 +1,143 @@
+"""Memoized token to lemma lookup shared by every preprocess_text call.
+
+Job text reuses a small vocabulary, so each distinct token is lemmatized
+once per process. A pre-built table can be persisted and loaded at startup,
+which also covers lemmatization when WordNet is not available:
+
+    python lemmas.py --jobs jobs.jsonl --out data/lemmas.json
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LEMMA_CACHE_SIZE = int(os.environ.get('LEMMA_CACHE_SIZE', '200000'))
+LEMMA_DICT_PATH = os.environ.get('LEMMA_DICT_PATH')
+
+# Same tokens as replacing non-word characters with spaces and splitting
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class LemmaTable:
+    """Bounded token -> lemma memo; filtered tokens map to an empty string"""
+
+    def __init__(self, lemmatizer=None, stop_words=None, maxsize=LEMMA_CACHE_SIZE, path=LEMMA_DICT_PATH):
+        # Lemmatize only when both are available, as preprocess_text always has
+        self.lemmatizer = lemmatizer if lemmatizer and stop_words else None
+        self.stop_words = stop_words or set()
+        self.maxsize = maxsize
+        self.path = path
+        self._memo = {}
+        self._lock = threading.Lock()
+        self.misses = 0
+        if path:
+            self.load(path)
+
+    def _resolve(self, token):
+        if len(token) <= 2:
+            return ''
+        if self.lemmatizer is None:
+            return token
+        if token in self.stop_words:
+            return ''
+        return self.lemmatizer.lemmatize(token)
+
+    def lemma(self, token):
+        """Lemma of a lowercased token, or '' if the token is dropped"""
+        lemma = self._memo.get(token)
+        if lemma is None:
+            lemma = self._miss(token)
+        return lemma
+
+    def _miss(self, token):
+        lemma = self._resolve(token)
+        with self._lock:
+            self.misses += 1
+            if len(self._memo) >= self.maxsize:
+                # Evict the oldest entry; dicts keep insertion order
+                self._memo.pop(next(iter(self._memo)), None)
+            self._memo[token] = lemma
+        return lemma
+
+    def process(self, text):
+        """Lowercase, tokenize, drop stop words and short tokens, lemmatize"""
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        # Memo hits are resolved in C; only unseen tokens go through Python
+        lemmas = list(map(self._memo.get, tokens))
+        if None in lemmas:
+            for i, lemma in enumerate(lemmas):
+                if lemma is None:
+                    lemmas[i] = self.lemma(tokens[i])
+        return " ".join(filter(None, lemmas))
+
+    def load(self, path):
+        """Merge a persisted table into the memo"""
+        if not os.path.exists(path):
+            logger.warning(f"Lemma table {path} not found")
+            return 0
+        try:
+            with open(path, encoding='utf-8') as f:
+                table = json.load(f)
+            with self._lock:
+                for token, lemma in table.items():
+                    if len(self._memo) >= self.maxsize:
+                        break
+                    self._memo[token] = lemma
+            logger.info(f"Loaded {len(table)} lemmas from {path}")
+            return len(table)
+        except Exception as e:
+            logger.error(f"Error loading lemma table {path}: {e}")
+            return 0
+
+    def save(self, path=None):
+        """Persist the memo atomically as JSON"""
+        path = path or self.path
+        if not path:
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            table = dict(self._memo)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(table, f, sort_keys=True)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {len(table)} lemmas to {path}")
+        return True
+
+    def __len__(self):
+        return len(self._memo)
+
+    def stats(self):
+        return {
+            "size": len(self._memo),
+            "maxsize": self.maxsize,
+            "misses": self.misses,
+            "lemmatizer": self.lemmatizer is not None
+        }
+
+
+def main():
+    from model import JobRecommendationTransformer
+    from normalize import normalize_job_data
+
+    parser = argparse.ArgumentParser(description="Build a lemma table from a job dump")
+    parser.add_argument('--jobs', required=True, help="JSONL file with one job per line (raw or normalized)")
+    parser.add_argument('--out', required=True, help="Where to write the lemma table")
+    args = parser.parse_args()
+
+    transformer = JobRecommendationTransformer()
+    with open(args.jobs, encoding='utf-8') as f:
+        jobs = normalize_job_data(json.loads(line) for line in f if line.strip())
+    for job in jobs:
+        transformer.preprocess_text(transformer.build_job_text(job))
+    transformer.lemma_table.save(args.out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+import bisect
+import contextvars
+import threading
+import time
+
+# Upper bounds in seconds; covers cache hits through the 30 s request budget
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Stage durations of the request being served, when it asked for debug_timings
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram rendered in the Prometheus text format"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), sum, count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in series:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines)
+
+
+STAGE_SECONDS = Histogram(
+    'recommend_stage_seconds',
+    'Time spent in each stage of serving recommendations.',
+    ('stage',)
+)
+REQUEST_SECONDS = Histogram(
+    'recommend_request_seconds',
+    'End-to-end latency of recommendation endpoints.',
+    ('endpoint', 'status')
+)
+REGISTRY = [STAGE_SECONDS, REQUEST_SECONDS]
+
+
+@contextmanager
+def timed(stage):
+    """Record the duration of a block under the given stage name"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+@contextmanager
+def collect_timings(enabled=True):
+    """Collect the stage durations of the current request into a dict"""
+    if not enabled:
+        yield None
+        return
+    timings = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def format_timings(timings):
+    """Stage durations in milliseconds for a debug_timings response block"""
+    return {stage: round(seconds * 1000, 2) for stage, seconds in timings.items()}
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
@@ -1,43 +1,121 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import re
 import logging
-import PyPDF2
-import io
-import requests
+import http_client
+import metrics
+import pdf_text
+import hashlib
+import os
+import threading
+import numpy as np
+from collections.abc import Mapping
+from ann import ANN_CANDIDATES, ANN_INDEX_CACHE_SIZE, ANN_MIN_JOBS, ANN_MIN_USERS, JobEmbeddingIndex
+from cache import LRUCache
+from corpus import TfidfCorpus
+from job_record import JobRecord
+from lemmas import LemmaTable
+from nlp_resources import NLTK_AUTO_DOWNLOAD, ensure_corpora, load_nlp_resources
+from resume_cache import ResumeCache
+from skills import SkillMatcher
+from reranker import (
+    ENTRY_KEYWORDS, MID_KEYWORDS, SENIOR_KEYWORDS,
+    ENTRY_THRESHOLD, MID_THRESHOLD, SENIOR_THRESHOLD,
+    combine_scores, experience_thresholds, match_unique, substring_presence, top_k_indices
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Download necessary NLTK data with error handling
-try:
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('punkt', quiet=True)
-except Exception as e:
-    logger.warning(f"Could not download NLTK data: {e}")
+JOB_CACHE_SIZE = int(os.environ.get('JOB_CACHE_SIZE', '20000'))
+JOB_CACHE_TTL = int(os.environ.get('JOB_CACHE_TTL', '3600'))
+RERANK_ALL_JOBS = os.environ.get('RERANK_ALL_JOBS', 'False').lower() == 'true'
+BATCH_CHUNK_SIZE = int(os.environ.get('BATCH_CHUNK_SIZE', '256'))
+
+class ScoringContext:
+    """Vectorizer state owned by a single recommendation pass"""
+    __slots__ = ('vectorizer', 'corpus_version')
+    
+    def __init__(self, vectorizer, corpus_version=None):
+        self.vectorizer = vectorizer
+        self.corpus_version = corpus_version
 
 class JobRecommendationTransformer:
+    # Compiled once for the class, shared by every instance
+    skill_matcher = SkillMatcher.from_file()
+    
     def __init__(self):
-        try:
-            self.lemmatizer = WordNetLemmatizer()
-            self.stop_words = set(stopwords.words('english'))
-        except Exception as e:
-            logger.warning(f"Could not initialize NLTK components: {e}")
-            self.lemmatizer = None
-            self.stop_words = set()
-        
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=5000,
-            ngram_range=(1, 2),
-            min_df=1,
-            max_df=0.95
+        # NLTK corpora and sklearn are loaded on first use so importing this
+        # module stays cheap and never touches the network
+        self._nlp = None
+        self._vectorizer = None
+        self._init_lock = threading.Lock()
+        self.corpus = None
+        self.job_cache = LRUCache(JOB_CACHE_SIZE, JOB_CACHE_TTL)
+        self.resume_cache = ResumeCache()
+        # (corpus version, catalog version, job ids) -> embedding index
+        self.job_indexes = LRUCache(ANN_INDEX_CACHE_SIZE)
+        self._index_lock = threading.Lock()
+    
+    def _load_nlp(self):
+        if self._nlp is None:
+            with self._init_lock:
+                if self._nlp is None:
+                    lemmatizer, stop_words = load_nlp_resources()
+                    self._nlp = (lemmatizer, stop_words, LemmaTable(lemmatizer, stop_words))
+        return self._nlp
+    
+    @property
+    def lemmatizer(self):
+        return self._load_nlp()[0]
+    
+    @property
+    def stop_words(self):
+        return self._load_nlp()[1]
+    
+    @property
+    def lemma_table(self):
+        """Token -> lemma memo shared by every request"""
+        return self._load_nlp()[2]
+    
+    @property
+    def vectorizer(self):
+        """Unfitted TF-IDF template; requests fit clones of it"""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._vectorizer = TfidfVectorizer(
+                stop_words='english',
+                max_features=5000,
+                ngram_range=(1, 2),
+                min_df=1,
+                max_df=0.95
+            )
+        return self._vectorizer
+    
+    def warmup(self, download=NLTK_AUTO_DOWNLOAD):
+        """Load NLTK corpora and sklearn ahead of the first request, downloading missing corpora if allowed"""
+        if download:
+            try:
+                ensure_corpora()
+            except Exception as e:
+                logger.warning(f"Could not download NLTK corpora: {e}")
+            with self._init_lock:
+                if self._nlp is not None and self._nlp[0] is None:
+                    # A request got here first without corpora; load again with them
+                    self._nlp = None
+        from sklearn.base import clone
+        from sklearn.metrics.pairwise import cosine_similarity
+        # Two documents: with max_df=0.95 a single one leaves no admissible terms
+        vectors = clone(self.vectorizer).fit_transform(
+            [self.preprocess_text("python software engineer"), self.preprocess_text("java backend developer")]
         )
+        cosine_similarity(vectors, vectors)
+        http_client.get_session()
+    
+    def enable_corpus(self, path=None, refit_interval=0):
+        """Score against a TF-IDF corpus fitted once instead of refitting per request"""
+        self.corpus = TfidfCorpus(self.vectorizer, path=path)
+        self.corpus.load()
+        self.corpus.start_background_refit(refit_interval)
+        return self.corpus
     
     def preprocess_text(self, text):
         """Preprocess text by lowercasing, removing special chars, lemmatizing"""
@@ -45,16 +123,7 @@ class JobRecommendationTransformer:
             return ""
             
         try:
-            text = re.sub(r'[^\w\s]', ' ', text.lower())
-            if self.lemmatizer and self.stop_words:
-                tokens = [
-                    self.lemmatizer.lemmatize(word) 
-                    for word in text.split() 
-                    if word not in self.stop_words and len(word) > 2
-                ]
-            else:
-                tokens = [word for word in text.split() if len(word) > 2]
-            return " ".join(tokens)
+            return self.lemma_table.process(text)
         except Exception as e:
             logger.error(f"Error in text preprocessing: {e}")
             return text.lower()
@@ -65,74 +134,55 @@ class JobRecommendationTransformer:
             if not resume_url or not isinstance(resume_url, str):
                 return {}
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(resume_url, headers=headers, timeout=30)
-            if response.status_code != 200:
-                logger.warning(f"Failed to download resume: {response.status_code}")
-                return {}
-                
-            pdf_file = io.BytesIO(response.content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            download = self.resume_cache.download(resume_url)
+            if download.fresh_data is not None:
+                return download.fresh_data
             
-            text = ""
-            for page in pdf_reader.pages:
+            with metrics.timed('resume_download'):
+                response = http_client.get(resume_url, headers=download.request_headers(), timeout=30, stream=True)
                 try:
-                    text += page.extract_text() + "\n"
-                except Exception as e:
-                    logger.warning(f"Error extracting text from page: {e}")
-                    continue
-            
-            if not text.strip():
-                logger.warning("No text extracted from resume PDF")
-                return {}
-            
-            extracted_data = {
-                "full_text": text,
-                "extracted_skills": self.extract_skills(text),
-                "extracted_education": self.extract_education(text),
-                "extracted_experience": self.extract_experience(text),
-            }
-            return extracted_data
-            
-        except requests.RequestException as e:
+                    cached_data = download.not_modified(response.status_code)
+                    if cached_data is not None:
+                        return cached_data
+                    if response.status_code != 200:
+                        logger.warning(f"Failed to download resume: {response.status_code}")
+                        return {}
+                    content = pdf_text.read_limited(response)
+                finally:
+                    response.close()
+            
+            return download.store(response.headers, self.parse_resume(content))
+            
+        except http_client.RequestException as e:
             logger.error(f"Network error extracting resume data: {e}")
             return {}
+        except pdf_text.ResumeTooLargeError as e:
+            logger.warning(f"Skipping resume {resume_url}: {e}")
+            return {}
         except Exception as e:
             logger.error(f"Error extracting resume data: {e}")
             return {}
     
+    def parse_resume(self, content):
+        """Extract resume data from downloaded PDF bytes"""
+        with metrics.timed('pdf_parse'):
+            text = pdf_text.extract_text(content)
+        
+        if not text.strip():
+            logger.warning("No text extracted from resume PDF")
+            return {}
+        
+        with metrics.timed('resume_analysis'):
+            return {
+                "full_text": text,
+                "extracted_skills": self.extract_skills(text),
+                "extracted_education": self.extract_education(text),
+                "extracted_experience": self.extract_experience(text),
+            }
+    
     def extract_skills(self, text):
         """Extract skills from resume text"""
-        common_skills = [
-            "python", "java", "javascript", "typescript", "c++", "c#", "php", "ruby", 
-            "go", "rust", "swift", "kotlin", "scala", "r", "matlab", "perl",
-            "react", "angular", "vue", "nodejs", "express", "django", "flask", 
-            "fastapi", "spring", "spring boot", "laravel", "rails", "asp.net",
-            "html", "css", "sass", "less", "bootstrap", "tailwind",
-            "sql", "nosql", "mongodb", "postgresql", "mysql", "oracle", "redis",
-            "elasticsearch", "cassandra", "dynamodb", "firebase",
-            "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins",
-            "ci/cd", "git", "github", "gitlab", "devops", "ansible", "chef", "puppet",
-            "power bi", "tableau", "excel", "pandas", "numpy", "scipy", "matplotlib",
-            "seaborn", "plotly", "jupyter", "spark", "hadoop", "kafka", "airflow",
-            "ai", "ml", "machine learning", "deep learning", "tensorflow", "pytorch", 
-            "keras", "scikit-learn", "nlp", "computer vision", "opencv", "transformers",
-            "android", "ios", "react native", "flutter", "xamarin", "ionic",
-            "selenium", "cypress", "jest", "junit", "pytest", "testing", "automation testing",
-            "agile", "scrum", "kanban", "waterfall", "tdd", "bdd",
-            "rest api", "graphql", "microservices", "blockchain", "iot", "unity",
-            "figma", "sketch", "photoshop", "ui/ux", "responsive design"
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        for skill in common_skills:
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
-        return ", ".join(found_skills)
+        return ", ".join(self.skill_matcher.find(text))
     
     def extract_education(self, text):
         """Extract education details from resume text"""
@@ -175,25 +225,30 @@ class JobRecommendationTransformer:
                         experience_info += next_line + " "
         return experience_info.strip()
     
+    def extract_skill_tags(self, user_data):
+        """Normalized skill tags from keySkills alone, without job type or location terms"""
+        tags = set()
+        key_skills = user_data.get('keySkills', '')
+        if key_skills and isinstance(key_skills, str) and key_skills.strip():
+            skills = [skill.strip().lower() for skill in key_skills.split(',') if skill.strip()]
+            # Normalize skill names for broader matching
+            skill_mappings = {
+                'springboot': ['spring boot', 'springboot'],
+                'spring security': ['spring security'],
+                'postgresql': ['postgres', 'postgresql'],
+                'java': ['java', 'j2ee']
+            }
+            for skill in skills:
+                tags.add(skill)
+                if skill in skill_mappings:
+                    tags.update(skill_mappings[skill])
+            logger.info(f"Extracted and normalized skills from keySkills: {list(tags)}")
+        return sorted(tags)
+    
     def extract_user_tags(self, user_data):
         """Extract relevant tags from user data for job search, only from keySkills"""
         try:
-            tags = set()
-            key_skills = user_data.get('keySkills', '')
-            if key_skills and isinstance(key_skills, str) and key_skills.strip():
-                skills = [skill.strip().lower() for skill in key_skills.split(',') if skill.strip()]
-                # Normalize skill names for broader matching
-                skill_mappings = {
-                    'springboot': ['spring boot', 'springboot'],
-                    'spring security': ['spring security'],
-                    'postgresql': ['postgres', 'postgresql'],
-                    'java': ['java', 'j2ee']
-                }
-                for skill in skills:
-                    tags.add(skill)
-                    if skill in skill_mappings:
-                        tags.update(skill_mappings[skill])
-                logger.info(f"Extracted and normalized skills from keySkills: {list(tags)}")
+            tags = set(self.extract_skill_tags(user_data))
             
             job_type = user_data.get('preferedJobType', '')
             if job_type and isinstance(job_type, str) and job_type.strip():
@@ -303,28 +358,93 @@ class JobRecommendationTransformer:
                 "projects": []
             }
     
-    def create_job_vectors(self, jobs):
-        """Create feature vectors for jobs"""
-        try:
-            job_texts = []
+    def build_job_text(self, job):
+        """Concatenate the job fields used for vectorization"""
+        job_text_parts = [
+            job.get('title', ''),
+            job.get('company_name', ''),
+            job.get('category', ''),
+            ' '.join(job.get('tags', []) if isinstance(job.get('tags', []), list) else []),
+            job.get('description', ''),
+            job.get('candidate_required_location', ''),
+            job.get('job_type', '')
+        ]
+        return ' '.join(str(part) for part in job_text_parts if part)
+    
+    def _job_cache_key(self, job, job_text):
+        """Cache key from the normalized job id and a hash of its vectorized text"""
+        job_id = str(job.get('id', '')).strip().lower()
+        content_hash = hashlib.blake2b(job_text.encode('utf-8', 'ignore'), digest_size=16).hexdigest()
+        return f"{job_id}:{content_hash}"
+    
+    def new_scoring_context(self):
+        """Create the request-local vectorizer state for one scoring pass"""
+        if self.corpus is not None:
+            vectorizer, version = self.corpus.snapshot()
+            if vectorizer is not None:
+                return ScoringContext(vectorizer, version)
+        # Fitted per request, so concurrent requests never share a vocabulary
+        from sklearn.base import clone
+        return ScoringContext(clone(self.vectorizer), None)
+    
+    def _resolve_context(self, context, fitted=False):
+        """A fresh context for callers that don't pass one; the shared template is never fitted"""
+        if context is not None:
+            return context
+        context = self.new_scoring_context()
+        if fitted and context.corpus_version is None:
+            # A fresh clone has no vocabulary until create_job_vectors fits it
+            raise ValueError("Pass the scoring context the job vectors were created with")
+        return context
+    
+    def _cached_job_entries(self, jobs):
+        """Preprocessed text, cache key and cache entry of every job, preprocessing only cache misses"""
+        job_texts = []
+        cache_keys = []
+        cache_entries = []
+        with metrics.timed('job_preprocess'):
             for job in jobs:
-                if not isinstance(job, dict):
+                if not isinstance(job, Mapping):
                     job_texts.append("")
+                    cache_keys.append(None)
+                    cache_entries.append(None)
                     continue
-                job_text_parts = [
-                    job.get('title', ''),
-                    job.get('company_name', ''),
-                    job.get('category', ''),
-                    ' '.join(job.get('tags', []) if isinstance(job.get('tags', []), list) else []),
-                    job.get('description', ''),
-                    job.get('candidate_required_location', ''),
-                    job.get('job_type', '')
-                ]
-                job_text = ' '.join(str(part) for part in job_text_parts if part)
-                job_texts.append(self.preprocess_text(job_text))
+                # Compact records remember their key, so hits never decompress the description
+                key = getattr(job, 'cache_key', None)
+                entry = self.job_cache.get(key) if key else None
+                if entry is None:
+                    job_text = self.build_job_text(job)
+                    key = self._job_cache_key(job, job_text)
+                    entry = self.job_cache.get(key)
+                    if isinstance(job, JobRecord):
+                        job.cache_key = key
+                if entry is None:
+                    # Cache hits skip preprocessing entirely
+                    entry = {'text': self.preprocess_text(job_text), 'vector': None, 'corpus_version': None}
+                    self.job_cache.set(key, entry)
+                job_texts.append(entry['text'])
+                cache_keys.append(key)
+                cache_entries.append(entry)
+        return job_texts, cache_keys, cache_entries
+    
+    def create_job_vectors(self, jobs, context=None):
+        """Create feature vectors for jobs"""
+        try:
+            context = self._resolve_context(context)
+            job_texts, cache_keys, cache_entries = self._cached_job_entries(jobs)
+            
+            if self.corpus is not None:
+                self.corpus.add_documents(
+                    [str(job.get('id', '')) if isinstance(job, Mapping) else '' for job in jobs],
+                    job_texts
+                )
             
             if job_texts and any(t.strip() for t in job_texts):
-                job_vectors = self.vectorizer.fit_transform(job_texts)
+                with metrics.timed('tfidf_vectorize'):
+                    if context.corpus_version is not None:
+                        job_vectors = self._corpus_job_vectors(context.vectorizer, context.corpus_version, job_texts, cache_keys, cache_entries)
+                    else:
+                        job_vectors = context.vectorizer.fit_transform(job_texts)
             else:
                 job_vectors = []
             
@@ -334,8 +454,50 @@ class JobRecommendationTransformer:
             logger.error(f"Error creating job vectors: {e}")
             return [], [""]
     
-    def create_user_vector(self, user_profile, job_texts):
+    def _corpus_job_vectors(self, vectorizer, version, job_texts, cache_keys, cache_entries):
+        """Vectorize jobs against the fitted corpus, reusing cached rows of the same corpus version"""
+        missing = [
+            i for i, entry in enumerate(cache_entries)
+            if entry is None or entry['vector'] is None or entry['corpus_version'] != version
+        ]
+        if missing:
+            new_rows = vectorizer.transform([job_texts[i] for i in missing])
+            for row_idx, i in enumerate(missing):
+                if cache_entries[i] is not None:
+                    # Entries are replaced rather than mutated so concurrent readers stay consistent
+                    cache_entries[i] = dict(cache_entries[i], vector=new_rows[row_idx], corpus_version=version)
+                    self.job_cache.set(cache_keys[i], cache_entries[i])
+        if len(missing) == len(job_texts):
+            job_vectors = new_rows
+        else:
+            rows = []
+            missing_pos = {i: row_idx for row_idx, i in enumerate(missing)}
+            for i, entry in enumerate(cache_entries):
+                rows.append(new_rows[missing_pos[i]] if i in missing_pos else entry['vector'])
+            from scipy import sparse
+            job_vectors = sparse.vstack(rows, format='csr')
+        return job_vectors
+    
+    def update_jobs(self, changed_jobs, deleted_ids=()):
+        """Refresh the cached text and corpus vectors of changed catalog jobs only"""
+        try:
+            if self.corpus is not None and deleted_ids:
+                self.corpus.remove_documents([str(job_id) for job_id in deleted_ids])
+            if not changed_jobs:
+                return
+            job_texts, cache_keys, cache_entries = self._cached_job_entries(changed_jobs)
+            if self.corpus is None:
+                return
+            self.corpus.add_documents([str(job.get('id', '')) for job in changed_jobs], job_texts)
+            vectorizer, version = self.corpus.snapshot()
+            if vectorizer is not None and any(t.strip() for t in job_texts):
+                self._corpus_job_vectors(vectorizer, version, job_texts, cache_keys, cache_entries)
+        except Exception as e:
+            logger.error(f"Error updating changed jobs: {e}")
+    
+    def create_user_vector(self, user_profile, job_texts, context=None):
         """Create feature vector for user"""
+        context = self._resolve_context(context, fitted=True)
         try:
             if not isinstance(user_profile, dict):
                 user_profile = {}
@@ -374,28 +536,69 @@ class JobRecommendationTransformer:
             
             user_text = ' '.join(str(part) for part in user_text_parts if part)
             processed_user_text = self.preprocess_text(user_text)
-            user_vector = self.vectorizer.transform([processed_user_text])
+            user_vector = context.vectorizer.transform([processed_user_text])
             return user_vector
             
         except Exception as e:
             logger.error(f"Error creating user vector: {e}")
-            return self.vectorizer.transform([""])
+            return context.vectorizer.transform([""])
     
-    def calculate_match_scores(self, user_vector, job_vectors, jobs):
-        """Calculate match scores between user and jobs"""
+    def similarity_scores(self, user_vector, job_vectors, num_jobs):
+        """Cosine similarity of the user against every job as a dense array"""
         try:
-            if not job_vectors or job_vectors.shape[0] == 0:
-                return [(job, 0.0) for job in jobs]
-            similarity_scores = cosine_similarity(user_vector, job_vectors).flatten()
-            job_scores = []
-            for i in range(min(len(jobs), len(similarity_scores))):
-                job_scores.append((jobs[i], similarity_scores[i]))
-            job_scores.sort(key=lambda x: x[1], reverse=True)
-            return job_scores
-            
+            if isinstance(job_vectors, list) or job_vectors is None or job_vectors.shape[0] == 0:
+                return np.zeros(num_jobs)
+            from sklearn.metrics.pairwise import cosine_similarity
+            scores = cosine_similarity(user_vector, job_vectors).flatten()[:num_jobs]
+            if len(scores) < num_jobs:
+                scores = np.concatenate([scores, np.zeros(num_jobs - len(scores))])
+            return scores
         except Exception as e:
-            logger.error(f"Error calculating match scores: {e}")
-            return [(job, 0.0) for job in jobs]
+            logger.error(f"Error calculating similarity scores: {e}")
+            return np.zeros(num_jobs)
+    
+    def build_job_index(self, job_vectors, jobs, job_texts, context, user_count, catalog_version=None,
+                        min_jobs=ANN_MIN_JOBS, min_users=ANN_MIN_USERS):
+        """Embedding index over job vectors, or None when exact scoring is cheap enough
+
+        Indexes are cached per job set. With a fitted corpus the job vectors
+        are stable across requests, so single users search a cached index
+        too; otherwise only batches of at least min_users do.
+        """
+        if user_count < min_users and context.corpus_version is None:
+            return None
+        if isinstance(job_vectors, list) or job_vectors is None or job_vectors.shape[0] < max(min_jobs, 2):
+            return None
+        if catalog_version is not None:
+            # Catalog jobs only change content together with the catalog version
+            key = (context.corpus_version, catalog_version, tuple(job.get('id') for job in jobs))
+        else:
+            key = (context.corpus_version, None, tuple(job_texts))
+        with self._index_lock:
+            job_index = self.job_indexes.get(key)
+            if job_index is not None:
+                return job_index
+            try:
+                with metrics.timed('ann_build'):
+                    job_index = JobEmbeddingIndex.build(job_vectors)
+            except Exception as e:
+                logger.error(f"Error building job embedding index: {e}")
+                return None
+            self.job_indexes.set(key, job_index)
+            return job_index
+    
+    def rerank_from_index(self, user_profile, user_vector, jobs, job_vectors, job_index, pool_size):
+        """Re-rank the jobs nearest to the user in the embedding index, scored by exact cosine"""
+        with metrics.timed('ann_retrieve'):
+            ids = job_index.candidates(user_vector, max(ANN_CANDIDATES, pool_size))
+            candidates, similarity = self.calculate_match_scores(user_vector, job_vectors[ids], len(ids), pool_size)
+        with metrics.timed('rerank'):
+            return self.rerank_candidates(user_profile, [jobs[i] for i in ids], similarity, candidates)
+    
+    def calculate_match_scores(self, user_vector, job_vectors, num_jobs, k):
+        """Indices of the k best matching jobs, best first, and the similarity of every job"""
+        similarity = self.similarity_scores(user_vector, job_vectors, num_jobs)
+        return top_k_indices(similarity, k), similarity
     
     def check_location_match(self, user_locations, job_location):
         """Check if user's preferred location matches job location"""
@@ -459,36 +662,37 @@ class JobRecommendationTransformer:
             logger.error(f"Error calculating skill match: {e}")
             return 0.0
     
+    def experience_score(self, user_profile):
+        """Score the user's experience from internships, projects and degrees"""
+        experience_score = 0
+        
+        if user_profile.get('internships'):
+            experience_score += len(user_profile['internships']) * 0.5
+        if user_profile.get('projects'):
+            experience_score += len(user_profile['projects']) * 0.3
+        
+        education_keywords = ['master', 'phd', 'bachelor', 'degree']
+        for edu in user_profile.get('education', []):
+            degree = edu.get('degree', '').lower()
+            if any(keyword in degree for keyword in education_keywords):
+                if 'master' in degree or 'phd' in degree:
+                    experience_score += 2
+                elif 'bachelor' in degree:
+                    experience_score += 1
+        return experience_score
+    
     def assess_experience_match(self, user_profile, job_description):
         """Assess if user's experience level matches job requirements"""
         try:
             job_desc_lower = job_description.lower() if job_description else ""
-            experience_score = 0
-            
-            if user_profile.get('internships'):
-                experience_score += len(user_profile['internships']) * 0.5
-            if user_profile.get('projects'):
-                experience_score += len(user_profile['projects']) * 0.3
-            
-            education_keywords = ['master', 'phd', 'bachelor', 'degree']
-            for edu in user_profile.get('education', []):
-                degree = edu.get('degree', '').lower()
-                if any(keyword in degree for keyword in education_keywords):
-                    if 'master' in degree or 'phd' in degree:
-                        experience_score += 2
-                    elif 'bachelor' in degree:
-                        experience_score += 1
-            
-            entry_keywords = ['entry level', 'junior', 'fresher', 'graduate', 'trainee']
-            mid_keywords = ['mid level', 'experienced', '2+ years', '3+ years']
-            senior_keywords = ['senior', 'lead', '5+ years', 'expert', 'principal']
-            
-            if any(keyword in job_desc_lower for keyword in entry_keywords):
-                return experience_score >= 1
-            elif any(keyword in job_desc_lower for keyword in mid_keywords):
-                return experience_score >= 2
-            elif any(keyword in job_desc_lower for keyword in senior_keywords):
-                return experience_score >= 4
+            experience_score = self.experience_score(user_profile)
+            
+            if any(keyword in job_desc_lower for keyword in ENTRY_KEYWORDS):
+                return experience_score >= ENTRY_THRESHOLD
+            elif any(keyword in job_desc_lower for keyword in MID_KEYWORDS):
+                return experience_score >= MID_THRESHOLD
+            elif any(keyword in job_desc_lower for keyword in SENIOR_KEYWORDS):
+                return experience_score >= SENIOR_THRESHOLD
             else:
                 return True
                 
@@ -496,72 +700,175 @@ class JobRecommendationTransformer:
             logger.error(f"Error assessing experience match: {e}")
             return True
     
-    def recommend_jobs(self, user_data, jobs, top_n=10, resume_url=None):
+    def rerank_candidates(self, user_profile, jobs, similarity, candidates):
+        """Score candidate jobs with all re-ranking features at once, best first"""
+        candidates = np.asarray(candidates, dtype=np.int64)
+        if len(candidates) == 0:
+            return []
+        cand_jobs = [jobs[i] if isinstance(jobs[i], Mapping) else {} for i in candidates]
+        cand_similarity = np.asarray(similarity, dtype=float)[candidates]
+        
+        user_location = user_profile.get('preferred_location', '')
+        location_match = match_unique(
+            [str(job.get('candidate_required_location', '') or '') for job in cand_jobs],
+            lambda location: self.check_location_match(user_location, location)
+        )
+        user_job_type = user_profile.get('preferred_job_type', '')
+        job_type_match = match_unique(
+            [str(job.get('job_type', '') or '') for job in cand_jobs],
+            lambda job_type: self.check_job_type_match(user_job_type, job_type)
+        )
+        
+        user_skills = user_profile.get('key_skills', '') or ''
+        user_skills_list = [skill.strip().lower() for skill in user_skills.split(',') if skill.strip()]
+        # Read once: compact job records decompress descriptions on access
+        descriptions = [job.get('description', '') or '' for job in cand_jobs]
+        combined_texts = [
+            ' '.join([
+                job.get('title', ''),
+                description,
+                ' '.join(job.get('tags', []) if isinstance(job.get('tags', []), list) else [])
+            ]).lower()
+            for job, description in zip(cand_jobs, descriptions)
+        ]
+        if user_skills_list:
+            skill_hits = substring_presence(combined_texts, user_skills_list).sum(axis=1)
+            skill_match_percent = skill_hits / len(user_skills_list) * 100
+            skill_match_percent[np.fromiter((not t for t in combined_texts), dtype=bool, count=len(combined_texts))] = 0.0
+        else:
+            skill_match_percent = np.zeros(len(cand_jobs))
+        
+        experience_match = self.experience_score(user_profile) >= experience_thresholds(
+            [description.lower() for description in descriptions]
+        )
+        
+        scores = combine_scores(cand_similarity, location_match, job_type_match, skill_match_percent, experience_match)
+        order = np.argsort(-scores, kind='stable')
+        return [
+            {
+                'job': cand_jobs[k],
+                'score': float(scores[k]),
+                'criteria': {
+                    'similarity_score': float(cand_similarity[k]),
+                    'location_match': bool(location_match[k]),
+                    'job_type_match': bool(job_type_match[k]),
+                    'skill_match_percent': float(skill_match_percent[k]),
+                    'experience_match': bool(experience_match[k])
+                }
+            }
+            for k in order
+        ]
+    
+    def recommend_jobs(self, user_data, jobs, top_n=10, resume_url=None, rerank_all=RERANK_ALL_JOBS,
+                       resume_data=None, catalog_version=None):
         """Main method to recommend jobs based on user profile"""
         try:
-            resume_data = None
-            if resume_url:
+            if resume_data is None and resume_url:
                 resume_data = self.extract_resume_data(resume_url)
             
-            user_profile = self.prepare_user_profile(user_data, resume_data)
-            job_vectors, job_texts = self.create_job_vectors(jobs)
-            user_vector = self.create_user_vector(user_profile, job_texts)
-            job_scores = self.calculate_match_scores(user_vector, job_vectors, jobs)
-            
-            enhanced_recommendations = []
-            for job, similarity_score in job_scores[:top_n * 2]:
-                try:
-                    location_match = self.check_location_match(
-                        user_profile.get('preferred_location', ''),
-                        job.get('candidate_required_location', '')
-                    )
-                    job_type_match = self.check_job_type_match(
-                        user_profile.get('preferred_job_type', ''),
-                        job.get('job_type', '')
-                    )
-                    job_combined_text = ' '.join([
-                        job.get('title', ''),
-                        job.get('description', ''),
-                        ' '.join(job.get('tags', []) if isinstance(job.get('tags', []), list) else [])
-                    ])
-                    skill_match_percent = self.calculate_skill_match(
-                        user_profile.get('key_skills', ''),
-                        job_combined_text
-                    )
-                    experience_match = self.assess_experience_match(
-                        user_profile,
-                        job.get('description', '')
-                    )
-                    final_score = (
-                        similarity_score * 0.4 +
-                        (0.2 if location_match else 0) +
-                        (0.15 if job_type_match else 0) +
-                        (skill_match_percent / 100) * 0.2 +
-                        (0.05 if experience_match else 0)
-                    )
-                    recommendation = {
-                        'job': job,
-                        'score': final_score,
-                        'criteria': {
-                            'similarity_score': similarity_score,
-                            'location_match': location_match,
-                            'job_type_match': job_type_match,
-                            'skill_match_percent': skill_match_percent,
-                            'experience_match': experience_match
-                        }
-                    }
-                    enhanced_recommendations.append(recommendation)
-                except Exception as e:
-                    logger.warning(f"Error processing job recommendation: {e}")
-                    continue
-            
-            enhanced_recommendations.sort(key=lambda x: x['score'], reverse=True)
+            with metrics.timed('user_profile'):
+                user_profile = self.prepare_user_profile(user_data, resume_data)
+            context = self.new_scoring_context()
+            job_vectors, job_texts = self.create_job_vectors(jobs, context)
+            with metrics.timed('user_vector'):
+                user_vector = self.create_user_vector(user_profile, job_texts, context)
+            pool_size = len(jobs) if rerank_all else top_n * 2
+            job_index = None if rerank_all else self.build_job_index(
+                job_vectors, jobs, job_texts, context, 1, catalog_version
+            )
+            if job_index is not None:
+                return self.rerank_from_index(user_profile, user_vector, jobs, job_vectors, job_index, pool_size)[:top_n]
+            with metrics.timed('similarity'):
+                candidates, similarity = self.calculate_match_scores(user_vector, job_vectors, len(jobs), pool_size)
+            with metrics.timed('rerank'):
+                enhanced_recommendations = self.rerank_candidates(user_profile, jobs, similarity, candidates)
             return enhanced_recommendations[:top_n]
             
         except Exception as e:
             logger.error(f"Error in recommend_jobs: {e}")
             return []
     
+    def recommend_jobs_batch(self, users_data, jobs, top_n=10, resume_urls=None,
+                             rerank_all=RERANK_ALL_JOBS, chunk_size=BATCH_CHUNK_SIZE, resumes=None,
+                             catalog_version=None):
+        """Recommend jobs for many users against one shared job set, yielding (index, recommendations)"""
+        resume_urls = resume_urls or [None] * len(users_data)
+        # Already extracted resume data per user, e.g. downloaded by the async server
+        resumes = resumes or [None] * len(users_data)
+        context = self.new_scoring_context()
+        job_vectors, job_texts = self.create_job_vectors(jobs, context)
+        has_vectors = not isinstance(job_vectors, list) and job_vectors.shape[0] > 0
+        pool_size = len(jobs) if rerank_all else top_n * 2
+        # Large batches over large job sets are searched through an embedding index per user
+        job_index = None if rerank_all else self.build_job_index(
+            job_vectors, jobs, job_texts, context, len(users_data), catalog_version
+        )
+        
+        # Users are scored in chunks so results stream back early and the
+        # user x job similarity matrix stays bounded
+        for start in range(0, len(users_data), chunk_size):
+            chunk = range(start, min(start + chunk_size, len(users_data)))
+            profiles = []
+            for index in chunk:
+                try:
+                    resume_data = resumes[index]
+                    if resume_data is None and resume_urls[index]:
+                        resume_data = self.extract_resume_data(resume_urls[index])
+                    with metrics.timed('user_profile'):
+                        profiles.append(self.prepare_user_profile(users_data[index], resume_data))
+                except Exception as e:
+                    logger.error(f"Error preparing profile for batch user {index}: {e}")
+                    profiles.append(None)
+            
+            similarity = None
+            if job_index is not None:
+                for row, index in enumerate(chunk):
+                    if profiles[row] is None:
+                        yield index, []
+                        continue
+                    try:
+                        with metrics.timed('user_vector'):
+                            user_vector = self.create_user_vector(profiles[row], job_texts, context)
+                        recommendations = self.rerank_from_index(
+                            profiles[row], user_vector, jobs, job_vectors, job_index, pool_size
+                        )[:top_n]
+                    except Exception as e:
+                        logger.error(f"Error recommending jobs for batch user {index}: {e}")
+                        recommendations = []
+                    yield index, recommendations
+                continue
+            if has_vectors:
+                try:
+                    from scipy import sparse
+                    from sklearn.metrics.pairwise import cosine_similarity
+                    with metrics.timed('user_vector'):
+                        user_matrix = sparse.vstack(
+                            [self.create_user_vector(profile or {}, job_texts, context) for profile in profiles],
+                            format='csr'
+                        )
+                    with metrics.timed('similarity'):
+                        # One sparse product for every user x job pair in the chunk
+                        similarity = cosine_similarity(user_matrix, job_vectors, dense_output=False).tocsr()
+                except Exception as e:
+                    logger.error(f"Error calculating batch similarity: {e}")
+            
+            for row, index in enumerate(chunk):
+                if profiles[row] is None:
+                    yield index, []
+                    continue
+                try:
+                    with metrics.timed('rerank'):
+                        if similarity is not None:
+                            scores = similarity.getrow(row).toarray().ravel()[:len(jobs)]
+                        else:
+                            scores = np.zeros(len(jobs))
+                        candidates = top_k_indices(scores, pool_size)
+                        recommendations = self.rerank_candidates(profiles[row], jobs, scores, candidates)[:top_n]
+                except Exception as e:
+                    logger.error(f"Error recommending jobs for batch user {index}: {e}")
+                    recommendations = []
+                yield index, recommendations
+    
     def get_recommendation_explanation(self, recommendation):
         """Generate human-readable explanation for a recommendation"""
         try:
@@ -0,0 +1,91 @@
+"""NLTK corpora resolution without network access on the request path.
+
+Corpora are looked up in NLTK_DATA_DIR (ML/nltk_data by default) before the
+standard NLTK locations. Bundle them ahead of a deploy with:
+
+    python nlp_resources.py [target_dir]
+
+or set NLTK_AUTO_DOWNLOAD=true together with ML_PRELOAD=true to fetch
+missing corpora in the startup warmup instead.
+"""
+import logging
+import os
+import sys
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NLTK_DATA_DIR = os.environ.get(
+    'NLTK_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
+)
+# Only the explicit warmup downloads, and only when this is set
+NLTK_AUTO_DOWNLOAD = os.environ.get('NLTK_AUTO_DOWNLOAD', 'False').lower() == 'true'
+
+REQUIRED_CORPORA = ('stopwords', 'wordnet')
+
+
+def _configure_paths():
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    return nltk
+
+
+def missing_corpora():
+    """Names of required corpora not found on any NLTK data path"""
+    nltk = _configure_paths()
+    missing = []
+    for name in REQUIRED_CORPORA:
+        for resource in (f'corpora/{name}', f'corpora/{name}.zip'):
+            try:
+                nltk.data.find(resource)
+                break
+            except LookupError:
+                continue
+        else:
+            missing.append(name)
+    return missing
+
+
+def download_corpora(names=REQUIRED_CORPORA, target_dir=NLTK_DATA_DIR):
+    nltk = _configure_paths()
+    for name in names:
+        nltk.download(name, download_dir=target_dir, quiet=True)
+
+
+def ensure_corpora(target_dir=NLTK_DATA_DIR):
+    """Download missing corpora, returning the ones still missing; for build steps and warmup only"""
+    missing = missing_corpora()
+    if missing:
+        logger.info(f"Downloading NLTK corpora {missing} to {target_dir}")
+        download_corpora(missing, target_dir)
+        missing = missing_corpora()
+    return missing
+
+
+def load_nlp_resources():
+    """Return (lemmatizer, stop_words), or (None, empty set) if corpora are unavailable"""
+    try:
+        missing = missing_corpora()
+        if missing:
+            logger.warning(f"NLTK corpora {missing} not found under {NLTK_DATA_DIR}, lemmatization disabled")
+            return None, set()
+
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+        lemmatizer = WordNetLemmatizer()
+        stop_words = set(stopwords.words('english'))
+        # WordNet loads lazily and that first load is not thread-safe
+        lemmatizer.lemmatize('warmup')
+        return lemmatizer, stop_words
+    except Exception as e:
+        logger.warning(f"Could not initialize NLTK components: {e}")
+        return None, set()
+
+
+if __name__ == '__main__':
+    target = sys.argv[1] if len(sys.argv) > 1 else NLTK_DATA_DIR
+    download_corpora(target_dir=target)
+    print(f"NLTK corpora {list(REQUIRED_CORPORA)} saved to {target}")
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Normalized field -> (source keys in priority order, default, coerce to str).
+# The first truthy source wins. Non-string fields with no truthy source keep
+# the raw value of their last source key when it is present, like the
+# job.get(a) or job.get(b, default) chains this replaces.
+JOB_SCHEMA = (
+    ('id', ('id', 'job_id', '_id'), None, True),
+    ('title', ('title', 'job_title', 'position'), 'Unknown Job', True),
+    ('company_name', ('company_name', 'company', 'employer'), 'Unknown Company', True),
+    ('category', ('category', 'job_category', 'department'), '', True),
+    ('tags', ('tags', 'skills', 'keywords'), [], False),
+    ('job_type', ('job_type', 'employment_type', 'type'), '', True),
+    ('publication_date', ('publication_date', 'posted_date', 'updated_at'), '', True),
+    ('candidate_required_location', ('candidate_required_location', 'location', 'city'), '', True),
+    ('description', ('description', 'job_description', 'details'), '', True),
+    ('salary', ('salary', 'salary_range'), '', True),
+    ('experience_required', ('experience_required', 'experience_level'), '', True),
+    ('application_url', ('application_url', 'apply_url'), '', True),
+    ('remote_allowed', ('remote_allowed', 'is_remote'), False, False)
+)
+
+# One normalizer is built per distinct payload shape (tuple of keys)
+_MAX_SHAPES = 256
+_shape_normalizers = {}
+
+
+def _field_getter(present, default, raw_last):
+    """Reader of one field: the first truthy source key, else the default"""
+    if len(present) == 1 and raw_last:
+        key = present[0]
+        return lambda job: job[key]
+
+    def get(job):
+        for key in present:
+            value = job[key]
+            if value:
+                return value
+        # Mirrors job.get(last, default): the raw last value when nothing is truthy
+        return value if raw_last else default
+    return get
+
+
+def _build_normalizer(shape):
+    """Normalizer for one payload shape, with the source keys of every field resolved once"""
+    keys = set(shape)
+    # Fields the shape has no source for keep their default, set up front in schema order
+    template = {}
+    single_str = []
+    other = []
+    for field, aliases, default, as_str in JOB_SCHEMA:
+        present = tuple(alias for alias in aliases if alias in keys)
+        raw_last = not as_str and aliases[-1] in keys
+        convert = parse_tags if field == 'tags' else str if as_str and default is not None else None
+        template[field] = None
+        if not present and field != 'tags':
+            template[field] = convert(default) if convert is not None else default
+        elif len(present) == 1 and convert is str:
+            # The common case, kept out of a per-field function call
+            single_str.append((field, present[0], default))
+        else:
+            other.append((field, _field_getter(present, default, raw_last), convert))
+    single_str = tuple(single_str)
+    other = tuple(other)
+
+    def normalize(job):
+        normalized_job = template.copy()
+        for field, key, default in single_str:
+            normalized_job[field] = str(job[key] or default)
+        for field, get, convert in other:
+            value = get(job)
+            normalized_job[field] = convert(value) if convert is not None else value
+        job_id = normalized_job['id']
+        normalized_job['id'] = str(job_id) if job_id else content_job_id(normalized_job)
+        return normalized_job
+    return normalize
+
+
+# Normalized fields that identify a posting when the source has no id
+CONTENT_ID_FIELDS = (
+    'title', 'company_name', 'candidate_required_location', 'job_type',
+    'publication_date', 'application_url', 'description'
+)
+
+
+def content_job_id(normalized_job):
+    """Stable id derived from a normalized job's content, for payloads without one"""
+    content = "\x1f".join(normalized_job[field] for field in CONTENT_ID_FIELDS)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _clean_tags(tags):
+    return [str(tag).strip('[]"') for tag in tags if tag]
+
+
+def parse_tags(tags):
+    """Tags as a single comma-joined entry, from a list, a JSON list string or a CSV string"""
+    if isinstance(tags, list):
+        cleaned = _clean_tags(tags)
+    elif isinstance(tags, str):
+        cleaned = None
+        # Only strings that look like a JSON list are worth a json.loads
+        if tags.lstrip().startswith('['):
+            try:
+                parsed = json.loads(tags)
+                if isinstance(parsed, list):
+                    cleaned = _clean_tags(parsed)
+            except ValueError:
+                pass
+        if cleaned is None:
+            cleaned = [tag.strip('[]"') for tag in tags.split(',') if tag.strip('[]"')]
+    else:
+        if tags:
+            logger.warning(f"Unexpected tags format: {type(tags).__name__}")
+        return []
+    return [', '.join(cleaned)] if cleaned else []
+
+
+def normalize_job(job):
+    """Normalize one job dict from the external API to the expected format"""
+    shape = tuple(job)
+    normalizer = _shape_normalizers.get(shape)
+    if normalizer is None:
+        if len(_shape_normalizers) >= _MAX_SHAPES:
+            _shape_normalizers.clear()
+        normalizer = _shape_normalizers[shape] = _build_normalizer(shape)
+    return normalizer(job)
+
+
+def normalize_job_data(jobs):
+    """Normalize job data from external API to expected format"""
+    normalized_jobs = []
+    total = 0
+    skipped = 0
+    untitled = 0
+    for job in jobs:
+        total += 1
+        try:
+            if not isinstance(job, dict):
+                skipped += 1
+                continue
+            normalized_job = normalize_job(job)
+            if normalized_job['title'] == 'Unknown Job':
+                untitled += 1
+            normalized_jobs.append(normalized_job)
+        except Exception as e:
+            logger.warning(f"Error normalizing job data: {e}")
+            continue
+
+    # One summary line instead of formatting every bad payload
+    if skipped:
+        logger.warning(f"Skipped {skipped} non-dict jobs")
+    if untitled:
+        logger.warning(f"{untitled} jobs have no title")
+    logger.info(f"Normalized {len(normalized_jobs)} jobs out of {total} raw jobs")
+    return normalized_jobs
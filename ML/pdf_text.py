@@ -0,0 +1,127 @@
+import functools
+import importlib.util
+import io
+import itertools
+import logging
+import os
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Resumes above this size are rejected while downloading, not after
+RESUME_MAX_BYTES = int(os.environ.get('RESUME_MAX_BYTES', str(10 * 1024 * 1024)))
+# Only the first pages carry skills and experience; 0 parses every page
+RESUME_MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', '10'))
+PDF_BACKEND = os.environ.get('PDF_BACKEND', 'pypdf2').lower()
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class ResumeTooLargeError(ValueError):
+    """The resume exceeded RESUME_MAX_BYTES"""
+
+
+def read_limited(response, max_bytes=RESUME_MAX_BYTES):
+    """Read a streamed response body, aborting once it exceeds max_bytes"""
+    length = response.headers.get('Content-Length')
+    if max_bytes and length and length.isdigit() and int(length) > max_bytes:
+        raise ResumeTooLargeError(f"Resume is {length} bytes, limit is {max_bytes}")
+    buffer = io.BytesIO()
+    for chunk in response.iter_content(_CHUNK_SIZE):
+        buffer.write(chunk)
+        if max_bytes and buffer.tell() > max_bytes:
+            raise ResumeTooLargeError(f"Resume exceeds {max_bytes} bytes")
+    return buffer.getvalue()
+
+
+async def aread_limited(response, max_bytes=RESUME_MAX_BYTES):
+    """read_limited for a streamed httpx.AsyncClient response"""
+    length = response.headers.get('Content-Length')
+    if max_bytes and length and length.isdigit() and int(length) > max_bytes:
+        raise ResumeTooLargeError(f"Resume is {length} bytes, limit is {max_bytes}")
+    buffer = io.BytesIO()
+    async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+        buffer.write(chunk)
+        if max_bytes and buffer.tell() > max_bytes:
+            raise ResumeTooLargeError(f"Resume exceeds {max_bytes} bytes")
+    return buffer.getvalue()
+
+
+def _page_text(extract, page):
+    """Run one page's extraction, skipping the page if it fails"""
+    try:
+        return extract(page) or ""
+    except Exception as e:
+        logger.warning(f"Error extracting text from page: {e}")
+        return ""
+
+
+def _pypdf2_pages(data, max_pages):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    pages = reader.pages if not max_pages else itertools.islice(reader.pages, max_pages)
+    for page in pages:
+        yield _page_text(lambda p: p.extract_text(), page)
+
+
+def _pypdfium2_pages(data, max_pages):
+    import pypdfium2
+
+    def extract(page):
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+
+    pdf = pypdfium2.PdfDocument(data)
+    try:
+        count = len(pdf)
+        for index in range(min(count, max_pages) if max_pages else count):
+            yield _page_text(extract, pdf[index])
+    finally:
+        pdf.close()
+
+
+def _pdfminer_pages(data, max_pages):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    for layout in extract_pages(io.BytesIO(data), maxpages=max_pages or 0):
+        yield _page_text(
+            lambda page: "".join(element.get_text() for element in page if isinstance(element, LTTextContainer)),
+            layout
+        )
+
+
+def _pdfplumber_pages(data, max_pages):
+    import pdfplumber
+    pages = list(range(1, max_pages + 1)) if max_pages else None
+    with pdfplumber.open(io.BytesIO(data), pages=pages) as pdf:
+        for page in pdf.pages:
+            yield _page_text(lambda p: p.extract_text(), page)
+            page.close()
+
+
+BACKENDS = {
+    'pypdf2': ('PyPDF2', _pypdf2_pages),
+    'pypdfium2': ('pypdfium2', _pypdfium2_pages),
+    'pdfminer': ('pdfminer', _pdfminer_pages),
+    'pdfplumber': ('pdfplumber', _pdfplumber_pages)
+}
+
+
+@functools.lru_cache(maxsize=None)
+def available_backends():
+    """Backends whose library is installed"""
+    return tuple(name for name, (module, _) in BACKENDS.items() if importlib.util.find_spec(module) is not None)
+
+
+def extract_text(data, max_pages=RESUME_MAX_PAGES, backend=PDF_BACKEND):
+    """Text of the first max_pages pages of a PDF, each page followed by a newline"""
+    if backend not in available_backends():
+        logger.warning(f"PDF backend {backend!r} is not available, using pypdf2")
+        backend = 'pypdf2'
+    # Joined once at the end instead of growing a string page by page
+    return "".join(f"{text}\n" for text in BACKENDS[backend][1](data, max_pages))
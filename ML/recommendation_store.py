@@ -0,0 +1,199 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RECOMMENDATION_STORE_PATH = os.environ.get('RECOMMENDATION_STORE_PATH')
+# Entries older than this are served but refreshed, even if nothing else changed
+RECOMMENDATION_STORE_MAX_AGE = int(os.environ.get('RECOMMENDATION_STORE_MAX_AGE', '3600'))
+RECOMMENDATION_STORE_WORKERS = int(os.environ.get('RECOMMENDATION_STORE_WORKERS', '2'))
+RECOMMENDATION_STORE_REFRESH_INTERVAL = int(os.environ.get('RECOMMENDATION_STORE_REFRESH_INTERVAL', '60'))
+RECOMMENDATION_STORE_REFRESH_BATCH = int(os.environ.get('RECOMMENDATION_STORE_REFRESH_BATCH', '100'))
+
+
+def user_key(user_data):
+    """Stable identity of a profile across edits, empty when the payload has none"""
+    users_info = user_data.get('users') if isinstance(user_data.get('users'), dict) else {}
+    return str(
+        user_data.get('id') or user_data.get('_id') or user_data.get('userId')
+        or users_info.get('id') or users_info.get('_id') or users_info.get('email') or ''
+    )
+
+
+class RecommendationStore:
+    """Materialized top-N recommendations per user in SQLite, refreshed in the background
+
+    An entry is served as long as its profile hash matches the request.
+    Entries computed against an older catalog version, or older than
+    max_age, are still served but marked stale and recomputed on a
+    worker thread.
+    """
+
+    def __init__(self, path, max_age=RECOMMENDATION_STORE_MAX_AGE, workers=RECOMMENDATION_STORE_WORKERS):
+        self.path = path
+        self.max_age = max_age
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS recommendations (
+                user_key TEXT PRIMARY KEY,
+                profile_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                request TEXT NOT NULL,
+                result TEXT NOT NULL,
+                computed_at REAL NOT NULL,
+                attempted_at REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(recommendations)')}
+        if 'attempted_at' not in columns:
+            # Stores written before failed recomputes were tracked
+            self._conn.execute('ALTER TABLE recommendations ADD COLUMN attempted_at REAL NOT NULL DEFAULT 0')
+            self._conn.execute('UPDATE recommendations SET attempted_at = computed_at')
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='recommendation-store')
+        self._pending = set()
+        self._stop_event = threading.Event()
+        self._refresh_thread = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.recomputed = 0
+        self.failed = 0
+
+    def lookup(self, key, profile_hash, version):
+        """(result, freshness) of the stored entry for this profile, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT profile_hash, version, result, computed_at FROM recommendations WHERE user_key = ?', (key,)
+            ).fetchone()
+        if row is None or row[0] != profile_hash:
+            # A changed profile makes the stored ranking meaningless, not just old
+            self.misses += 1
+            return None
+        stale = row[1] != version or time.time() - row[3] > self.max_age
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return json.loads(row[2]), self.freshness(row[3], stale, 'precomputed')
+
+    def put(self, key, profile_hash, version, request, result):
+        """Store a computed result, returning its freshness"""
+        computed_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO recommendations '
+                '(user_key, profile_hash, version, request, result, computed_at, attempted_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, profile_hash, version, json.dumps(request, default=str), json.dumps(result, default=str),
+                 computed_at, computed_at)
+            )
+            self._conn.commit()
+        return self.freshness(computed_at, False, 'computed')
+
+    def mark_attempted(self, key):
+        """Move an entry whose recompute failed to the back of the refresh queue, keeping its result"""
+        with self._lock:
+            self._conn.execute('UPDATE recommendations SET attempted_at = ? WHERE user_key = ?', (time.time(), key))
+            self._conn.commit()
+
+    @staticmethod
+    def freshness(computed_at, stale, source):
+        return {
+            "computed_at": datetime.fromtimestamp(computed_at).isoformat(),
+            "age_seconds": round(max(time.time() - computed_at, 0.0), 1),
+            "stale": stale,
+            "source": source
+        }
+
+    def schedule(self, key, profile_hash, version, request, compute):
+        """Recompute an entry on a worker thread; a no-op if one is already queued for the user"""
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+
+        def run():
+            try:
+                result = compute(request)
+                if result and result.get("recommendations"):
+                    self.put(key, profile_hash, version, request, result)
+                    self.recomputed += 1
+                else:
+                    self.failed += 1
+                    self.mark_attempted(key)
+            except Exception as e:
+                logger.error(f"Error precomputing recommendations for {key}: {e}")
+                self.failed += 1
+                self.mark_attempted(key)
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        self._executor.submit(run)
+        return True
+
+    def refresh_outdated(self, version, compute, profile_hash_of, limit=RECOMMENDATION_STORE_REFRESH_BATCH):
+        """Schedule recomputation of entries from another catalog version or past max_age"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT user_key, request FROM recommendations WHERE version != ? OR computed_at < ? '
+                'ORDER BY attempted_at LIMIT ?',
+                (version, time.time() - self.max_age, limit)
+            ).fetchall()
+        scheduled = 0
+        for key, request in rows:
+            request = json.loads(request)
+            scheduled += self.schedule(key, profile_hash_of(request), version, request, compute)
+        return scheduled
+
+    def start_refresh(self, current_version, compute, profile_hash_of, interval=RECOMMENDATION_STORE_REFRESH_INTERVAL):
+        """Periodically recompute outdated entries from a daemon thread"""
+        if interval <= 0 or self._refresh_thread is not None:
+            return
+
+        def run():
+            while not self._stop_event.wait(interval):
+                try:
+                    scheduled = self.refresh_outdated(current_version(), compute, profile_hash_of)
+                    if scheduled:
+                        logger.info(f"Scheduled {scheduled} outdated recommendation entries for recomputation")
+                except Exception as e:
+                    logger.error(f"Error refreshing recommendation store: {e}")
+
+        self._refresh_thread = threading.Thread(target=run, name='recommendation-store-refresh', daemon=True)
+        self._refresh_thread.start()
+        logger.info(f"Started background recommendation store refresh every {interval}s")
+
+    def stop(self):
+        self._stop_event.set()
+        self._executor.shutdown(wait=False)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM recommendations').fetchone()[0]
+
+    def stats(self):
+        return {
+            "enabled": True,
+            "entries": len(self),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "recomputed": self.recomputed,
+            "failed": self.failed,
+            "pending": len(self._pending),
+            "max_age": self.max_age
+        }
@@ -0,0 +1,75 @@
+import numpy as np
+
+# Weights of the re-ranking features, in FEATURE_NAMES order
+FEATURE_NAMES = ('similarity_score', 'location_match', 'job_type_match', 'skill_match', 'experience_match')
+RERANK_WEIGHTS = np.array([0.4, 0.2, 0.15, 0.2, 0.05])
+
+ENTRY_KEYWORDS = ['entry level', 'junior', 'fresher', 'graduate', 'trainee']
+MID_KEYWORDS = ['mid level', 'experienced', '2+ years', '3+ years']
+SENIOR_KEYWORDS = ['senior', 'lead', '5+ years', 'expert', 'principal']
+
+# Minimum user experience score required by each job seniority level
+ENTRY_THRESHOLD = 1
+MID_THRESHOLD = 2
+SENIOR_THRESHOLD = 4
+
+def substring_presence(texts, needles):
+    """Boolean matrix of shape (len(texts), len(needles)): whether each needle occurs in each text"""
+    presence = np.zeros((len(texts), len(needles)), dtype=bool)
+    for col, needle in enumerate(needles):
+        if needle:
+            presence[:, col] = np.fromiter((needle in text for text in texts), dtype=bool, count=len(texts))
+    return presence
+
+
+def experience_level_threshold(description):
+    """Experience score a lowercased job description requires, -inf when it names no level"""
+    if any(keyword in description for keyword in ENTRY_KEYWORDS):
+        return ENTRY_THRESHOLD
+    if any(keyword in description for keyword in MID_KEYWORDS):
+        return MID_THRESHOLD
+    if any(keyword in description for keyword in SENIOR_KEYWORDS):
+        return SENIOR_THRESHOLD
+    return -np.inf
+
+
+def experience_thresholds(descriptions):
+    """Experience score each job requires, as an array aligned with descriptions"""
+    return np.fromiter(map(experience_level_threshold, descriptions), dtype=float, count=len(descriptions))
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, best first, ties broken by lower index"""
+    scores = np.asarray(scores)
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+    # O(n) selection, then sort only the k winners
+    kth_score = scores[np.argpartition(-scores, k - 1)[:k]].min()
+    above = np.flatnonzero(scores > kth_score)
+    ties = np.flatnonzero(scores == kth_score)[:k - len(above)]
+    winners = np.concatenate([above, ties])
+    return winners[np.lexsort((winners, -scores[winners]))]
+
+
+def match_unique(values, match_fn):
+    """Apply a scalar match function once per distinct value and broadcast back"""
+    if not values:
+        return np.zeros(0, dtype=bool)
+    uniques, inverse = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    matches = np.fromiter((bool(match_fn(value)) for value in uniques), dtype=bool, count=len(uniques))
+    return matches[inverse]
+
+
+def combine_scores(similarity, location_match, job_type_match, skill_match_percent, experience_match):
+    """Weighted sum of all re-ranking features in one matrix-vector product"""
+    features = np.column_stack([
+        similarity,
+        location_match,
+        job_type_match,
+        skill_match_percent / 100,
+        experience_match
+    ]).astype(float)
+    return features @ RERANK_WEIGHTS
@@ -0,0 +1,184 @@
+from cache import LRUCache
+import hashlib
+import json
+import logging
+import os
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '1000'))
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '300'))
+RESPONSE_CACHE_REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL')
+
+# Profile fields that feed tag extraction, the user vector or re-ranking
+SCORING_FIELDS = (
+    'keySkills', 'preferedLocation', 'preferedJobType', 'profileSummary',
+    'education', 'internships', 'projects'
+)
+
+
+def profile_key(user_data, resume_url, *params):
+    """Canonical hash of everything that changes a user's recommendations"""
+    fields = {name: user_data.get(name) for name in SCORING_FIELDS}
+    fields['resumeUrl'] = resume_url or ''
+    canonical = json.dumps([fields, list(params)], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class _Flight:
+    __slots__ = ('event', 'value', 'failed')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.failed = True
+
+
+class RedisBackend:
+    """Entries stored as JSON in any Redis-protocol server"""
+    # Calls do network I/O, so coroutines make them from a worker thread
+    blocking = True
+
+    def __init__(self, url, ttl, prefix='recommend:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis response cache read failed: {e}")
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value):
+        try:
+            self.client.set(self.prefix + key, json.dumps(value, default=str), ex=self.ttl or None)
+        except Exception as e:
+            logger.warning(f"Redis response cache write failed: {e}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+class ResponseCache:
+    """TTL-bounded recommendation results with single-flight computation"""
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL, redis_url=RESPONSE_CACHE_REDIS_URL):
+        self.backend = None
+        self.backend_name = 'memory'
+        if redis_url:
+            try:
+                self.backend = RedisBackend(redis_url, ttl)
+                self.backend_name = 'redis'
+            except ImportError:
+                logger.warning("RESPONSE_CACHE_REDIS_URL is set but the redis package is not installed, using memory")
+        if self.backend is None:
+            self.backend = LRUCache(maxsize, ttl)
+        self._flights = {}
+        self._async_flights = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def get_or_compute(self, key, compute, cache_if=None):
+        """Return (value, status) where status is 'hit', 'miss' or 'coalesced'
+
+        Concurrent callers with the same key wait for the first one instead of
+        computing again. Values are cached when cache_if(value) is true, or
+        when they are not None if no predicate is given.
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            return value, 'hit'
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if not flight.failed:
+                return flight.value, 'coalesced'
+            # The leader raised; compute independently rather than share the failure
+            return compute(), 'miss'
+
+        try:
+            flight.value = compute()
+            flight.failed = False
+            if cache_if(flight.value) if cache_if else flight.value is not None:
+                self.backend.set(key, flight.value)
+            return flight.value, 'miss'
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    async def _backend_call(self, method, *args):
+        """Backend call from a coroutine, off the event loop when the backend blocks"""
+        if getattr(self.backend, 'blocking', False):
+            import anyio
+            return await anyio.to_thread.run_sync(method, *args)
+        return method(*args)
+
+    async def aget_or_compute(self, key, compute, cache_if=None):
+        """get_or_compute for coroutines; callers of one event loop share a flight"""
+        import asyncio
+        value = await self._backend_call(self.backend.get, key)
+        if value is not None:
+            return value, 'hit'
+
+        flight = self._async_flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight), 'coalesced'
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+            except Exception:
+                pass
+            # The leader failed or was cancelled; compute independently
+            return await compute(), 'miss'
+
+        flight = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            # Mark retrieved so an unwaited failure is not logged by asyncio
+            flight.exception()
+            raise
+        else:
+            flight.set_result(value)
+            if cache_if(value) if cache_if else value is not None:
+                await self._backend_call(self.backend.set, key, value)
+            return value, 'miss'
+        finally:
+            del self._async_flights[key]
+
+    def stats(self):
+        return dict(self.backend.stats(), enabled=True, backend=self.backend_name, coalesced=self.coalesced)
@@ -0,0 +1,151 @@
+from cache import LRUCache
+import hashlib
+import json
+import logging
+import os
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RESUME_CACHE_SIZE = int(os.environ.get('RESUME_CACHE_SIZE', '1000'))
+RESUME_CACHE_DIR = os.environ.get('RESUME_CACHE_DIR')
+RESUME_CACHE_FRESH_SECONDS = int(os.environ.get('RESUME_CACHE_FRESH_SECONDS', '0'))
+
+RESUME_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+class ResumeCache:
+    """Extracted resume data keyed by URL and revalidated with ETag/Last-Modified"""
+
+    def __init__(self, maxsize=RESUME_CACHE_SIZE, directory=RESUME_CACHE_DIR,
+                 fresh_for=RESUME_CACHE_FRESH_SECONDS):
+        self.memory = LRUCache(maxsize)
+        self.directory = directory
+        self.fresh_for = fresh_for
+        self.revalidated = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _disk_path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        """Return the cached entry for a resume URL, checking disk on a memory miss"""
+        entry = self.memory.get(url)
+        if entry is not None or not self.directory:
+            return entry
+        try:
+            path = self._disk_path(url)
+            if not os.path.exists(path):
+                return None
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('url') != url:
+                return None
+            self.memory.set(url, entry)
+            return entry
+        except Exception as e:
+            logger.warning(f"Could not read cached resume for {url}: {e}")
+            return None
+
+    def set(self, url, etag, last_modified, data):
+        """Store extracted resume data with the validators it was served with"""
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'validated_at': time.time(),
+            'data': data
+        }
+        self.memory.set(url, entry)
+        if self.directory:
+            try:
+                path = self._disk_path(url)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"Could not write cached resume for {url}: {e}")
+        return entry
+
+    def mark_validated(self, url, entry):
+        """Record a 304 Not Modified response for a cached entry"""
+        self.revalidated += 1
+        return self.set(url, entry.get('etag'), entry.get('last_modified'), entry['data'])
+
+    def is_fresh(self, entry):
+        """Whether an entry is recent enough to skip revalidation entirely"""
+        return bool(self.fresh_for) and time.time() - entry.get('validated_at', 0) < self.fresh_for
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def download(self, url):
+        """Cache and validation steps for one download of url"""
+        return ResumeDownload(self, url)
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats.update({
+            "disk_enabled": bool(self.directory),
+            "fresh_for": self.fresh_for,
+            "revalidated": self.revalidated
+        })
+        return stats
+
+
+class ResumeDownload:
+    """Cache lookup, conditional headers and revalidation around one resume download
+
+    Callers only perform the HTTP request and read the body, so the sync
+    and async download paths share everything else.
+    """
+    __slots__ = ('cache', 'url', 'cached')
+
+    def __init__(self, cache, url):
+        self.cache = cache
+        self.url = url
+        self.cached = cache.get(url)
+
+    @property
+    def fresh_data(self):
+        """Cached data recent enough to skip the request entirely, or None"""
+        if self.cached is not None and self.cache.is_fresh(self.cached):
+            return self.cached['data']
+        return None
+
+    def request_headers(self):
+        headers = dict(RESUME_REQUEST_HEADERS)
+        if self.cached is not None:
+            headers.update(self.cache.conditional_headers(self.cached))
+        return headers
+
+    def not_modified(self, status_code):
+        """Cached data when the server answered 304 Not Modified for it, else None"""
+        if status_code != 304 or self.cached is None:
+            return None
+        # Unchanged since we parsed it, skip the download and the PDF parse
+        self.cache.mark_validated(self.url, self.cached)
+        return self.cached['data']
+
+    def store(self, response_headers, extracted_data):
+        """Cache freshly extracted data under the response validators and return it"""
+        if not extracted_data:
+            return {}
+        self.cache.set(
+            self.url,
+            response_headers.get('ETag'),
+            response_headers.get('Last-Modified'),
+            extracted_data
+        )
+        return extracted_data
@@ -0,0 +1,490 @@
+"""Job fetching, scoring and caching shared by the Flask and ASGI servers.
+
+Importing this module has no side effects: the corpus, response cache, job
+catalog and recommendation store are created, and their background threads
+started, by start(), which each server calls once on startup.
+"""
+import logging
+from datetime import datetime
+import os
+import http_client
+import threading
+import metrics
+from concurrent.futures import ThreadPoolExecutor, wait
+from model import JobRecommendationTransformer
+from catalog import JobCatalog
+from normalize import normalize_job_data
+from recommendation_store import RECOMMENDATION_STORE_PATH, RecommendationStore, user_key
+from response_cache import RESPONSE_CACHE_SIZE, ResponseCache, profile_key
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Initialize the job recommendation transformer
+transformer = JobRecommendationTransformer()
+
+# Optional pre-fitted TF-IDF corpus shared across requests
+TFIDF_CORPUS_PATH = os.environ.get('TFIDF_CORPUS_PATH')
+TFIDF_CORPUS_REFIT_INTERVAL = int(os.environ.get('TFIDF_CORPUS_REFIT_INTERVAL', '600'))
+
+# Load NLTK corpora and sklearn in the background instead of on the first request
+ML_PRELOAD = os.environ.get('ML_PRELOAD', 'False').lower() == 'true'
+
+# Configuration for external job API
+EXTERNAL_JOB_API_URL = os.environ.get('EXTERNAL_JOB_API_URL', 'https://job-recommendation-system-backend.onrender.com/api/jobs/getRelatedJobs')
+EXTERNAL_API_TIMEOUT = int(os.environ.get('EXTERNAL_API_TIMEOUT', '30'))
+EXTERNAL_API_MAX_WORKERS = int(os.environ.get('EXTERNAL_API_MAX_WORKERS', '8'))
+EXTERNAL_API_TOTAL_DEADLINE = float(os.environ.get('EXTERNAL_API_TOTAL_DEADLINE', '35'))
+
+def job_request_args(tag, location=None, job_type=None, limit=100):
+    """Query parameters and headers of one backend request for a tag"""
+    params = {
+        'tags': tag,
+        'limit': limit
+    }
+    if location:
+        params['location'] = location
+    if job_type:
+        params['job_type'] = job_type
+    
+    headers = {
+        'Content-Type': 'application/json',
+    }
+    auth_token = os.environ.get('EXTERNAL_API_TOKEN')
+    if auth_token:
+        headers['Authorization'] = f'Bearer {auth_token}'
+    return params, headers
+
+def jobs_from_payload(api_data, tag):
+    """Job list out of a backend response body"""
+    if isinstance(api_data, dict):
+        return api_data.get('jobs', api_data.get('data', []))
+    if isinstance(api_data, list):
+        return api_data
+    logger.warning(f"Unexpected API response format for tag {tag}: {type(api_data)}")
+    return []
+
+def dedupe_jobs(all_jobs):
+    """Remove duplicates based on job ID, keeping the last occurrence"""
+    return list({job.get('id', job.get('job_id', job.get('_id', str(i)))): job for i, job in enumerate(all_jobs)}.values())
+
+def _fetch_jobs_for_tag(tag, location=None, job_type=None, limit=100):
+    """Fetch jobs from external API for a single tag"""
+    params, headers = job_request_args(tag, location, job_type, limit)
+    logger.info(f"Fetching jobs for tag: {tag}")
+    response = http_client.get(
+        EXTERNAL_JOB_API_URL,
+        headers=headers,
+        params=params,
+        timeout=EXTERNAL_API_TIMEOUT
+    )
+    response.raise_for_status()
+    return jobs_from_payload(response.json(), tag)
+
+def fetch_jobs_from_external_api(tags, location=None, job_type=None, limit=100,
+                                 max_workers=None, deadline=None):
+    """Fetch jobs from external API based on tags, one concurrent request per tag"""
+    max_workers = max_workers or EXTERNAL_API_MAX_WORKERS
+    deadline = deadline or EXTERNAL_API_TOTAL_DEADLINE
+    try:
+        if not tags:
+            return []
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tags))))
+        try:
+            futures = [
+                executor.submit(_fetch_jobs_for_tag, tag, location, job_type, limit)
+                for tag in tags
+            ]
+            done, not_done = wait(futures, timeout=deadline)
+        finally:
+            # Don't block the request on stragglers past the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if not_done:
+            logger.warning(f"Job fetch deadline of {deadline}s exceeded, {len(not_done)} of {len(tags)} tag requests dropped")
+        
+        # Collect in tag order so dedup stays deterministic
+        all_jobs = []
+        for tag, future in zip(tags, futures):
+            if future not in done:
+                continue
+            try:
+                all_jobs.extend(future.result())
+            except http_client.RequestException as e:
+                logger.error(f"Error fetching jobs for tag {tag} from external API: {e}")
+            except Exception as e:
+                logger.error(f"Unexpected error fetching jobs for tag {tag}: {e}")
+        
+        unique_jobs = dedupe_jobs(all_jobs)
+        logger.info(f"Fetched {len(unique_jobs)} unique jobs from external API")
+        return unique_jobs
+        
+    except Exception as e:
+        logger.error(f"Unexpected error fetching jobs: {e}")
+        return []
+
+# Optional local job catalog, synced from the backend in the background
+JOB_CATALOG_PATH = os.environ.get('JOB_CATALOG_PATH')
+CATALOG_SYNC_INTERVAL = int(os.environ.get('CATALOG_SYNC_INTERVAL', '900'))
+CATALOG_SYNC_LIMIT = int(os.environ.get('CATALOG_SYNC_LIMIT', '500'))
+CATALOG_SEED_TAGS = [tag for tag in os.environ.get('CATALOG_SEED_TAGS', '').split(',') if tag.strip()]
+# Backend endpoint listing jobs changed since a watermark; replaces per-tag sync when set
+CATALOG_DELTA_URL = os.environ.get('CATALOG_DELTA_URL')
+
+def fetch_job_changes(since, cursor=None, limit=500):
+    """One page of jobs changed since the watermark from the backend delta endpoint"""
+    params = {'since': since, 'limit': limit}
+    if cursor:
+        params['cursor'] = cursor
+    headers = {'Content-Type': 'application/json'}
+    auth_token = os.environ.get('EXTERNAL_API_TOKEN')
+    if auth_token:
+        headers['Authorization'] = f'Bearer {auth_token}'
+    response = http_client.get(CATALOG_DELTA_URL, headers=headers, params=params, timeout=EXTERNAL_API_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+# Created by start(); each stays None while its feature is disabled
+response_cache = None
+catalog = None
+recommendation_store = None
+
+def home_payload():
+    return {
+        "message": "Job Recommendation API is running",
+        "status": "healthy",
+        "timestamp": str(datetime.now().isoformat()),
+        "external_api_configured": bool(os.environ.get('EXTERNAL_JOB_API_URL'))
+    }
+
+def health_payload(external_api_status):
+    return {
+        "status": "healthy",
+        "service": "Job Recommendation API",
+        "version": "2.0.0",
+        "timestamp": str(datetime.now().isoformat()),
+        "external_job_api": {
+            "configured": bool(os.environ.get('EXTERNAL_JOB_API_URL')),
+            "status": external_api_status,
+            "url": os.environ.get('EXTERNAL_JOB_API_URL', 'not_configured')
+        },
+        "http_pool": http_client.get_pool_stats(),
+        "tfidf_corpus": transformer.corpus.stats() if transformer.corpus is not None else {"enabled": False},
+        "job_vector_cache": transformer.job_cache.stats(),
+        "resume_cache": transformer.resume_cache.stats(),
+        "response_cache": response_cache.stats() if response_cache is not None else {"enabled": False},
+        "job_catalog": catalog.stats() if catalog is not None else {"enabled": False},
+        "recommendation_store": recommendation_store.stats() if recommendation_store is not None else {"enabled": False}
+    }
+
+
+FALLBACK_JOB = {
+    'id': 'fallback_1',
+    'title': 'Java Developer',
+    'company_name': 'Fallback Inc.',
+    'category': 'Software Development',
+    'tags': ['java', 'springboot', 'postgresql'],
+    'job_type': 'Full-Time',
+    'candidate_required_location': 'Bangalore',
+    'description': 'Develop Java-based applications using Springboot and PostgreSQL.',
+    'remote_allowed': False
+}
+
+BATCH_MAX_USERS = int(os.environ.get('BATCH_MAX_USERS', '1000'))
+
+def resolve_user_tags(user_data):
+    """Extract search tags from a profile, falling back to defaults"""
+    user_tags = transformer.extract_user_tags(user_data)
+    if not user_tags or user_tags == ['general']:
+        logger.warning("No specific tags extracted, using fallback tags")
+        user_tags = ['java', 'software engineer', 'full-time']
+        logger.info(f"Using fallback tags: {user_tags}")
+    return user_tags
+
+def batch_skill_tags(users):
+    """Distinct skill tags of every profile in a batch"""
+    return list(dict.fromkeys(tag for user in users for tag in transformer.extract_skill_tags(user)))
+
+def catalog_jobs(skill_tags, fetch_limit=100, location=None, job_type=None):
+    """Catalog jobs for the skill tags it covers, and the tags it has no jobs for"""
+    if catalog is None:
+        return [], list(skill_tags)
+    catalog.track_tags(skill_tags)
+    with metrics.timed('catalog_lookup'):
+        uncovered = catalog.uncovered_tags(skill_tags)
+        jobs_data = catalog.find_jobs(skill_tags, limit_per_tag=fetch_limit, location=location, job_type=job_type)
+    if jobs_data:
+        logger.info(f"Resolved {len(jobs_data)} candidate jobs from local catalog, {len(uncovered)} tags uncovered")
+    return jobs_data, uncovered
+
+def jobs_to_fetch(user_tags, jobs_data, uncovered):
+    """(tags, job_source) of the backend fetch still needed after the catalog lookup, or None"""
+    if jobs_data and not uncovered:
+        return None
+    if jobs_data:
+        # Partial coverage: fetch only the skills the catalog has nothing for
+        return uncovered, "catalog+external_api"
+    return user_tags, "external_api"
+
+def prepare_fetched_jobs(raw_jobs, fallback=True):
+    """Normalize backend jobs, falling back to a default job, and warm the catalog"""
+    fetched_from_api = bool(raw_jobs)
+    
+    if not raw_jobs:
+        if not fallback:
+            return [], []
+        logger.warning("No jobs fetched from external API, using fallback jobs")
+        raw_jobs = [dict(FALLBACK_JOB)]
+    
+    with metrics.timed('normalize'):
+        jobs_data = normalize_job_data(raw_jobs)
+    if not jobs_data:
+        logger.error(f"No valid jobs after normalization, raw jobs: {len(raw_jobs)}")
+        jobs_data = normalize_job_data([dict(FALLBACK_JOB)]) if fallback else []
+    elif fetched_from_api and catalog is not None:
+        # Warm the local catalog with what the backend returned; new jobs
+        # alone don't invalidate cached or precomputed results
+        with metrics.timed('catalog_upsert'):
+            catalog.upsert(jobs_data, warm=True)
+    return raw_jobs, jobs_data
+
+def merge_fetched_jobs(catalog_jobs_data, raw_jobs):
+    """Catalog jobs plus normalized backend jobs, deduplicated by id"""
+    raw_jobs, fetched_jobs = prepare_fetched_jobs(raw_jobs, fallback=not catalog_jobs_data)
+    if not catalog_jobs_data:
+        return raw_jobs, fetched_jobs
+    merged = {job['id']: job for job in catalog_jobs_data}
+    merged.update((job['id'], job) for job in fetched_jobs)
+    return raw_jobs, list(merged.values())
+
+def load_jobs(user_tags, location=None, job_type=None, fetch_limit=100, skill_tags=None):
+    """Resolve candidate jobs from the local catalog, fetching the tags it doesn't cover from the external API"""
+    raw_jobs = []
+    job_source = "catalog"
+    jobs_data, uncovered = catalog_jobs(skill_tags or user_tags, fetch_limit, location, job_type)
+    
+    fetch = jobs_to_fetch(user_tags, jobs_data, uncovered)
+    if fetch is not None:
+        fetch_tags, job_source = fetch
+        with metrics.timed('fetch_jobs'):
+            raw_jobs = fetch_jobs_from_external_api(
+                tags=fetch_tags,
+                location=location,
+                job_type=job_type,
+                limit=fetch_limit
+            )
+        raw_jobs, jobs_data = merge_fetched_jobs(jobs_data, raw_jobs)
+    
+    logger.info(f"Normalized {len(jobs_data)} jobs for recommendation")
+    return raw_jobs, jobs_data, job_source
+
+def get_resume_url(user_data):
+    return user_data.get('users', {}).get('resumeUrl', '') or user_data.get('resumeUrl', '')
+
+def format_recommendation(rank, rec):
+    """Shape one scored job into the API response format"""
+    job = rec['job']
+    score = rec['score']
+    criteria = rec['criteria']
+    return {
+        "rank": rank,
+        "job_id": job.get('id'),
+        "title": job.get('title'),
+        "company": job.get('company_name'),
+        "category": job.get('category'),
+        "location": job.get('candidate_required_location'),
+        "job_type": job.get('job_type'),
+        "tags": job.get('tags', []),
+        "publication_date": job.get('publication_date'),
+        "description": job.get('description', ''),  # Full-length description
+        "salary": job.get('salary'),
+        "experience_required": job.get('experience_required'),
+        "application_url": job.get('application_url'),
+        "remote_allowed": job.get('remote_allowed'),
+        "match_score": round(score, 3),
+        "match_criteria": {
+            "similarity_score": round(criteria['similarity_score'], 3),
+            "location_match": criteria['location_match'],
+            "job_type_match": criteria['job_type_match'],
+            "skill_match_percent": round(criteria['skill_match_percent'], 2),
+            "experience_match": criteria['experience_match']
+        },
+        "explanation": transformer.get_recommendation_explanation(rec)
+    }
+
+def format_user_profile(user_data, user_tags):
+    return {
+        "name": f"{user_data.get('users', {}).get('firstName', '')} {user_data.get('users', {}).get('lastName', '')}".strip(),
+        "email": user_data.get('users', {}).get('email', ''),
+        "preferred_location": user_data.get('preferedLocation', ''),
+        "preferred_job_type": user_data.get('preferedJobType', ''),
+        "key_skills": user_data.get('keySkills', ''),
+        "extracted_tags": user_tags
+    }
+
+def format_api_info(raw_jobs, jobs_data, job_source):
+    return {
+        "jobs_fetched": len(raw_jobs),
+        "jobs_processed": len(jobs_data),
+        "job_source": job_source,
+        "external_api_url": os.environ.get('EXTERNAL_JOB_API_URL', 'not_configured')
+    }
+
+def clamp_limits(top_n, fetch_limit):
+    """Bound the top_n and fetch_limit query parameters"""
+    return min(max(top_n, 1), 50), min(max(fetch_limit, 10), 500)
+
+def wants_debug_timings(query_value, user_data):
+    """debug_timings from the query string, or from the JSON body"""
+    value = query_value if query_value is not None else user_data.get('debug_timings', '')
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def current_catalog_version():
+    return catalog.version if catalog is not None else None
+
+def recommendation_cache_key(user_data, resume_url, top_n, fetch_limit):
+    return profile_key(
+        user_data, resume_url, top_n, fetch_limit,
+        catalog.version if catalog is not None else None,
+        transformer.corpus.version if transformer.corpus is not None else None
+    )
+
+def format_recommendation_response(user_data, result, cache_status, freshness=None):
+    """Response body of /api/recommend from a (possibly cached) scoring result"""
+    formatted_recommendations = result["recommendations"]
+    response = {
+        "status": "success",
+        "message": f"Found {len(formatted_recommendations)} job recommendations",
+        "total_recommendations": len(formatted_recommendations),
+        # Rebuilt per request: cached results are shared by identical profiles
+        "user_profile": format_user_profile(user_data, result["extracted_tags"]),
+        "api_info": dict(result["api_info"], cache=cache_status),
+        "recommendations": formatted_recommendations,
+        "timestamp": str(datetime.now().isoformat())
+    }
+    if freshness is not None:
+        response["freshness"] = freshness
+    return response
+
+def compute_recommendations(user_data, top_n, fetch_limit):
+    """Resolve tags, load candidate jobs and score them into a cacheable result"""
+    with metrics.timed('resolve_tags'):
+        user_tags = resolve_user_tags(user_data)
+    logger.info(f"Extracted user tags: {user_tags}")
+    raw_jobs, jobs_data, job_source = load_jobs(
+        user_tags,
+        location=user_data.get('preferedLocation'),
+        job_type=user_data.get('preferedJobType'),
+        fetch_limit=fetch_limit,
+        skill_tags=transformer.extract_skill_tags(user_data)
+    )
+    
+    with metrics.timed('recommend'):
+        recommendations = transformer.recommend_jobs(
+            user_data, jobs_data, top_n, get_resume_url(user_data), catalog_version=current_catalog_version()
+        )
+    
+    with metrics.timed('format_response'):
+        formatted_recommendations = [format_recommendation(i + 1, rec) for i, rec in enumerate(recommendations)]
+    return {
+        "recommendations": formatted_recommendations,
+        "extracted_tags": user_tags,
+        "api_info": format_api_info(raw_jobs, jobs_data, job_source)
+    }
+
+# Precompute mode: each user's result is materialized and served from a local store
+def recommendation_version():
+    """Version of everything outside the profile that changes recommendations"""
+    return (
+        f"{catalog.version if catalog is not None else ''}:"
+        f"{transformer.corpus.version if transformer.corpus is not None else ''}"
+    )
+
+def precompute_request(user_data, top_n, fetch_limit):
+    return {"user_data": user_data, "top_n": top_n, "fetch_limit": fetch_limit}
+
+def precompute_profile_hash(stored_request):
+    user_data = stored_request["user_data"]
+    return profile_key(user_data, get_resume_url(user_data), stored_request["top_n"], stored_request["fetch_limit"])
+
+def compute_stored_request(stored_request):
+    return compute_recommendations(stored_request["user_data"], stored_request["top_n"], stored_request["fetch_limit"])
+
+def precomputed_recommendations(key, stored_request):
+    """Stored (result, status, freshness) for the user, scheduling a refresh when outdated; None on a miss"""
+    profile_hash = precompute_profile_hash(stored_request)
+    version = recommendation_version()
+    with metrics.timed('store_lookup'):
+        found = recommendation_store.lookup(key, profile_hash, version)
+    if found is None:
+        return None
+    result, freshness = found
+    if freshness["stale"]:
+        recommendation_store.schedule(key, profile_hash, version, stored_request, compute_stored_request)
+        return result, "precomputed_stale", freshness
+    return result, "precomputed", freshness
+
+def store_recommendations(key, stored_request, result):
+    """Materialize a freshly computed result, returning its freshness"""
+    return recommendation_store.put(
+        key, precompute_profile_hash(stored_request), recommendation_version(), stored_request, result
+    )
+
+def precompute_users(payload):
+    """Profiles of a precompute request: one profile, a list, or {"users": [...]}"""
+    if isinstance(payload, dict):
+        # A single profile has a 'users' dict of account details, not a list
+        return payload['users'] if isinstance(payload.get('users'), list) else [payload]
+    return payload
+
+def schedule_precompute(users, top_n, fetch_limit):
+    """Queue background recomputation for profiles that changed, returning the scheduled user keys"""
+    scheduled = []
+    for user_data in users:
+        key = user_key(user_data) if isinstance(user_data, dict) else ''
+        if not key:
+            continue
+        stored_request = precompute_request(user_data, top_n, fetch_limit)
+        if recommendation_store.schedule(
+                key, precompute_profile_hash(stored_request), recommendation_version(),
+                stored_request, compute_stored_request):
+            scheduled.append(key)
+    return scheduled
+
+_started = False
+_start_lock = threading.Lock()
+
+def start():
+    """Create the configured shared state and start its background threads, once per process"""
+    global response_cache, catalog, recommendation_store, _started
+    if _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        if TFIDF_CORPUS_PATH:
+            transformer.enable_corpus(TFIDF_CORPUS_PATH, TFIDF_CORPUS_REFIT_INTERVAL)
+        if RESPONSE_CACHE_SIZE > 0:
+            response_cache = ResponseCache()
+        if ML_PRELOAD:
+            threading.Thread(target=transformer.warmup, name='model-warmup', daemon=True).start()
+        if JOB_CATALOG_PATH:
+            catalog = JobCatalog(JOB_CATALOG_PATH)
+            # Changed jobs refresh only their own cached text and corpus vectors
+            catalog.add_listener(transformer.update_jobs)
+            if CATALOG_DELTA_URL:
+                catalog.start_delta_sync(fetch_job_changes, normalize_job_data, CATALOG_SYNC_INTERVAL)
+            else:
+                catalog.start_sync(
+                    lambda tags: fetch_jobs_from_external_api(tags, limit=CATALOG_SYNC_LIMIT),
+                    normalize_job_data,
+                    CATALOG_SYNC_INTERVAL,
+                    seed_tags=CATALOG_SEED_TAGS
+                )
+        if RECOMMENDATION_STORE_PATH:
+            recommendation_store = RecommendationStore(RECOMMENDATION_STORE_PATH)
+            recommendation_store.start_refresh(recommendation_version, compute_stored_request, precompute_profile_hash)
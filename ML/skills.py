@@ -0,0 +1,73 @@
+import logging
+import os
+import re
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SKILLS_DATA_PATH = os.environ.get(
+    'SKILLS_DATA_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.txt')
+)
+
+
+def _trie_pattern(words):
+    """Build a regex whose alternation is factored into a character trie"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        # Greedy optional: prefer the longest skill, backtrack to a shorter one
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Finds every dictionary skill in a text with one compiled regex pass"""
+
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(s.strip().lower() for s in skills if s and s.strip()))
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+        # Zero-width lookahead so every start position is tried, including
+        # ones inside a longer match (e.g. "testing" in "automation testing")
+        self.pattern = re.compile(r'(?<!\w)(?=(' + _trie_pattern(self.skills) + r')(?!\w))')
+        # A match only reports the longest skill at a position; shorter skills
+        # that end on a boundary inside it ("spring" in "spring boot") are
+        # expanded from this table
+        self._nested = {}
+        for skill in self.skills:
+            nested = [
+                skill[:pos] for pos in range(1, len(skill))
+                if skill[:pos] in self._order and not re.match(r'\w', skill[pos])
+            ]
+            if nested:
+                self._nested[skill] = nested
+
+    @classmethod
+    def from_file(cls, path=SKILLS_DATA_PATH):
+        """Load the skill dictionary from a text file, one skill per line"""
+        with open(path, encoding='utf-8') as f:
+            skills = [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+        logger.info(f"Loaded {len(skills)} skills from {path}")
+        return cls(skills)
+
+    def find(self, text):
+        """Return the dictionary skills present in text, in dictionary order"""
+        if not text or not self.skills:
+            return []
+        found = set()
+        for match in self.pattern.finditer(text.lower()):
+            skill = match.group(1)
+            found.add(skill)
+            found.update(self._nested.get(skill, ()))
+        return sorted(found, key=self._order.__getitem__)
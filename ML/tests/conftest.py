@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules are imported the way the service runs them, from ML/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+# Tests never download NLTK corpora; lemmatization is disabled if they are missing
+os.environ.setdefault('NLTK_AUTO_DOWNLOAD', 'false')
@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+ML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in a fresh interpreter; prints one JSON object
+_CHILD = '''
+import asyncio, json, sys, threading
+import asgi_app
+imported = {
+    "modules": sorted(m for m in ('flask', 'app') if m in sys.modules),
+    "threads": sorted(t.name for t in threading.enumerate() if t is not threading.main_thread())
+}
+
+async def lifespan():
+    messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+    async def receive():
+        return messages.pop(0)
+    async def send(message):
+        sent.append(message['type'])
+        if message['type'] == 'lifespan.startup.complete':
+            imported["started_threads"] = sorted(t.name for t in threading.enumerate() if t is not threading.main_thread())
+    await asgi_app.app({'type': 'lifespan'}, receive, send)
+
+asyncio.run(lifespan())
+print(json.dumps(imported))
+'''
+
+
+def test_import_has_no_side_effects_until_startup(tmp_path):
+    env = dict(
+        os.environ,
+        JOB_CATALOG_PATH=str(tmp_path / 'catalog.db'),
+        CATALOG_SYNC_INTERVAL='3600',
+        EXTERNAL_JOB_API_URL='http://127.0.0.1:9/api/jobs/getRelatedJobs',
+        RECOMMENDATION_STORE_PATH=str(tmp_path / 'store.db')
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', _CHILD], cwd=ML_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["modules"] == []
+    assert 'job-catalog-sync' not in result["threads"]
+    assert 'recommendation-store-refresh' not in result["threads"]
+    assert 'job-catalog-sync' in result["started_threads"]
+    assert 'recommendation-store-refresh' in result["started_threads"]
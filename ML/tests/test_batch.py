@@ -0,0 +1,63 @@
+import functools
+from benchmarks import synthetic
+from model import JobRecommendationTransformer
+
+
+def ranking(recommendations):
+    return [(rec['job']['id'], rec['score']) for rec in recommendations]
+
+
+def test_small_batches_rank_like_single_recommendations(monkeypatch):
+    transformer = JobRecommendationTransformer()
+    # Enough jobs that the index would only re-rank part of them
+    jobs = synthetic.jobs(3000)
+    # Large enough for the index by job count, but too few users to use it
+    monkeypatch.setattr(transformer, 'build_job_index', functools.partial(
+        JobRecommendationTransformer.build_job_index, transformer, min_jobs=100
+    ))
+    users = synthetic.profiles(5)
+
+    batch = dict(transformer.recommend_jobs_batch(users, jobs, top_n=10))
+
+    for index, user in enumerate(users):
+        assert ranking(batch[index]) == ranking(transformer.recommend_jobs(user, jobs, top_n=10))
+
+
+def test_job_index_is_built_once_per_job_set():
+    transformer = JobRecommendationTransformer()
+    jobs = synthetic.jobs(300)
+    context = transformer.new_scoring_context()
+    job_vectors, job_texts = transformer.create_job_vectors(jobs, context)
+
+    def build(texts=job_texts, users=100, catalog_version=None, job_set=jobs):
+        return transformer.build_job_index(
+            job_vectors, job_set, texts, context, users, catalog_version, min_jobs=100, min_users=50
+        )
+
+    job_index = build()
+    assert job_index is not None
+    assert build(list(job_texts)) is job_index
+    assert build(job_texts[::-1]) is not job_index
+    assert build(users=10) is None
+    assert transformer.build_job_index(job_vectors, jobs, job_texts, context, 100, min_jobs=1000) is None
+    # Catalog jobs are keyed by id and catalog version instead of their texts
+    versioned = build(catalog_version=3)
+    assert build(texts=[], catalog_version=3) is versioned
+    assert build(catalog_version=4) is not versioned
+
+
+def test_single_users_search_the_cached_index_with_a_corpus(tmp_path):
+    transformer = JobRecommendationTransformer()
+    transformer.enable_corpus(str(tmp_path / 'corpus.joblib'))
+    jobs = synthetic.jobs(300)
+    transformer.corpus.fit([transformer.preprocess_text(transformer.build_job_text(job)) for job in jobs])
+    transformer.build_job_index = functools.partial(
+        JobRecommendationTransformer.build_job_index, transformer, min_jobs=100
+    )
+    user = synthetic.profiles(1)[0]
+
+    first = transformer.recommend_jobs(user, jobs, top_n=10, catalog_version=1)
+    assert len(transformer.job_indexes) == 1
+    assert transformer.recommend_jobs(user, jobs, top_n=10, catalog_version=1) == first
+    assert len(transformer.job_indexes) == 1
+    assert first
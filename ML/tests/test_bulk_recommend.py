@@ -0,0 +1,56 @@
+import argparse
+import json
+import pytest
+import bulk_recommend
+from benchmarks import synthetic
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    users = tmp_path / 'users.jsonl'
+    jobs = tmp_path / 'jobs.jsonl'
+    users.write_text(''.join(json.dumps(user) + '\n' for user in synthetic.profiles(5)))
+    jobs.write_text(''.join(json.dumps(job) + '\n' for job in synthetic.jobs(50)))
+    return tmp_path
+
+
+def args_for(directory, **overrides):
+    args = dict(
+        users=str(directory / 'users.jsonl'), jobs=str(directory / 'jobs.jsonl'), out=str(directory / 'out'),
+        format='jsonl', workers=1, shard_size=2, top_n=10, corpus=None, fetch_resumes=False, rerank_all=False
+    )
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_resume_refuses_other_scoring_options(inputs):
+    assert bulk_recommend.run(args_for(inputs))['users'] == 5
+
+    for overrides in ({'top_n': 3}, {'rerank_all': True}, {'fetch_resumes': True}):
+        with pytest.raises(SystemExit):
+            bulk_recommend.run(args_for(inputs, **overrides))
+
+
+def test_resume_refuses_a_rewritten_jobs_file(inputs):
+    bulk_recommend.run(args_for(inputs))
+    with open(inputs / 'jobs.jsonl', 'a') as f:
+        f.write(json.dumps(synthetic.jobs(1, seed=9)[0]) + '\n')
+
+    with pytest.raises(SystemExit):
+        bulk_recommend.run(args_for(inputs))
+
+
+def test_finished_output_skips_building_the_catalog(inputs, monkeypatch):
+    bulk_recommend.run(args_for(inputs))
+    monkeypatch.setattr(bulk_recommend, 'build_state', lambda *args, **kwargs: pytest.fail("catalog was built"))
+
+    assert bulk_recommend.run(args_for(inputs))['shards'] == 0
+
+
+def test_resume_scores_only_missing_shards(inputs):
+    bulk_recommend.run(args_for(inputs))
+    (inputs / 'out' / 'part-000001.jsonl').unlink()
+
+    report = bulk_recommend.run(args_for(inputs))
+
+    assert (report['shards'], report['users']) == (1, 2)
@@ -0,0 +1,65 @@
+import pytest
+import app
+import service
+from benchmarks.stubs import start_job_backend, stub_jobs
+from catalog import JobCatalog
+from normalize import normalize_job_data
+from recommendation_store import RecommendationStore
+
+
+def jobs(tag, count=5):
+    return normalize_job_data(stub_jobs(tag, count))
+
+
+def test_warm_inserts_keep_the_version():
+    catalog = JobCatalog(':memory:')
+    catalog.upsert(jobs('java'))
+    version = catalog.version
+
+    assert catalog.upsert(jobs('rust'), warm=True) == 5
+    assert catalog.version == version
+    assert catalog.upsert(jobs('rust'), warm=True) == 0
+    assert catalog.version == version
+
+
+def test_changed_content_bumps_the_version():
+    catalog = JobCatalog(':memory:')
+    catalog.upsert(jobs('java'))
+    version = catalog.version
+    edited = [dict(job, title=job['title'] + ' (updated)') for job in jobs('java', 1)]
+
+    assert catalog.upsert(edited, warm=True) == 1
+    assert catalog.version == version + 1
+    assert catalog.upsert(jobs('go')) == 5
+    assert catalog.version == version + 2
+    assert catalog.delete(['java-0']) == 1
+    assert catalog.version == version + 3
+
+
+@pytest.fixture
+def precompute_api(monkeypatch):
+    server, url = start_job_backend(jobs_per_tag=5)
+    monkeypatch.setattr(service, 'EXTERNAL_JOB_API_URL', url)
+    monkeypatch.setattr(service, 'catalog', JobCatalog(':memory:'))
+    monkeypatch.setattr(service, 'response_cache', None)
+    monkeypatch.setattr(service, 'recommendation_store', RecommendationStore(':memory:'))
+    yield app.app.test_client()
+    service.recommendation_store.stop()
+    server.shutdown()
+
+
+def test_request_path_fetches_keep_stored_results_fresh(precompute_api):
+    def recommend(user_id, skills):
+        response = precompute_api.post('/api/recommend', json={
+            'id': user_id, 'keySkills': skills, 'preferedLocation': 'Pune'
+        })
+        assert response.status_code == 200
+        return response.get_json()
+
+    recommend('a', 'python')
+    # Another user's backend fetch warms the catalog with new jobs
+    recommend('b', 'kotlin, swift')
+    again = recommend('a', 'python')
+
+    assert again['api_info']['cache'] == 'precomputed'
+    assert again['freshness']['stale'] is False
@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import app
+import service
+from benchmarks import synthetic
+from benchmarks.stubs import start_job_backend
+from model import JobRecommendationTransformer
+
+PARALLEL = 32
+
+
+def ranking(recommendations):
+    return [(rec['job']['id'], round(rec['score'], 9)) for rec in recommendations]
+
+
+def run_parallel(fn, args):
+    """Call fn once per argument on PARALLEL threads released together"""
+    barrier = threading.Barrier(PARALLEL)
+
+    def call(arg):
+        barrier.wait()
+        return fn(arg)
+
+    with ThreadPoolExecutor(PARALLEL) as pool:
+        return list(pool.map(call, args))
+
+
+def test_parallel_recommendations_match_sequential():
+    transformer = JobRecommendationTransformer()
+    users = synthetic.profiles(PARALLEL, seed=3)
+    # A different job set per request, so each request fits a different vocabulary
+    job_sets = [synthetic.jobs(40 + i, seed=i) for i in range(PARALLEL)]
+    requests = list(zip(users, job_sets))
+
+    def recommend(request):
+        user, jobs = request
+        return ranking(transformer.recommend_jobs(user, jobs, top_n=10))
+
+    sequential = [recommend(request) for request in requests]
+    assert all(sequential)
+    for _ in range(3):
+        assert run_parallel(recommend, requests) == sequential
+
+
+def test_user_vector_requires_the_fitted_context():
+    transformer = JobRecommendationTransformer()
+    context = transformer.new_scoring_context()
+    _, job_texts = transformer.create_job_vectors(synthetic.jobs(20), context)
+    profile = transformer.prepare_user_profile(synthetic.profiles(1)[0])
+
+    assert transformer.create_user_vector(profile, job_texts, context).shape[0] == 1
+    with pytest.raises(ValueError):
+        transformer.create_user_vector(profile, job_texts)
+
+
+@pytest.fixture
+def api_client(monkeypatch):
+    server, url = start_job_backend(jobs_per_tag=15)
+    monkeypatch.setattr(service, 'EXTERNAL_JOB_API_URL', url)
+    monkeypatch.setattr(service, 'response_cache', None)
+    monkeypatch.setattr(service, 'recommendation_store', None)
+    monkeypatch.setattr(service, 'catalog', None)
+    yield app.app.test_client()
+    server.shutdown()
+
+
+def test_parallel_api_requests_match_sequential(api_client):
+    users = synthetic.profiles(PARALLEL, seed=5)
+
+    def recommend(user):
+        response = api_client.post('/api/recommend?top_n=5', json=user)
+        assert response.status_code == 200
+        return [(rec['job_id'], rec['match_score']) for rec in response.get_json()['recommendations']]
+
+    sequential = [recommend(user) for user in users]
+    assert run_parallel(recommend, users) == sequential
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+import pytest
+import catalog as catalog_module
+import http_client
+from benchmarks.stubs import start_changes_backend, stub_jobs
+from catalog import JobCatalog, normalize_timestamp
+from normalize import normalize_job_data
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def stamp(sequence):
+    return (EPOCH + timedelta(seconds=sequence)).isoformat()
+
+
+@pytest.fixture
+def backend():
+    """Append-only change log of 23 jobs and a fetcher that records every request"""
+    changes = [dict(job, updated_at=stamp(sequence)) for sequence, job in enumerate(stub_jobs('python', 23))]
+    server, url = start_changes_backend(changes)
+    requests = []
+
+    def fetch_changes(since, cursor=None, limit=500):
+        requests.append((since, cursor))
+        params = {'since': since, 'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        response = http_client.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    yield changes, fetch_changes, requests
+    server.shutdown()
+
+
+def sync(catalog, fetch_changes):
+    return catalog.delta_sync(fetch_changes, normalize_job_data, page_size=5)
+
+
+def test_pages_through_the_change_log(backend):
+    changes, fetch_changes, requests = backend
+    catalog = JobCatalog(':memory:')
+
+    assert sync(catalog, fetch_changes) == (23, 0)
+    assert len(catalog) == 23
+    assert [cursor for _, cursor in requests] == [None, '5', '10', '15', '20']
+    assert catalog.watermark == normalize_timestamp(stamp(22))
+
+
+def test_applies_updates_and_deletes_since_the_watermark(backend):
+    changes, fetch_changes, requests = backend
+    catalog = JobCatalog(':memory:')
+    sync(catalog, fetch_changes)
+    handed_over = []
+    catalog.add_listener(lambda changed_jobs, deleted_ids: handed_over.append(
+        (sorted(job['id'] for job in changed_jobs), sorted(deleted_ids))
+    ))
+    changes.append(dict(changes[3], title='Python Developer (updated)', updated_at=stamp(30)))
+    changes.append(dict(changes[4], deleted=True, updated_at=stamp(31)))
+    del requests[:]
+
+    assert sync(catalog, fetch_changes) == (1, 1)
+    assert requests == [(normalize_timestamp(stamp(22)), None)]
+    assert handed_over == [(['python-3'], []), ([], ['python-4'])]
+    assert catalog.get_jobs(['python-3'])[0]['title'] == 'Python Developer (updated)'
+    assert not catalog.get_jobs(['python-4'])
+    assert catalog.watermark == normalize_timestamp(stamp(31))
+    assert sync(catalog, fetch_changes) == (0, 0)
+
+
+def test_max_pages_cutoff_resumes_from_the_saved_cursor(backend, tmp_path, monkeypatch):
+    changes, fetch_changes, requests = backend
+    monkeypatch.setattr(catalog_module, 'CATALOG_DELTA_MAX_PAGES', 2)
+    path = str(tmp_path / 'catalog.db')
+
+    assert sync(JobCatalog(path), fetch_changes) == (10, 0)
+    # A restarted process picks up the saved cursor rather than starting over
+    catalog = JobCatalog(path)
+    assert catalog.watermark == ''
+    assert sync(catalog, fetch_changes) == (10, 0)
+    assert catalog.watermark == ''
+    assert sync(catalog, fetch_changes) == (3, 0)
+
+    assert [cursor for _, cursor in requests] == [None, '5', '10', '15', '20']
+    assert len(catalog) == 23
+    assert catalog.watermark == normalize_timestamp(stamp(22))
+    assert JobCatalog(path).watermark == catalog.watermark
+
+
+def test_watermark_compares_timestamps_in_time_order():
+    page = {'jobs': [
+        dict(stub_jobs('go', 1)[0], updated_at='2026-01-01T09:00:00+05:30'),
+        dict(stub_jobs('rust', 1)[0], updated_at='2026-01-01T04:00:00Z'),
+        dict(stub_jobs('java', 1)[0], updated_at=1767236400000)
+    ]}
+    catalog = JobCatalog(':memory:')
+
+    catalog.delta_sync(lambda since, cursor, limit: page, normalize_job_data)
+
+    # 03:30, 04:00 and 03:00 UTC; the raw string max would pick the +05:30 one
+    assert catalog.watermark == '2026-01-01T04:00:00.000000+00:00'
+
+
+def test_normalize_timestamp_formats():
+    expected = '2026-01-01T00:00:05.000000+00:00'
+    for value in ('2026-01-01T00:00:05', '2026-01-01T05:30:05+05:30', '2026-01-01 00:00:05Z',
+                  1767225605, '1767225605000', 'Thu, 01 Jan 2026 00:00:05 GMT'):
+        assert normalize_timestamp(value) == expected
+    assert normalize_timestamp('not a date') == ''
+    assert normalize_timestamp(None) == ''
+
+
+def test_changes_within_a_page_apply_in_log_order(backend):
+    changes, fetch_changes, requests = backend
+    catalog = JobCatalog(':memory:')
+    sync(catalog, fetch_changes)
+    changes.append(dict(changes[3], deleted=True, updated_at=stamp(30)))
+    changes.append(dict(changes[3], title='Python Developer (reposted)', updated_at=stamp(31)))
+    changes.append(dict(changes[5], title='Python Developer (edited)', updated_at=stamp(32)))
+    changes.append(dict(changes[5], deleted=True, updated_at=stamp(33)))
+
+    assert sync(catalog, fetch_changes) == (2, 2)
+    assert catalog.get_jobs(['python-3'])[0]['title'] == 'Python Developer (reposted)'
+    assert not catalog.get_jobs(['python-5'])
+
+
+def test_id_less_tombstones_delete_by_content_id():
+    job = {'title': 'Data Engineer', 'company': 'Acme', 'publication_date': stamp(0), 'updated_at': stamp(1)}
+    pages = iter([{'jobs': [job]}, {'jobs': [dict(job, deleted=True, updated_at=stamp(2))]}])
+    catalog = JobCatalog(':memory:')
+
+    catalog.delta_sync(lambda since, cursor, limit: next(pages), normalize_job_data)
+    assert len(catalog) == 1
+    catalog.delta_sync(lambda since, cursor, limit: next(pages), normalize_job_data)
+    assert len(catalog) == 0
@@ -0,0 +1,49 @@
+import time
+import pytest
+import service
+from benchmarks.stubs import start_job_backend
+
+TAGS = ['python', 'django', 'sql', 'docker', 'aws', 'react', 'pune', 'full-time']
+LATENCY = 0.3
+
+
+@pytest.fixture(scope='module')
+def slow_backend():
+    server, url = start_job_backend(latency=LATENCY, jobs_per_tag=5)
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def backend_url(slow_backend, monkeypatch):
+    monkeypatch.setattr(service, 'EXTERNAL_JOB_API_URL', slow_backend)
+    return slow_backend
+
+
+def timed_fetch(tags, **kwargs):
+    start = time.perf_counter()
+    jobs = service.fetch_jobs_from_external_api(tags, limit=5, **kwargs)
+    return jobs, time.perf_counter() - start
+
+
+def test_concurrent_fetch_is_faster_than_sequential(backend_url):
+    sequential_jobs, sequential_seconds = timed_fetch(TAGS, max_workers=1)
+    concurrent_jobs, concurrent_seconds = timed_fetch(TAGS, max_workers=len(TAGS))
+
+    assert sequential_seconds >= LATENCY * len(TAGS)
+    assert concurrent_seconds < sequential_seconds / 3
+    assert [job['_id'] for job in concurrent_jobs] == [job['_id'] for job in sequential_jobs]
+
+
+def test_fetch_dedupes_once_across_tags(backend_url):
+    jobs, _ = timed_fetch(['python', 'python', 'sql'])
+
+    ids = [job['_id'] for job in jobs]
+    assert len(ids) == len(set(ids)) == 10
+
+
+def test_total_deadline_drops_slow_tags(backend_url):
+    jobs, seconds = timed_fetch(TAGS, max_workers=len(TAGS), deadline=LATENCY / 3)
+
+    assert jobs == []
+    assert seconds < LATENCY
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import http_client
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 to the first `failures` requests of each path, then 200"""
+    failures = 0
+    seen = {}
+
+    def respond(self):
+        count = self.seen.get(self.path, 0) + 1
+        self.seen[self.path] = count
+        status = 503 if count <= self.failures else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = respond
+    do_POST = respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server(monkeypatch):
+    monkeypatch.setattr(http_client, 'HTTP_RETRY_BACKOFF', 0.0)
+
+    def start(failures):
+        handler = type('Handler', (FlakyHandler,), {'failures': failures, 'seen': {}})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}", handler.seen
+
+    servers = []
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+async def async_request(method, url):
+    async with http_client.build_async_client(4, 4) as client:
+        response = await client.request(method, url)
+        return response.status_code
+
+
+def test_async_client_retries_like_the_session(flaky_server):
+    url, seen = flaky_server(failures=http_client.HTTP_MAX_RETRIES)
+    assert asyncio.run(async_request('GET', url + '/async')) == 200
+    assert http_client.get_session().get(url + '/sync').status_code == 200
+    assert seen['/async'] == seen['/sync'] == http_client.HTTP_MAX_RETRIES + 1
+
+
+def test_async_client_gives_up_like_the_session(flaky_server):
+    url, seen = flaky_server(failures=http_client.HTTP_MAX_RETRIES + 5)
+    assert asyncio.run(async_request('GET', url + '/async')) == 503
+    assert http_client.get_session().get(url + '/sync').status_code == 503
+    assert seen['/async'] == seen['/sync'] == http_client.HTTP_MAX_RETRIES + 1
+
+
+def test_async_client_does_not_retry_post(flaky_server):
+    url, seen = flaky_server(failures=1)
+    assert asyncio.run(async_request('POST', url + '/async')) == 503
+    assert seen['/async'] == 1
+
+
+def test_retry_delay_matches_urllib3_backoff(monkeypatch):
+    monkeypatch.setattr(http_client, 'HTTP_RETRY_BACKOFF', 0.5)
+    assert [http_client.retry_delay(attempt) for attempt in (1, 2, 3)] == [0.0, 1.0, 2.0]
+    assert http_client.retry_delay(2, retry_after='3') == 3.0
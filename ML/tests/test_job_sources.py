@@ -0,0 +1,76 @@
+import pytest
+import service
+from benchmarks.stubs import start_job_backend, stub_jobs
+from catalog import JobCatalog
+from normalize import normalize_job_data
+
+
+@pytest.fixture(scope='module')
+def backend():
+    server, url = start_job_backend(jobs_per_tag=5)
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def java_catalog(backend, monkeypatch):
+    catalog = JobCatalog(':memory:')
+    catalog.upsert(normalize_job_data(stub_jobs('java', 5) + stub_jobs('j2ee', 5)))
+    monkeypatch.setattr(service, 'catalog', catalog)
+    monkeypatch.setattr(service, 'EXTERNAL_JOB_API_URL', backend)
+    return catalog
+
+
+def load(skills, location='Pune', job_type='Full-Time'):
+    user_data = {'keySkills': skills, 'preferedLocation': location, 'preferedJobType': job_type}
+    return service.load_jobs(
+        service.resolve_user_tags(user_data), location, job_type,
+        fetch_limit=10, skill_tags=service.transformer.extract_skill_tags(user_data)
+    )
+
+
+def job_tags(jobs):
+    return {job['tags'][0].split(',')[0] for job in jobs}
+
+
+def test_covered_skills_come_from_the_catalog(java_catalog):
+    raw_jobs, jobs_data, job_source = load('java')
+
+    assert job_source == 'catalog'
+    assert raw_jobs == []
+    assert job_tags(jobs_data) == {'java', 'j2ee'}
+
+
+def test_location_hits_do_not_count_as_skill_coverage(java_catalog):
+    # Every catalog job is in Pune or Full-Time, none is about rust or go
+    raw_jobs, jobs_data, job_source = load('rust, golang')
+
+    assert job_source == 'external_api'
+    assert job_tags(jobs_data) >= {'rust', 'golang'}
+    assert 'java' not in job_tags(jobs_data)
+
+
+def test_uncovered_skills_are_fetched_and_upserted(java_catalog):
+    raw_jobs, jobs_data, job_source = load('java, rust')
+
+    assert job_source == 'catalog+external_api'
+    assert {job['_id'].split('-')[0] for job in raw_jobs} == {'rust'}
+    assert {'java', 'j2ee', 'rust'} <= job_tags(jobs_data)
+    assert java_catalog.uncovered_tags(['rust']) == []
+    assert load('java, rust')[2] == 'catalog'
+
+
+def test_find_job_ids_ignores_location_and_job_type(java_catalog):
+    assert java_catalog.find_job_ids(['pune', 'full-time', 'remote']) == java_catalog.find_job_ids(['remote'])
+    assert java_catalog.find_job_ids(['pune']) == []
+    assert java_catalog.uncovered_tags(['java', 'pune', 'rust']) == ['pune', 'rust']
+
+
+def test_capped_tags_keep_jobs_matching_location_and_job_type():
+    catalog = JobCatalog(':memory:')
+    # Even jobs are in Pune, every third one is a contract
+    catalog.upsert(normalize_job_data(stub_jobs('java', 12)))
+
+    assert catalog.find_job_ids(['java'], limit_per_tag=2, location='Pune', job_type='Contract') == ['java-0', 'java-6']
+    assert catalog.find_job_ids(['java'], limit_per_tag=3, location='Remote') == ['java-1', 'java-11', 'java-3']
+    assert len(catalog.find_job_ids(['java'])) == 12
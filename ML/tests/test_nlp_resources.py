@@ -0,0 +1,33 @@
+import importlib
+import pytest
+import nlp_resources
+from model import JobRecommendationTransformer
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Pretend wordnet is missing and record download attempts instead of making them"""
+    calls = []
+    monkeypatch.setattr(nlp_resources, 'missing_corpora', lambda: ['wordnet'])
+    monkeypatch.setattr(nlp_resources, 'download_corpora', lambda names, target_dir=None: calls.append(list(names)))
+    return calls
+
+
+def test_downloads_are_off_by_default(monkeypatch):
+    monkeypatch.delenv('NLTK_AUTO_DOWNLOAD', raising=False)
+    assert importlib.reload(nlp_resources).NLTK_AUTO_DOWNLOAD is False
+
+
+def test_request_path_never_downloads(downloads):
+    assert nlp_resources.load_nlp_resources() == (None, set())
+    transformer = JobRecommendationTransformer()
+    assert transformer.preprocess_text("Python Developers") == "python developers"
+    assert downloads == []
+
+
+def test_warmup_downloads_only_when_asked(downloads):
+    transformer = JobRecommendationTransformer()
+    transformer.warmup(download=False)
+    assert downloads == []
+    transformer.warmup(download=True)
+    assert downloads == [['wordnet']]
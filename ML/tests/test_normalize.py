@@ -0,0 +1,24 @@
+import pytest
+from benchmarks.bench_normalize import legacy_normalize_job_data
+from normalize import content_job_id, normalize_job
+
+SHAPES = [
+    {'id': 7, 'title': 'Backend Developer', 'tags': '["python", "flask"]', 'remote_allowed': True},
+    {'job_id': 'j-1', 'job_title': '', 'position': 'Analyst', 'skills': ['sql', ' excel '], 'is_remote': 0},
+    {'_id': 'x', 'company': None, 'employer': 'Acme', 'keywords': 'java, spring', 'details': None},
+    {'id': 'k', 'title': None, 'location': 'Pune', 'city': 'Mumbai', 'salary_range': 100, 'tags': None},
+]
+
+
+@pytest.mark.parametrize('job', SHAPES)
+def test_matches_the_field_chains(job):
+    # Twice, so the cached normalizer of the shape is exercised too
+    assert normalize_job(job) == normalize_job(dict(job)) == legacy_normalize_job_data([job])[0]
+
+
+def test_id_less_jobs_get_a_content_id():
+    job = {'title': 'Data Engineer', 'company': 'Acme'}
+    normalized_job = normalize_job(job)
+
+    assert normalized_job['id'] == content_job_id(normalized_job)
+    assert normalize_job(dict(job))['id'] == normalized_job['id']
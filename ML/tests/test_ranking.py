@@ -0,0 +1,28 @@
+import numpy as np
+from benchmarks import synthetic
+from model import JobRecommendationTransformer
+from reranker import top_k_indices
+
+
+def test_top_k_indices_matches_a_stable_full_sort():
+    rng = np.random.default_rng(0)
+    # Rounded so ties are common and the tie-break is exercised
+    scores = rng.random(5000).round(2)
+    for k in (1, 10, 200, 5000, 6000):
+        assert np.array_equal(top_k_indices(scores, k), np.argsort(-scores, kind='stable')[:k])
+    assert len(top_k_indices(scores, 0)) == 0
+    assert len(top_k_indices([], 5)) == 0
+
+
+def test_calculate_match_scores_returns_the_best_indices():
+    transformer = JobRecommendationTransformer()
+    jobs = synthetic.jobs(200)
+    context = transformer.new_scoring_context()
+    job_vectors, job_texts = transformer.create_job_vectors(jobs, context)
+    profile = transformer.prepare_user_profile(synthetic.profiles(1)[0])
+    user_vector = transformer.create_user_vector(profile, job_texts, context)
+
+    candidates, similarity = transformer.calculate_match_scores(user_vector, job_vectors, len(jobs), 20)
+
+    assert similarity.shape == (len(jobs),)
+    assert np.array_equal(candidates, np.argsort(-similarity, kind='stable')[:20])
@@ -0,0 +1,24 @@
+from recommendation_store import RecommendationStore
+
+
+def test_failed_recomputes_leave_the_head_of_the_refresh_queue():
+    store = RecommendationStore(':memory:', max_age=3600, workers=1)
+    for key in ('broken', 'healthy'):
+        store.put(key, 'hash', 'v1', {'id': key}, {'recommendations': [key]})
+    recomputed = []
+
+    def compute(request):
+        recomputed.append(request['id'])
+        return {'recommendations': [] if request['id'] == 'broken' else ['fresh']}
+
+    def refresh():
+        assert store.refresh_outdated('v2', compute, lambda request: 'hash', limit=1) == 1
+        store._executor.submit(lambda: None).result()
+
+    refresh()
+    refresh()
+
+    assert recomputed == ['broken', 'healthy']
+    assert store.lookup('broken', 'hash', 'v2')[0] == {'recommendations': ['broken']}
+    assert store.stats()['failed'] == 1
+    store.stop()
@@ -0,0 +1,47 @@
+import asyncio
+import time
+from response_cache import RedisBackend, ResponseCache
+
+
+class SlowBackend(RedisBackend):
+    """A Redis backend whose calls take 0.2 s, without a server"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        time.sleep(0.2)
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        time.sleep(0.2)
+        self.entries[key] = value
+
+
+def test_blocking_backend_calls_leave_the_event_loop_free():
+    cache = ResponseCache(maxsize=10, ttl=60)
+    cache.backend = SlowBackend()
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return {'recommendations': [1]}
+
+    async def ticker():
+        # Ticks stall for the length of a backend call if it runs on the loop
+        worst = 0.0
+        for _ in range(30):
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.perf_counter() - started)
+        return worst
+
+    async def main():
+        ticks = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        return await cache.aget_or_compute('a', compute), await ticks
+
+    (value, status), worst_tick = asyncio.run(main())
+
+    assert (value, status) == ({'recommendations': [1]}, 'miss')
+    assert cache.backend.entries == {'a': value}
+    assert worst_tick < 0.15
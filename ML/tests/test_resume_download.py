@@ -0,0 +1,58 @@
+import asyncio
+import os
+import pytest
+import asgi_app
+from benchmarks.stubs import start_resume_server
+from model import JobRecommendationTransformer
+
+SAMPLE_RESUME = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'public', '22CE116_Resume.pdf')
+
+
+@pytest.fixture
+def resume_server():
+    with open(SAMPLE_RESUME, 'rb') as f:
+        server, base_url = start_resume_server(f.read(), etag='"v1"')
+    yield server.RequestHandlerClass.statuses, f"{base_url}/resume.pdf"
+    server.shutdown()
+
+
+@pytest.fixture
+def transformer(monkeypatch):
+    """A fresh transformer, also used by the async server"""
+    transformer = JobRecommendationTransformer()
+    monkeypatch.setattr(asgi_app.service, 'transformer', transformer)
+    # The async client is bound to the event loop of each asyncio.run
+    monkeypatch.setattr(asgi_app, '_client', None)
+    return transformer
+
+
+def sync_extract(transformer, url):
+    return transformer.extract_resume_data(url)
+
+
+def async_extract(transformer, url):
+    asgi_app._client = None
+    return asyncio.run(asgi_app.extract_resume_data(url))
+
+
+@pytest.mark.parametrize('extract', [sync_extract, async_extract])
+def test_resume_is_revalidated_instead_of_downloaded_again(extract, resume_server, transformer):
+    statuses, url = resume_server
+
+    first = extract(transformer, url)
+    second = extract(transformer, url)
+
+    assert first['extracted_skills']
+    assert second == first
+    assert statuses == [200, 304]
+    assert transformer.resume_cache.revalidated == 1
+
+
+def test_fresh_entries_skip_the_request(resume_server, transformer):
+    statuses, url = resume_server
+    transformer.resume_cache.fresh_for = 60
+
+    first = transformer.extract_resume_data(url)
+
+    assert async_extract(transformer, url) == first
+    assert statuses == [200]